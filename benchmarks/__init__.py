@@ -0,0 +1 @@
+"""Performance benchmarks (run from repo root: python -m benchmarks.<name>)."""
@@ -0,0 +1,174 @@
+"""
+Benchmark adaptive lighting: iterations until a simulated room reaches its target.
+
+The room's sensor sees ambient light plus a non-linear response to the
+lights' brightness, with a little noise, and only reports a new reading
+every `--sensor-period` ticks. Compared controllers:
+
+    fixed    the original loop: step by (lux error / 2), at most --step units
+    cold     AdaptiveLightingController (default step) with no stored readings
+    learned  AdaptiveLightingController after --training sessions
+
+Usage:
+    python -m benchmarks.bench_adaptive [--sensor-period 2] [--training 3]
+"""
+
+import argparse
+import math
+import random
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from loguru import logger
+
+from src.automation.adaptive import AdaptiveLightingController, LUX_TOLERANCE, lightlevel_to_lux
+from src.storage.database import Database
+
+SENSOR_ID = "42"
+LIGHT_IDS = ["1", "2", "3"]
+TARGETS = (40, 120, 250, 400)
+TRAINING_TARGETS = (80, 200, 320)
+MAX_TICKS = 60
+
+
+class SimulatedRoom:
+    """Stands in for HueBridge: three lights and one light level sensor."""
+
+    def __init__(
+        self,
+        ambient: float = 15,
+        max_lux: float = 480,
+        gamma: float = 1.6,
+        noise: float = 0.02,
+        sensor_period: int = 2,
+        seed: int = 1,
+    ):
+        self.ambient = ambient
+        self.max_lux = max_lux
+        self.gamma = gamma
+        self.noise = noise
+        self.sensor_period = sensor_period
+        self.random = random.Random(seed)
+        self.lights = {light_id: {"on": False, "bri": 1} for light_id in LIGHT_IDS}
+        self.commands = 0
+        self._ticks = 0
+        self._reading = (0, 0)  # (lightlevel, lastupdated)
+
+    def lux(self) -> float:
+        light = sum(
+            (state["bri"] / 254) ** self.gamma for state in self.lights.values() if state["on"]
+        ) / len(self.lights)
+        return self.ambient + self.max_lux * light
+
+    def reset(self):
+        for state in self.lights.values():
+            state.update(on=False, bri=1)
+        self._sense()
+
+    def _sense(self):
+        lux = self.lux() * (1 + self.random.uniform(-self.noise, self.noise))
+        self._reading = (int(math.log10(max(lux, 1)) * 10000 + 1), self._ticks)
+
+    def get_sensors(self) -> dict:
+        self._ticks += 1
+        if self._ticks % self.sensor_period == 0:
+            self._sense()
+        lightlevel, updated = self._reading
+        return {SENSOR_ID: {"state": {"lightlevel": lightlevel, "lastupdated": str(updated)}}}
+
+    def get_all_lights(self) -> dict:
+        return {
+            light_id: SimpleNamespace(is_on=state["on"], brightness=state["bri"])
+            for light_id, state in self.lights.items()
+        }
+
+    def set_lights_state(self, light_ids: list[str], on=None, brightness=None) -> bool:
+        self.commands += 1
+        for light_id in light_ids:
+            if on is not None:
+                self.lights[light_id]["on"] = on
+            if brightness is not None:
+                self.lights[light_id]["bri"] = brightness
+        return True
+
+
+def run_fixed(room: SimulatedRoom, target: float, step: int) -> int:
+    """Original per-session loop. Returns ticks until the target is reached."""
+    room.set_lights_state(LIGHT_IDS, on=True, brightness=1)
+    for tick in range(1, MAX_TICKS + 1):
+        lightlevel = room.get_sensors()[SENSOR_ID]["state"]["lightlevel"]
+        lux = lightlevel_to_lux(lightlevel)
+        bri = room.get_all_lights()[LIGHT_IDS[0]].brightness
+        diff = target - lux
+        if abs(diff) < LUX_TOLERANCE:
+            return tick
+        adjustment = max(-step, min(step, int(diff / 2)))
+        new_bri = max(1, min(254, bri + adjustment))
+        if new_bri != bri:
+            room.set_lights_state(LIGHT_IDS, brightness=new_bri)
+    return MAX_TICKS
+
+
+def run_controller(controller: AdaptiveLightingController, target: float) -> int:
+    """One controller session. Returns ticks until the target is reached."""
+    session_id = controller.start_session(SENSOR_ID, LIGHT_IDS, target_lux=target)
+    try:
+        for tick in range(1, MAX_TICKS + 1):
+            controller.tick()
+            if controller.get_sessions()[0]["status"] == "target_reached":
+                return tick
+        return MAX_TICKS
+    finally:
+        controller.stop_session(session_id)
+
+
+def measure(label: str, room: SimulatedRoom, run) -> list[int]:
+    results = []
+    for target in TARGETS:
+        room.reset()
+        room.commands = 0
+        ticks = run(target)
+        results.append(ticks)
+        print(f"{label:<9}{target:>8}{ticks:>8}{room.commands:>10}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sensor-period", type=int, default=2, help="ticks per sensor reading")
+    parser.add_argument("--step", type=int, default=10, help="max step of the fixed controller")
+    parser.add_argument("--training", type=int, default=3, help="sessions before 'learned'")
+    args = parser.parse_args()
+
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp:
+        room = SimulatedRoom(sensor_period=args.sensor_period)
+
+        def fresh_controller(name: str) -> AdaptiveLightingController:
+            return AdaptiveLightingController(Database(str(Path(tmp) / f"{name}.db")), room)
+
+        print(f"{'mode':<9}{'target':>8}{'ticks':>8}{'commands':>10}")
+        totals = {
+            "fixed": measure("fixed", room, lambda t: run_fixed(room, t, args.step)),
+            "cold": measure(
+                "cold", room, lambda t: run_controller(fresh_controller(f"cold{t}"), t)
+            ),
+        }
+
+        controller = fresh_controller("trained")
+        database = controller.database
+        for target in TRAINING_TARGETS[: args.training]:
+            room.reset()
+            run_controller(controller, target)
+        # Reload so the model comes from the stored readings
+        controller = AdaptiveLightingController(database, room)
+        totals["learned"] = measure("learned", room, lambda t: run_controller(controller, t))
+
+        print()
+        for label, ticks in totals.items():
+            print(f"{label:<9}mean ticks to target: {sum(ticks) / len(ticks):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Load-test the API server: Flask development server vs. production serving modes.
+
+Concurrent clients (each with a keep-alive session, like a dashboard tab)
+request /api/status, /api/events and /api/lights in turn for a fixed time.
+The API talks to a fake bridge and a database seeded with events.
+
+Usage:
+    python -m benchmarks.bench_api_server [--clients 16] [--seconds 5] [--threads 8]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+from loguru import logger
+
+from benchmarks.fake_bridge import FakeHueBridge, connect_hue_bridge
+from src.analyzer.pattern_detector import PatternDetector
+from src.api.server import APIServer
+from src.storage.database import Database
+
+ENDPOINTS = ("/api/status", "/api/events", "/api/lights")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.05)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def load(base_url: str, clients: int, seconds: float) -> dict[str, list[float]]:
+    """Run the load and return latencies per endpoint (errors as None)."""
+    latencies: dict[str, list] = {endpoint: [] for endpoint in ENDPOINTS}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def client(offset: int):
+        session = requests.Session()
+        i = offset
+        while time.monotonic() < deadline:
+            endpoint = ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                ok = session.get(base_url + endpoint, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[endpoint].append(elapsed if ok else None)
+        session.close()
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def serve(mode: str, port: int, args: argparse.Namespace, ready):
+    """Run one API server with its fake bridge and database (child process)."""
+    logger.remove()
+    logging.getLogger("phue").setLevel(logging.CRITICAL)
+    logging.getLogger("waitress").setLevel(logging.ERROR)
+    fake = FakeHueBridge(num_lights=30, latency=args.latency).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(str(Path(tmp) / "bench.db"))
+        now = datetime.now()
+        database.add_events([
+            {
+                "light_id": str(i % 30 + 1),
+                "light_name": f"Light {i % 30 + 1}",
+                "event_type": "on" if i % 2 else "off",
+                "timestamp": now - timedelta(seconds=i * 10),
+            }
+            for i in range(args.events)
+        ])
+        server = APIServer(
+            database,
+            connect_hue_bridge(fake),
+            PatternDetector(database),
+            host="127.0.0.1",
+            port=port,
+            server=mode,
+            threads=args.threads,
+        )
+        server.start()
+        ready.set()
+        while True:
+            time.sleep(60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--threads", type=int, default=8, help="waitress worker threads")
+    parser.add_argument("--events", type=int, default=50_000, help="seeded events")
+    parser.add_argument("--latency", type=float, default=0.02, help="bridge seconds per request")
+    args = parser.parse_args()
+
+    print(
+        f"{args.clients} clients, {args.seconds:.0f} s per server, "
+        f"{args.events} events, {args.latency * 1000:.0f} ms bridge latency\n"
+    )
+    print(f"{'server':<13}{'endpoint':<13}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+
+    # Servers run in their own process so the load generator doesn't share their GIL
+    context = multiprocessing.get_context("spawn")
+    for mode in APIServer.SERVERS[::-1]:
+        port = free_port()
+        ready = context.Event()
+        process = context.Process(target=serve, args=(mode, port, args, ready), daemon=True)
+        process.start()
+        try:
+            ready.wait(120)
+            base_url = f"http://127.0.0.1:{port}"
+            wait_until_up(base_url + "/api/health")
+
+            latencies = load(base_url, args.clients, args.seconds)
+            for endpoint, samples in latencies.items():
+                ok = sorted(s for s in samples if s is not None)
+                p50 = statistics.median(ok) if ok else float("nan")
+                p99 = ok[min(len(ok) - 1, int(len(ok) * 0.99))] if ok else float("nan")
+                print(
+                    f"{mode:<13}{endpoint:<13}{len(ok) / args.seconds:>8.0f}"
+                    f"{p50 * 1000:>9.1f}{p99 * 1000:>9.1f}{len(samples) - len(ok):>8}"
+                )
+        finally:
+            process.terminate()
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark PatternDetector._detect_correlation_patterns against the original loop.
+
+The original only looked 4 events ahead, so it misses pairs in scenes
+that switch many lights at once. The windowed join must find every pair
+the original found, with at least the same count.
+
+Usage:
+    python -m benchmarks.bench_correlation_patterns [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from benchmarks.legacy_detectors import detect_correlation_patterns as legacy
+from benchmarks.synthetic_events import make_events_df
+from src.analyzer.pattern_detector import PatternDetector
+
+
+def pattern_counts(patterns: list[dict]) -> dict:
+    return {
+        (tuple(p["light_ids"]), p["action"]["event_type"]): p["occurrences"]
+        for p in patterns
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--legacy-max", type=int, default=100_000,
+        help="skip the original loop above this size (it takes minutes)",
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+    detector = PatternDetector(database=None)
+
+    print(
+        f"{'events':>10}{'loop pats':>11}{'join pats':>11}"
+        f"{'loop s':>10}{'join s':>10}{'us/event':>10}"
+    )
+    for size in args.sizes:
+        df = make_events_df(size)
+        new, new_time = timed(detector._detect_correlation_patterns, df)
+
+        if size <= args.legacy_max:
+            old, old_time = timed(legacy, detector, df)
+            old_counts, new_counts = pattern_counts(old), pattern_counts(new)
+            for key, count in old_counts.items():
+                assert new_counts.get(key, 0) >= count, f"Missed pair {key}"
+            old_cols = f"{len(old):>11}"
+            loop_col = f"{old_time:>10.2f}"
+        else:
+            old_cols = f"{'-':>11}"
+            loop_col = f"{'-':>10}"
+
+        print(
+            f"{size:>10}{old_cols}{len(new):>11}{loop_col}"
+            f"{new_time:>10.3f}{new_time / size * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark a multi-light action: sequential phue commands vs. the async client.
+
+The fake bridge rejects light commands beyond its rate limit, like a real
+bridge under load. Sequential phue requests report success regardless;
+the async client paces itself and retries rejected commands.
+
+Usage:
+    python -m benchmarks.bench_fanout [--lights 30] [--latency 0.05] [--limit 10]
+"""
+
+import argparse
+import logging
+import time
+
+from loguru import logger
+
+from benchmarks.fake_bridge import FakeHueBridge, connect_hue_bridge
+
+
+def run(bridge, fake: FakeHueBridge, light_ids: list[str], brightness: int) -> dict:
+    fake.reset_count()
+    start = time.perf_counter()
+    reported = bridge.set_lights_state(light_ids, on=True, brightness=brightness)
+    elapsed = time.perf_counter() - start
+
+    applied = sum(
+        fake.state["lights"][light_id]["state"]["bri"] == brightness for light_id in light_ids
+    )
+    return {
+        "seconds": elapsed,
+        "requests": fake.request_count,
+        "dropped": fake.dropped_count,
+        "reported": reported,
+        "applied": applied,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lights", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--limit", type=float, default=10, help="bridge light commands/s")
+    args = parser.parse_args()
+
+    logger.remove()
+    logging.getLogger("phue").setLevel(logging.CRITICAL)
+    fake = FakeHueBridge(
+        num_lights=args.lights, latency=args.latency, light_rate_limit=args.limit
+    ).start()
+    light_ids = [str(i) for i in range(1, args.lights + 1)]
+
+    try:
+        print(
+            f"{args.lights} lights, {args.latency * 1000:.0f} ms latency, "
+            f"bridge accepts {args.limit:.0f} light commands/s\n"
+        )
+        print(
+            f"{'mode':<12}{'seconds':>10}{'requests':>10}{'dropped':>10}"
+            f"{'reported':>10}{'applied':>10}"
+        )
+        modes = (
+            ("phue", {}),
+            ("async", {
+                "async_commands": True,
+                "command_limits": {"lights_per_second": args.limit},
+            }),
+        )
+        for brightness, (label, options) in enumerate(modes, start=100):
+            time.sleep(1.1)  # Let the bridge's rate window drain
+            bridge = connect_hue_bridge(fake, **options)
+            if options.get("async_commands"):
+                bridge.start_command_client()
+            result = run(bridge, fake, light_ids, brightness)
+            bridge.close()
+            print(
+                f"{label:<12}{result['seconds']:>10.2f}{result['requests']:>10}"
+                f"{result['dropped']:>10}{result['reported']:>10}{result['applied']:>10}"
+            )
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark multi-light actions: per-light commands vs. group coalescing.
+
+The fake bridge has three rooms of 10 lights and rejects more than
+`--limit` light commands per second. All modes use the rate-limited
+async client, so per-light actions are paced at the bridge's limit.
+
+Usage:
+    python -m benchmarks.bench_group_coalescing [--latency 0.05] [--limit 10]
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from benchmarks.fake_bridge import FakeHueBridge, connect_hue_bridge
+
+ROOMS = {
+    "1": ("Kitchen", range(1, 11)),
+    "2": ("Living room", range(11, 21)),
+    "3": ("Bedroom", range(21, 31)),
+}
+
+SCENARIOS = {
+    "two rooms": range(1, 21),
+    "rooms + 5": range(1, 26),
+    "all lights": range(1, 31),
+    "scattered": range(1, 31, 3),
+}
+
+MODES = {
+    "per-light": {},
+    "coalesce": {"coalesce_groups": True},
+    "managed": {"coalesce_groups": True, "managed_groups": 4},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--limit", type=float, default=10, help="bridge light commands/s")
+    parser.add_argument("--rounds", type=int, default=2, help="runs per scenario (first is cold)")
+    args = parser.parse_args()
+
+    logger.remove()
+    fake = FakeHueBridge(num_lights=30, latency=args.latency, light_rate_limit=args.limit)
+    fake.state["groups"] = {
+        group_id: {
+            "name": name,
+            "type": "Room",
+            "lights": [str(i) for i in lights],
+            "action": {},
+        }
+        for group_id, (name, lights) in ROOMS.items()
+    }
+    fake.start()
+
+    try:
+        print(f"{'scenario':<12}{'mode':<11}{'round':>6}{'seconds':>9}{'requests':>10}{'applied':>9}")
+        brightness = 1
+        for scenario, lights in SCENARIOS.items():
+            light_ids = [str(i) for i in lights]
+            for mode, options in MODES.items():
+                bridge = connect_hue_bridge(
+                    fake,
+                    async_commands=True,
+                    command_limits={"lights_per_second": args.limit},
+                    **options,
+                )
+                bridge.start_command_client()
+                for round_number in range(1, args.rounds + 1):
+                    brightness += 1
+                    time.sleep(1.1)  # Let the bridge's rate window drain
+                    fake.reset_count()
+                    start = time.perf_counter()
+                    bridge.set_lights_state(light_ids, on=True, brightness=brightness)
+                    elapsed = time.perf_counter() - start
+
+                    applied = sum(
+                        fake.state["lights"][i]["state"]["bri"] == brightness for i in light_ids
+                    )
+                    print(
+                        f"{scenario:<12}{mode:<11}{round_number:>6}{elapsed:>9.2f}"
+                        f"{fake.request_count:>10}{applied:>6}/{len(light_ids)}"
+                    )
+                bridge.close()
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark end-to-end event latency: interval polling vs. the v2 event stream.
+
+Latency is measured from the moment a light changes on the (fake) bridge
+until the service sees the change.
+
+Usage:
+    python -m benchmarks.bench_ingestion_latency [--poll-interval 2] [--changes 10]
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from loguru import logger
+
+from benchmarks.fake_bridge import FakeHueBridge, connect_hue_bridge
+from src.hue.eventstream import HueEventStream
+
+
+def run_changes(fake: FakeHueBridge, detected: dict, changes: int, spacing: float) -> list[float]:
+    """Toggle lights at random times and return detection latencies (ms)."""
+    latencies = []
+    for i in range(changes):
+        time.sleep(random.uniform(spacing / 2, spacing))
+        light_id = str(i % len(fake.state["lights"]) + 1)
+        event = threading.Event()
+        detected[light_id] = event
+        changed_at = time.perf_counter()
+        on = not fake.state["lights"][light_id]["state"]["on"]
+        fake.change_light(light_id, on=on)
+        if event.wait(timeout=spacing * 10):
+            latencies.append((event.detected_at - changed_at) * 1000)
+    return latencies
+
+
+def make_callback(detected: dict):
+    def on_change(old_state, new_state, timestamp=None):
+        event = detected.get(new_state.light_id)
+        if event and not event.is_set():
+            event.detected_at = time.perf_counter()
+            event.set()
+    return on_change
+
+
+def bench_polling(fake: FakeHueBridge, args) -> list[float]:
+    bridge = connect_hue_bridge(fake)
+    bridge.detect_changes()
+    detected: dict = {}
+    on_change = make_callback(detected)
+    stop = threading.Event()
+
+    def poll():
+        while not stop.wait(args.poll_interval):
+            for old_state, new_state in bridge.detect_changes():
+                on_change(old_state, new_state)
+
+    poller = threading.Thread(target=poll, daemon=True)
+    poller.start()
+    try:
+        return run_changes(fake, detected, args.changes, args.poll_interval)
+    finally:
+        stop.set()
+
+
+def bench_eventstream(fake: FakeHueBridge, args) -> tuple[list[float], dict]:
+    bridge = connect_hue_bridge(fake)
+    bridge.detect_changes()
+    detected: dict = {}
+    stream = HueEventStream(bridge, make_callback(detected), url=fake.eventstream_url)
+    stream.start()
+    while not stream.is_connected:
+        time.sleep(0.01)
+    try:
+        return run_changes(fake, detected, args.changes, args.poll_interval), stream.stats
+    finally:
+        stream.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lights", type=int, default=20)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--changes", type=int, default=10)
+    args = parser.parse_args()
+
+    logger.remove()
+    fake = FakeHueBridge(num_lights=args.lights, latency=0.005).start()
+
+    try:
+        print(f"{args.changes} changes, poll interval {args.poll_interval}s\n")
+        print(f"{'mode':<14}{'detected':>10}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+        polling = bench_polling(fake, args)
+        streaming, stats = bench_eventstream(fake, args)
+        for label, latencies in (("polling", polling), ("eventstream", streaming)):
+            print(
+                f"{label:<14}{len(latencies):>10}"
+                f"{statistics.mean(latencies):>10.1f}"
+                f"{statistics.median(latencies):>10.1f}"
+                f"{max(latencies):>10.1f}"
+            )
+        print(f"\nEvent stream stats: {stats}")
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark HueBridge.get_all_lights: per-light requests vs. a single bulk read.
+
+Usage:
+    python -m benchmarks.bench_light_fetch [--lights 60] [--latency 0.01] [--rounds 10]
+"""
+
+import argparse
+import statistics
+import time
+
+from loguru import logger
+
+from benchmarks.fake_bridge import FakeHueBridge, connect_hue_bridge
+
+
+def measure(bridge, fake: FakeHueBridge, rounds: int) -> tuple[list[float], int]:
+    """Return per-call latencies (ms) and requests per call."""
+    timings = []
+    fake.reset_count()
+    for _ in range(rounds):
+        start = time.perf_counter()
+        lights = bridge.get_all_lights()
+        timings.append((time.perf_counter() - start) * 1000)
+    assert len(lights) == len(fake.state["lights"])
+    return timings, fake.request_count // rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lights", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per request")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    logger.remove()
+    fake = FakeHueBridge(num_lights=args.lights, latency=args.latency).start()
+
+    try:
+        print(f"{args.lights} lights, {args.latency * 1000:.0f} ms simulated latency\n")
+        print(f"{'mode':<12}{'requests':>10}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+        for label, bulk in (("per-light", False), ("bulk", True)):
+            bridge = connect_hue_bridge(fake, bulk_fetch=bulk)
+            if not bulk:
+                bridge.get_all_lights()  # phue caches light objects after first call
+            timings, requests_per_call = measure(bridge, fake, args.rounds)
+            print(
+                f"{label:<12}{requests_per_call:>10}"
+                f"{statistics.mean(timings):>10.1f}"
+                f"{statistics.median(timings):>10.1f}"
+                f"{max(timings):>10.1f}"
+            )
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
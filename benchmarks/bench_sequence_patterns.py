@@ -0,0 +1,56 @@
+"""
+Benchmark PatternDetector._detect_sequence_patterns against the original loop.
+
+Verifies both produce identical patterns, then reports timings.
+
+Usage:
+    python -m benchmarks.bench_sequence_patterns [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from benchmarks.legacy_detectors import detect_sequence_patterns as legacy
+from benchmarks.synthetic_events import make_events_df
+from src.analyzer.pattern_detector import PatternDetector
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--legacy-max", type=int, default=100_000,
+        help="skip the original loop above this size (it takes minutes)",
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+    detector = PatternDetector(database=None)
+
+    print(f"{'events':>10}{'patterns':>10}{'loop s':>10}{'vector s':>10}{'speedup':>10}")
+    for size in args.sizes:
+        df = make_events_df(size)
+        new, new_time = timed(detector._detect_sequence_patterns, df)
+
+        if size <= args.legacy_max:
+            old, old_time = timed(legacy, detector, df)
+            assert old == new, f"Output differs at {size} events"
+            loop_col = f"{old_time:>10.2f}"
+            speedup_col = f"{old_time / new_time:>9.0f}x"
+        else:
+            loop_col = f"{'-':>10}"
+            speedup_col = f"{'-':>10}"
+
+        print(f"{size:>10}{len(new):>10}{loop_col}{new_time:>10.3f}{speedup_col}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark concurrent SQLite access: default journaling vs. the tuned profile.
+
+A writer thread records events one transaction at a time (like the poller)
+while reader threads query statistics and recent events (like dashboards).
+A cleanup pass runs halfway through to show readers blocking on deletes.
+
+Usage:
+    python -m benchmarks.bench_sqlite_concurrency [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+from src.storage.database import Database
+
+PROFILES = {
+    "default": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size_mb": 2,
+        "mmap_size_mb": 0,
+    },
+    "tuned": {},  # Database defaults
+}
+
+
+def seed(db: Database, count: int):
+    """Insert old and recent events so cleanup and reads have work to do."""
+    now = datetime.now()
+    db.add_events([
+        {
+            "light_id": str(i % 40),
+            "light_name": f"Light {i % 40}",
+            "event_type": "on" if i % 2 else "off",
+            "timestamp": now - timedelta(days=120 if i % 3 == 0 else 1, seconds=i),
+        }
+        for i in range(count)
+    ])
+
+
+def run_profile(name: str, options: dict, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "bench.db"), **options)
+        seed(db, args.seed_events)
+
+        stop = threading.Event()
+        read_latencies: list[float] = []
+        writes = 0
+        errors = 0
+        lock = threading.Lock()
+
+        def writer():
+            nonlocal writes, errors
+            i = 0
+            while not stop.is_set():
+                try:
+                    db.add_event(str(i % 40), f"Light {i % 40}", "brightness")
+                    writes += 1
+                except Exception:
+                    errors += 1
+                i += 1
+
+        def reader():
+            nonlocal errors
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.get_statistics()
+                    db.get_events(limit=100)
+                except Exception:
+                    with lock:
+                        errors += 1
+                    continue
+                with lock:
+                    read_latencies.append((time.perf_counter() - start) * 1000)
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+        for t in threads:
+            t.start()
+
+        time.sleep(args.seconds / 2)
+        db.cleanup_old_events(90)
+        time.sleep(args.seconds / 2)
+        stop.set()
+        for t in threads:
+            t.join()
+        db.engine.dispose()
+
+    read_latencies.sort()
+    return {
+        "profile": name,
+        "writes/s": writes / args.seconds,
+        "reads/s": len(read_latencies) / args.seconds,
+        "read p50 ms": statistics.median(read_latencies) if read_latencies else 0,
+        "read p99 ms": read_latencies[int(len(read_latencies) * 0.99)] if read_latencies else 0,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seed-events", type=int, default=50000)
+    args = parser.parse_args()
+
+    logger.remove()
+    results = [run_profile(name, options, args) for name, options in PROFILES.items()]
+
+    columns = list(results[0])
+    print("".join(f"{c:>14}" for c in columns))
+    for row in results:
+        print("".join(
+            f"{v:>14.1f}" if isinstance(v, float) else f"{v:>14}" for v in row.values()
+        ))
+
+
+if __name__ == "__main__":
+    main()
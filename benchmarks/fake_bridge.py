@@ -0,0 +1,308 @@
+"""Local stand-in for a Philips Hue Bridge (v1 REST API + v2 event stream)."""
+
+import json
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+USERNAME = "benchmark"
+
+
+def make_light(light_id: int, on: bool = False, bri: int = 127) -> dict:
+    """Build a light resource as returned by GET /lights/<id>."""
+    return {
+        "name": f"Light {light_id}",
+        "type": "Extended color light",
+        "modelid": "LCT015",
+        "state": {
+            "on": on,
+            "bri": bri,
+            "hue": 8000,
+            "sat": 140,
+            "ct": 366,
+            "xy": [0.4, 0.4],
+            "alert": "none",
+            "effect": "none",
+            "colormode": "ct",
+            "reachable": True,
+        },
+    }
+
+
+class FakeHueBridge:
+    """
+    Minimal HTTP server emulating the Hue v1 REST API.
+
+    Each request sleeps for `latency` seconds before responding to model
+    the round trip to a real bridge on the LAN. With `light_rate_limit`
+    set, light commands beyond that many per second are rejected with 429
+    like an overloaded bridge.
+    """
+
+    def __init__(
+        self,
+        num_lights: int = 60,
+        latency: float = 0.01,
+        light_rate_limit: Optional[float] = None,
+    ):
+        """
+        Initialize fake bridge state.
+
+        Args:
+            num_lights: Number of lights to expose
+            latency: Simulated per-request latency in seconds
+            light_rate_limit: Light commands accepted per second (None = unlimited)
+        """
+        self.latency = latency
+        self.light_rate_limit = light_rate_limit
+        self.request_count = 0
+        self.dropped_count = 0
+        self._light_commands: list[float] = []
+        self._lock = threading.Lock()
+        self.state = {
+            "lights": {str(i): make_light(i) for i in range(1, num_lights + 1)},
+            "groups": {
+                "1": {
+                    "name": "Living room",
+                    "type": "Room",
+                    "lights": [str(i) for i in range(1, num_lights + 1)],
+                    "action": {"on": False, "bri": 127},
+                },
+            },
+            "sensors": {},
+            "scenes": {},
+            "rules": {},
+            "schedules": {},
+            "config": {"name": "Fake bridge", "apiversion": "1.50.0"},
+        }
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._subscribers: list[queue.Queue] = []
+
+    @property
+    def address(self) -> str:
+        """Host:port string usable as phue's bridge IP."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "FakeHueBridge":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True, name="fake-bridge"
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        for subscriber in list(self._subscribers):
+            subscriber.put(None)
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def reset_count(self):
+        """Reset the request and drop counters."""
+        with self._lock:
+            self.request_count = 0
+            self.dropped_count = 0
+            self._light_commands.clear()
+
+    def _over_light_limit(self) -> bool:
+        """Record a light command; True if it exceeds the rate limit."""
+        if self.light_rate_limit is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._light_commands = [t for t in self._light_commands if now - t < 1.0]
+            if len(self._light_commands) >= self.light_rate_limit:
+                self.request_count += 1
+                self.dropped_count += 1
+                return True
+            self._light_commands.append(now)
+            return False
+
+    @property
+    def eventstream_url(self) -> str:
+        """URL of the v2 event stream endpoint."""
+        return f"http://{self.address}/eventstream/clip/v2"
+
+    def change_light(self, light_id: str, **state):
+        """
+        Change a light as if done by a switch or app, pushing a v2 event.
+
+        Args:
+            light_id: Light to change
+            **state: v1 state fields (on, bri, ct)
+        """
+        with self._lock:
+            self.state["lights"][light_id]["state"].update(state)
+
+        update = {"id_v1": f"/lights/{light_id}", "type": "light"}
+        if "on" in state:
+            update["on"] = {"on": state["on"]}
+        if "bri" in state:
+            update["dimming"] = {"brightness": round(state["bri"] * 100 / 254, 2)}
+        if "ct" in state:
+            update["color_temperature"] = {"mirek": state["ct"]}
+
+        message = [{
+            "creationtime": datetime.now(timezone.utc).isoformat(),
+            "data": [update],
+            "type": "update",
+        }]
+        for subscriber in list(self._subscribers):
+            subscriber.put(message)
+
+    def _stream_events(self, handler: BaseHTTPRequestHandler):
+        """Serve a chunked text/event-stream response until stopped."""
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        subscriber: queue.Queue = queue.Queue()
+        self._subscribers.append(subscriber)
+
+        def write_chunk(text: str):
+            data = text.encode()
+            handler.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            handler.wfile.flush()
+
+        try:
+            write_chunk(": hi\n\n")
+            while True:
+                message = subscriber.get()
+                if message is None:
+                    break
+                write_chunk(f"id: {time.time():.0f}:0\ndata: {json.dumps(message)}\n\n")
+            handler.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self._subscribers.remove(subscriber)
+            handler.close_connection = True
+
+    def handle(self, method: str, parts: list[str], body: Optional[dict]):
+        """Resolve a request against the in-memory state."""
+        with self._lock:
+            self.request_count += 1
+
+        if not parts:
+            return self.state
+
+        resource, rest = parts[0], parts[1:]
+        collection = self.state.get(resource)
+        if collection is None:
+            return [{"error": {"type": 4, "description": "method not available"}}]
+
+        if method == "GET":
+            if not rest:
+                return collection
+            item = collection.get(rest[0])
+            if item is None:
+                return [{"error": {"type": 3, "description": "resource not available"}}]
+            return item
+
+        if method == "POST" and resource == "groups" and not rest:
+            group_id = str(max(map(int, collection), default=0) + 1)
+            collection[group_id] = {
+                "name": body.get("name", ""),
+                "type": "LightGroup",
+                "lights": body.get("lights", []),
+                "action": {},
+            }
+            return [{"success": {"id": group_id}}]
+
+        if method == "DELETE" and rest:
+            collection.pop(rest[0], None)
+            return [{"success": f"/{resource}/{rest[0]} deleted"}]
+
+        if method == "PUT" and len(rest) == 2:
+            if resource == "groups" and rest[0] == "0":
+                item = {"lights": list(self.state["lights"])}
+            else:
+                item = collection.get(rest[0], {})
+            key = "state" if resource == "lights" else "action"
+            item.setdefault(key, {}).update(
+                {k: v for k, v in (body or {}).items() if k != "transitiontime"}
+            )
+            if resource == "groups":
+                for light_id in item.get("lights", []):
+                    light = self.state["lights"].get(light_id)
+                    if light:
+                        light["state"].update(
+                            {k: v for k, v in body.items() if k in light["state"]}
+                        )
+            return [
+                {"success": {f"/{resource}/{rest[0]}/{rest[1]}/{k}": v}}
+                for k, v in (body or {}).items()
+            ]
+
+        return [{"success": {}}]
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                path = re.sub(r"^/api/[^/]+/?", "", self.path).strip("/")
+                parts = [p for p in path.split("/") if p]
+
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                status = 200
+                if method == "PUT" and parts[:1] == ["lights"] and fake._over_light_limit():
+                    status = 429
+                    result = [{"error": {"type": 901, "description": "Too many requests"}}]
+                else:
+                    result = fake.handle(method, parts, body)
+
+                payload = json.dumps(result).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path.startswith("/eventstream"):
+                    fake._stream_events(self)
+                else:
+                    self._respond("GET")
+
+            def do_PUT(self):
+                self._respond("PUT")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def do_DELETE(self):
+                self._respond("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def connect_hue_bridge(fake: FakeHueBridge, **kwargs):
+    """Create a HueBridge wired to a running FakeHueBridge."""
+    from phue import Bridge
+
+    from src.hue.bridge import HueBridge
+
+    bridge = HueBridge(fake.address, **kwargs)
+    bridge._bridge = Bridge(fake.address, username=USERNAME)
+    return bridge
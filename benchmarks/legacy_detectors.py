@@ -0,0 +1,142 @@
+"""
+Original row-by-row PatternDetector implementations, kept as baselines.
+
+Each function takes the detector (for its settings) and an events
+DataFrame, and returns patterns exactly as the original method did.
+"""
+
+from collections import defaultdict
+
+import pandas as pd
+
+
+def detect_sequence_patterns(self, df: pd.DataFrame) -> list[dict]:
+    """Original PatternDetector._detect_sequence_patterns (iloc loop)."""
+    patterns = []
+
+    # Sort by timestamp
+    df_sorted = df.sort_values("timestamp")
+
+    # Look for events that commonly follow each other
+    sequence_counts = defaultdict(int)
+    sequence_details = defaultdict(list)
+
+    for i in range(len(df_sorted) - 1):
+        current = df_sorted.iloc[i]
+        next_event = df_sorted.iloc[i + 1]
+
+        # Check if next event is within time window
+        time_diff = (next_event["timestamp"] - current["timestamp"]).total_seconds()
+
+        if 0 < time_diff <= self.time_window * 60:
+            # Different lights
+            if current["light_id"] != next_event["light_id"]:
+                key = (
+                    current["light_id"],
+                    current["light_name"],
+                    current["event_type"],
+                    next_event["light_id"],
+                    next_event["light_name"],
+                    next_event["event_type"],
+                )
+                sequence_counts[key] += 1
+                sequence_details[key].append(time_diff)
+
+    # Convert to patterns
+    for key, count in sequence_counts.items():
+        if count >= self.min_occurrences:
+            (
+                light1_id, light1_name, event1_type,
+                light2_id, light2_name, event2_type,
+            ) = key
+
+            avg_delay = sum(sequence_details[key]) / len(sequence_details[key])
+            confidence = min(1.0, count / (self.min_occurrences * 2))
+
+            action1 = "tänds" if event1_type == "on" else "släcks"
+            action2 = "tänds" if event2_type == "on" else "släcks"
+
+            pattern = {
+                "type": "sequence",
+                "description": (
+                    f"När {light1_name} {action1}, "
+                    f"{action2} {light2_name} inom {int(avg_delay)}s"
+                ),
+                "light_ids": [light1_id, light2_id],
+                "weekdays": list(range(7)),  # All days
+                "time_start": None,
+                "time_end": None,
+                "action": {
+                    "trigger": {"light_id": light1_id, "type": event1_type},
+                    "response": {"light_id": light2_id, "type": event2_type},
+                    "delay_seconds": int(avg_delay),
+                },
+                "confidence": round(confidence, 2),
+                "occurrences": count,
+            }
+            patterns.append(pattern)
+
+    return patterns
+
+
+def detect_correlation_patterns(self, df: pd.DataFrame) -> list[dict]:
+    """Original PatternDetector._detect_correlation_patterns (4-event lookahead)."""
+    patterns = []
+
+    # This requires snapshot data for correlation analysis
+    # For now, we'll detect lights that commonly change state together
+
+    df_sorted = df.sort_values("timestamp")
+
+    # Find lights that change within seconds of each other
+    correlation_counts = defaultdict(int)
+
+    for i in range(len(df_sorted) - 1):
+        current = df_sorted.iloc[i]
+
+        # Look at next few events within 5 seconds
+        for j in range(i + 1, min(i + 5, len(df_sorted))):
+            next_event = df_sorted.iloc[j]
+            time_diff = (next_event["timestamp"] - current["timestamp"]).total_seconds()
+
+            if time_diff > 5:
+                break
+
+            if (
+                current["light_id"] != next_event["light_id"]
+                and current["event_type"] == next_event["event_type"]
+            ):
+                # Same action on different lights within 5 seconds
+                key = tuple(sorted([
+                    (current["light_id"], current["light_name"]),
+                    (next_event["light_id"], next_event["light_name"]),
+                ]))
+                correlation_counts[(key, current["event_type"])] += 1
+
+    for (lights, event_type), count in correlation_counts.items():
+        if count >= self.min_occurrences:
+            light1, light2 = lights
+            confidence = min(1.0, count / (self.min_occurrences * 3))
+            action = "tänds" if event_type == "on" else "släcks"
+
+            pattern = {
+                "type": "correlation",
+                "description": (
+                    f"{light1[1]} och {light2[1]} {action} "
+                    f"ofta tillsammans"
+                ),
+                "light_ids": [light1[0], light2[0]],
+                "weekdays": list(range(7)),
+                "time_start": None,
+                "time_end": None,
+                "action": {
+                    "type": "group",
+                    "event_type": event_type,
+                    "lights": [light1[0], light2[0]],
+                },
+                "confidence": round(confidence, 2),
+                "occurrences": count,
+            }
+            patterns.append(pattern)
+
+    return patterns
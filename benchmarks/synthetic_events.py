@@ -0,0 +1,54 @@
+"""Synthetic light event data for analyzer benchmarks."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+EVENT_TYPES = np.array(["on", "off", "brightness"], dtype=object)
+
+
+def make_events_df(
+    count: int,
+    num_lights: int = 40,
+    mean_gap_seconds: float = 20.0,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Build an events DataFrame shaped like PatternDetector._load_events.
+
+    Events arrive in bursts (scenes switching several lights within a second
+    or two) separated by exponential gaps.
+
+    Args:
+        count: Number of events
+        num_lights: Number of distinct lights
+        mean_gap_seconds: Mean time between bursts
+        seed: Random seed
+    """
+    rng = np.random.default_rng(seed)
+
+    burst_gap = rng.exponential(mean_gap_seconds, count)
+    in_burst = rng.random(count) < 0.4
+    gaps = np.where(in_burst, rng.uniform(0.05, 2.0, count), burst_gap)
+    offsets = np.cumsum(gaps)
+    start = datetime.now() - timedelta(seconds=float(offsets[-1]) if count else 0)
+    timestamps = pd.to_datetime(start) + pd.to_timedelta(offsets, unit="s")
+    timestamps = timestamps.round("us")
+
+    light_nums = rng.integers(1, num_lights + 1, count)
+    light_ids = light_nums.astype(str).astype(object)
+    light_names = np.array([f"Light {n}" for n in light_nums], dtype=object)
+    event_types = EVENT_TYPES[rng.integers(0, len(EVENT_TYPES), count)]
+
+    return pd.DataFrame({
+        "light_id": light_ids,
+        "light_name": light_names,
+        "timestamp": timestamps,
+        "event_type": event_types,
+        "old_value": None,
+        "new_value": None,
+        "weekday": timestamps.weekday,
+        "hour": timestamps.hour,
+        "minute": timestamps.minute,
+    })
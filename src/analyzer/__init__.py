@@ -1,6 +1,7 @@
 """Pattern analysis module."""
 
+from .incremental import IncrementalPatternDetector
 from .pattern_detector import PatternDetector
 from .predictor import LightingPredictor
 
-__all__ = ["PatternDetector", "LightingPredictor"]
+__all__ = ["IncrementalPatternDetector", "PatternDetector", "LightingPredictor"]
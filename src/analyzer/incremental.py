@@ -0,0 +1,258 @@
+"""Incremental pattern mining over a sliding window of events."""
+
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+
+from src.hue.models import LightEvent
+from src.storage.database import Database
+from .pattern_detector import PatternDetector
+
+
+class _WindowEntry:
+    """An event in the sliding window and the pair counts it started."""
+
+    __slots__ = ("timestamp", "light_id", "light_name", "event_type", "time_key", "day", "pairs")
+
+    def __init__(self, timestamp, light_id, light_name, event_type, time_key, day):
+        self.timestamp = timestamp
+        self.light_id = light_id
+        self.light_name = light_name
+        self.event_type = event_type
+        self.time_key = time_key
+        self.day = day
+        # ("sequence", key, delay) / ("correlation", key, 0.0) for pairs
+        # where this event is the earlier one
+        self.pairs: list[tuple] = []
+
+
+class IncrementalPatternDetector(PatternDetector):
+    """
+    Pattern detector that keeps running counters updated per event.
+
+    Instead of re-mining the whole window, each new event updates
+    time-slot, sequence-pair and correlation-pair counters. Events older
+    than the window are expired and their counts removed, so analyze()
+    only has to materialize patterns from the counters.
+
+    Events are assumed to arrive in time order.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        window_days: int = 30,
+        min_occurrences: int = 3,
+        time_window_minutes: int = 15,
+        confidence_threshold: float = 0.7,
+        load_chunk_size: int = 50000,
+    ):
+        """
+        Initialize incremental pattern detector.
+
+        Args:
+            database: Database instance (used to seed the window)
+            window_days: Days of history kept in the sliding window
+            min_occurrences: Minimum times a pattern must occur to be valid
+            time_window_minutes: Time window for grouping similar events
+            confidence_threshold: Minimum confidence to report a pattern
+            load_chunk_size: Events read from the database per chunk
+        """
+        super().__init__(
+            database,
+            min_occurrences=min_occurrences,
+            time_window_minutes=time_window_minutes,
+            confidence_threshold=confidence_threshold,
+            load_chunk_size=load_chunk_size,
+        )
+        self.window_days = window_days
+        self._lock = threading.Lock()
+        self._seed_lock = threading.Lock()
+        self._seeded = False
+        self._seeded_until: Optional[datetime] = None  # Newest seeded event
+        self._reset()
+
+    def _reset(self):
+        self._window: deque[_WindowEntry] = deque()
+        self._recent: deque[_WindowEntry] = deque()  # Last few seconds
+        self._time_counts: Counter = Counter()
+        self._day_counts: Counter = Counter()
+        self._sequence_counts: Counter = Counter()
+        self._sequence_delays: defaultdict = defaultdict(float)
+        self._correlation_counts: Counter = Counter()
+
+    def seed(self):
+        """
+        Rebuild the counters from the events stored in the database.
+
+        Called automatically by the first analyze() or add_event() if it
+        hasn't been called before.
+        """
+        with self._seed_lock:
+            self._seed()
+
+    def _seed(self):
+        start_date = datetime.now() - timedelta(days=self.window_days)
+        df = self._load_events(start_date).sort_values("timestamp", kind="stable")
+
+        with self._lock:
+            self._reset()
+            self._seeded = True
+            self._seeded_until = (
+                df["timestamp"].iloc[-1].to_pydatetime() if len(df) else None
+            )
+            for light_id, light_name, timestamp, event_type, weekday, hour in zip(
+                df["light_id"], df["light_name"], df["timestamp"],
+                df["event_type"], df["weekday"], df["hour"],
+            ):
+                self._add(
+                    timestamp.to_pydatetime(), light_id, light_name,
+                    event_type, int(weekday), int(hour),
+                )
+
+        logger.info(f"Seeded incremental pattern counters with {len(df)} events")
+
+    def _ensure_seeded(self):
+        if self._seeded:
+            return
+        with self._seed_lock:
+            if not self._seeded:
+                self._seed()
+
+    def add_event(self, event: LightEvent):
+        """Update counters with a newly logged event."""
+        self._ensure_seeded()
+        with self._lock:
+            if self._seeded_until is not None and event.timestamp <= self._seeded_until:
+                return  # Already stored when the counters were seeded
+            self._add(
+                event.timestamp, event.light_id, event.light_name,
+                event.event_type, event.weekday, event.hour,
+            )
+            self._expire(event.timestamp - timedelta(days=self.window_days))
+
+    def _add(
+        self,
+        timestamp: datetime,
+        light_id: str,
+        light_name: str,
+        event_type: str,
+        weekday: int,
+        hour: int,
+    ):
+        time_key = (light_id, light_name, weekday, hour, event_type)
+        entry = _WindowEntry(timestamp, light_id, light_name, event_type, time_key, timestamp.date())
+        self._time_counts[time_key] += 1
+        self._day_counts[entry.day] += 1
+
+        # Sequence: pair with the immediately preceding event
+        if self._window:
+            previous = self._window[-1]
+            delay = (timestamp - previous.timestamp).total_seconds()
+            if 0 < delay <= self.time_window * 60 and previous.light_id != light_id:
+                key = (
+                    previous.light_id, previous.light_name, previous.event_type,
+                    light_id, light_name, event_type,
+                )
+                self._sequence_counts[key] += 1
+                self._sequence_delays[key] += delay
+                previous.pairs.append(("sequence", key, delay))
+
+        # Correlation: pair with every earlier event in the last few seconds
+        horizon = timestamp - timedelta(seconds=self.CORRELATION_WINDOW_SECONDS)
+        while self._recent and self._recent[0].timestamp < horizon:
+            self._recent.popleft()
+        for earlier in self._recent:
+            if earlier.light_id != light_id and earlier.event_type == event_type:
+                lights = tuple(sorted([
+                    (earlier.light_id, earlier.light_name),
+                    (light_id, light_name),
+                ]))
+                key = (lights, event_type)
+                self._correlation_counts[key] += 1
+                earlier.pairs.append(("correlation", key, 0.0))
+
+        self._window.append(entry)
+        self._recent.append(entry)
+
+    def _expire(self, cutoff: datetime):
+        """Remove events older than cutoff and the pairs they started."""
+        while self._window and self._window[0].timestamp < cutoff:
+            entry = self._window.popleft()
+            _decrement(self._time_counts, entry.time_key)
+            _decrement(self._day_counts, entry.day)
+
+            for kind, key, delay in entry.pairs:
+                if kind == "sequence":
+                    if _decrement(self._sequence_counts, key):
+                        self._sequence_delays[key] -= delay
+                    else:
+                        self._sequence_delays.pop(key, None)
+                else:
+                    _decrement(self._correlation_counts, key)
+
+    def analyze(self, days_back: Optional[int] = None) -> list[dict]:
+        """
+        Materialize patterns from the current counters.
+
+        Args:
+            days_back: Window to analyze. If it differs from window_days,
+                falls back to a full batch analysis.
+
+        Returns:
+            List of detected patterns.
+        """
+        if days_back is not None and days_back != self.window_days:
+            return super().analyze(days_back=days_back)
+
+        self._ensure_seeded()
+        with self._lock:
+            self._expire(datetime.now() - timedelta(days=self.window_days))
+            patterns = self._materialize()
+
+        patterns = [p for p in patterns if p["confidence"] >= self.confidence_threshold]
+        logger.info(f"Detected {len(patterns)} patterns (incremental)")
+        return patterns
+
+    def _materialize(self) -> list[dict]:
+        patterns = []
+        total_days = len(self._day_counts)
+
+        for time_key in sorted(self._time_counts):
+            occurrences = self._time_counts[time_key]
+            if occurrences >= self.min_occurrences:
+                patterns.append(self._make_time_pattern(*time_key, occurrences, total_days))
+
+        for key, count in self._sequence_counts.items():
+            if count >= self.min_occurrences:
+                avg_delay = self._sequence_delays[key] / count
+                patterns.append(self._make_sequence_pattern(key, count, avg_delay))
+
+        for (lights, event_type), count in self._correlation_counts.items():
+            if count >= self.min_occurrences:
+                patterns.append(self._make_correlation_pattern(lights, event_type, count))
+
+        return patterns
+
+    @property
+    def stats(self) -> dict:
+        """Get counter sizes."""
+        with self._lock:
+            return {
+                "window_events": len(self._window),
+                "time_counters": len(self._time_counts),
+                "sequence_counters": len(self._sequence_counts),
+                "correlation_counters": len(self._correlation_counts),
+            }
+
+
+def _decrement(counter: Counter, key) -> int:
+    """Decrement a counter, deleting the key at zero. Returns the new count."""
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+        return 0
+    return counter[key]
@@ -4,21 +4,26 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
-from src.storage.database import Database, LightEventRecord
+from src.storage.database import Database
 
 
 class PatternDetector:
     """Detects patterns in light usage data."""
 
+    # Max seconds between two lights changing for them to count as correlated
+    CORRELATION_WINDOW_SECONDS = 5
+
     def __init__(
         self,
         database: Database,
         min_occurrences: int = 3,
         time_window_minutes: int = 15,
         confidence_threshold: float = 0.7,
+        load_chunk_size: int = 50000,
     ):
         """
         Initialize pattern detector.
@@ -28,11 +33,13 @@ class PatternDetector:
             min_occurrences: Minimum times a pattern must occur to be valid
             time_window_minutes: Time window for grouping similar events
             confidence_threshold: Minimum confidence to report a pattern
+            load_chunk_size: Events read from the database per chunk
         """
         self.db = database
         self.min_occurrences = min_occurrences
         self.time_window = time_window_minutes
         self.confidence_threshold = confidence_threshold
+        self.load_chunk_size = load_chunk_size
 
     def analyze(self, days_back: int = 30) -> list[dict]:
         """
@@ -47,21 +54,21 @@ class PatternDetector:
         logger.info(f"Analyzing {days_back} days of light data...")
 
         start_date = datetime.now() - timedelta(days=days_back)
-        events = self.db.get_events(start_date=start_date, limit=10000)
 
-        if not events:
+        # Time patterns come from the hourly rollups, which outlive the
+        # raw events; sequences and correlations need the raw events
+        patterns = self._detect_time_patterns(start_date)
+
+        df = self._load_events(start_date)
+        if df.empty and not patterns:
             logger.warning("No events found to analyze")
             return []
 
-        # Convert to DataFrame for easier analysis
-        df = self._events_to_dataframe(events)
-
-        patterns = []
+        logger.info(f"Loaded {len(df)} events")
 
-        # Detect different pattern types
-        patterns.extend(self._detect_time_patterns(df))
-        patterns.extend(self._detect_sequence_patterns(df))
-        patterns.extend(self._detect_correlation_patterns(df))
+        if not df.empty:
+            patterns.extend(self._detect_sequence_patterns(df))
+            patterns.extend(self._detect_correlation_patterns(df))
 
         # Filter by confidence
         patterns = [p for p in patterns if p["confidence"] >= self.confidence_threshold]
@@ -69,24 +76,41 @@ class PatternDetector:
         logger.info(f"Detected {len(patterns)} patterns")
         return patterns
 
-    def _events_to_dataframe(self, events: list[LightEventRecord]) -> pd.DataFrame:
-        """Convert event records to pandas DataFrame."""
-        data = []
-        for e in events:
-            data.append({
-                "light_id": e.light_id,
-                "light_name": e.light_name,
-                "timestamp": e.timestamp,
-                "event_type": e.event_type,
-                "old_value": e.old_value,
-                "new_value": e.new_value,
-                "weekday": e.weekday,
-                "hour": e.hour,
-                "minute": e.minute,
-            })
-        return pd.DataFrame(data)
-
-    def _detect_time_patterns(self, df: pd.DataFrame) -> list[dict]:
+    def _load_events(self, start_date: datetime) -> pd.DataFrame:
+        """
+        Load all events since start_date into a columnar DataFrame.
+
+        Events are streamed from the database in chunks. Repeated strings
+        (light IDs, names, event types) share one object, so the frame
+        costs a few dozen bytes per event.
+        """
+        interned: dict[str, str] = {}
+
+        def strings(values: tuple) -> np.ndarray:
+            return np.array([interned.setdefault(v, v) for v in values], dtype=object)
+
+        chunks = []
+        for chunk in self.db.iter_event_columns(
+            start_date=start_date, chunk_size=self.load_chunk_size
+        ):
+            chunks.append(pd.DataFrame({
+                "light_id": strings(chunk["light_id"]),
+                "light_name": strings(chunk["light_name"]),
+                "timestamp": pd.to_datetime(chunk["timestamp"], format="ISO8601"),
+                "event_type": strings(chunk["event_type"]),
+                "weekday": np.array(chunk["weekday"], dtype=np.int8),
+                "hour": np.array(chunk["hour"], dtype=np.int8),
+                "minute": np.array(chunk["minute"], dtype=np.int8),
+            }))
+
+        if not chunks:
+            return pd.DataFrame(
+                columns=["light_id", "light_name", "timestamp", "event_type",
+                         "weekday", "hour", "minute"]
+            )
+        return pd.concat(chunks, ignore_index=True)
+
+    def _detect_time_patterns(self, start_date: datetime) -> list[dict]:
         """
         Detect time-based patterns.
 
@@ -94,39 +118,51 @@ class PatternDetector:
         """
         patterns = []
 
-        # Group by light, weekday, hour, and event type
-        grouped = df.groupby(["light_id", "light_name", "weekday", "hour", "event_type"])
-
-        for (light_id, light_name, weekday, hour, event_type), group in grouped:
-            occurrences = len(group)
+        # Counts per light, weekday, hour, and event type
+        slots, total_days_in_period = self.db.get_time_slot_counts(start_date)
 
+        for light_id, light_name, weekday, hour, event_type, occurrences in slots:
             if occurrences >= self.min_occurrences:
-                # Calculate confidence based on consistency
-                total_days_in_period = len(df["timestamp"].dt.date.unique())
-                expected_occurrences = total_days_in_period / 7  # Expected for this weekday
-                confidence = min(1.0, occurrences / max(expected_occurrences, 1))
-
-                weekday_names = ["Mån", "Tis", "Ons", "Tor", "Fre", "Lör", "Sön"]
-                action_text = "tänds" if event_type == "on" else "släcks"
-
-                pattern = {
-                    "type": "time_based",
-                    "description": (
-                        f"{light_name} {action_text} "
-                        f"kl {hour:02d}:00 på {weekday_names[weekday]}ar"
-                    ),
-                    "light_ids": [light_id],
-                    "weekdays": [weekday],
-                    "time_start": f"{hour:02d}:00",
-                    "time_end": f"{hour:02d}:59",
-                    "action": {"type": event_type, "light_id": light_id},
-                    "confidence": round(confidence, 2),
-                    "occurrences": occurrences,
-                }
-                patterns.append(pattern)
+                patterns.append(self._make_time_pattern(
+                    light_id, light_name, weekday, hour, event_type,
+                    occurrences, total_days_in_period,
+                ))
 
         return patterns
 
+    def _make_time_pattern(
+        self,
+        light_id: str,
+        light_name: str,
+        weekday: int,
+        hour: int,
+        event_type: str,
+        occurrences: int,
+        total_days_in_period: int,
+    ) -> dict:
+        """Build a time-based pattern dict."""
+        # Calculate confidence based on consistency
+        expected_occurrences = total_days_in_period / 7  # Expected for this weekday
+        confidence = min(1.0, occurrences / max(expected_occurrences, 1))
+
+        weekday_names = ["Mån", "Tis", "Ons", "Tor", "Fre", "Lör", "Sön"]
+        action_text = "tänds" if event_type == "on" else "släcks"
+
+        return {
+            "type": "time_based",
+            "description": (
+                f"{light_name} {action_text} "
+                f"kl {hour:02d}:00 på {weekday_names[weekday]}ar"
+            ),
+            "light_ids": [light_id],
+            "weekdays": [weekday],
+            "time_start": f"{hour:02d}:00",
+            "time_end": f"{hour:02d}:59",
+            "action": {"type": event_type, "light_id": light_id},
+            "confidence": round(confidence, 2),
+            "occurrences": occurrences,
+        }
+
     def _detect_sequence_patterns(self, df: pd.DataFrame) -> list[dict]:
         """
         Detect sequential patterns.
@@ -138,67 +174,86 @@ class PatternDetector:
         # Sort by timestamp
         df_sorted = df.sort_values("timestamp")
 
-        # Look for events that commonly follow each other
-        sequence_counts = defaultdict(int)
-        sequence_details = defaultdict(list)
-
-        for i in range(len(df_sorted) - 1):
-            current = df_sorted.iloc[i]
-            next_event = df_sorted.iloc[i + 1]
-
-            # Check if next event is within time window
-            time_diff = (next_event["timestamp"] - current["timestamp"]).total_seconds()
-
-            if 0 < time_diff <= self.time_window * 60:
-                # Different lights
-                if current["light_id"] != next_event["light_id"]:
-                    key = (
-                        current["light_id"],
-                        current["light_name"],
-                        current["event_type"],
-                        next_event["light_id"],
-                        next_event["light_name"],
-                        next_event["event_type"],
-                    )
-                    sequence_counts[key] += 1
-                    sequence_details[key].append(time_diff)
+        # Pair each event with the one that follows it
+        light_ids = df_sorted["light_id"].to_numpy()
+        light_names = df_sorted["light_name"].to_numpy()
+        event_types = df_sorted["event_type"].to_numpy()
+        timestamps = df_sorted["timestamp"].to_numpy()
+        time_diff = (timestamps[1:] - timestamps[:-1]) / np.timedelta64(1, "s")
+
+        # Next event within time window, on a different light
+        mask = (
+            (time_diff > 0)
+            & (time_diff <= self.time_window * 60)
+            & (light_ids[:-1] != light_ids[1:])
+        )
+
+        pairs = pd.DataFrame({
+            "light1_id": light_ids[:-1][mask],
+            "light1_name": light_names[:-1][mask],
+            "event1_type": event_types[:-1][mask],
+            "light2_id": light_ids[1:][mask],
+            "light2_name": light_names[1:][mask],
+            "event2_type": event_types[1:][mask],
+            "delay": time_diff[mask],
+        })
+
+        # Count and mean delay per pair, in order of first occurrence
+        sequence_stats = (
+            pairs.groupby(list(pairs.columns[:-1]), sort=False, dropna=False)["delay"]
+            .agg(["count", "mean"])
+        )
 
         # Convert to patterns
-        for key, count in sequence_counts.items():
+        for key, count, avg_delay in zip(
+            sequence_stats.index, sequence_stats["count"], sequence_stats["mean"]
+        ):
             if count >= self.min_occurrences:
-                (
-                    light1_id, light1_name, event1_type,
-                    light2_id, light2_name, event2_type,
-                ) = key
-
-                avg_delay = sum(sequence_details[key]) / len(sequence_details[key])
-                confidence = min(1.0, count / (self.min_occurrences * 2))
-
-                action1 = "tänds" if event1_type == "on" else "släcks"
-                action2 = "tänds" if event2_type == "on" else "släcks"
-
-                pattern = {
-                    "type": "sequence",
-                    "description": (
-                        f"När {light1_name} {action1}, "
-                        f"{action2} {light2_name} inom {int(avg_delay)}s"
-                    ),
-                    "light_ids": [light1_id, light2_id],
-                    "weekdays": list(range(7)),  # All days
-                    "time_start": None,
-                    "time_end": None,
-                    "action": {
-                        "trigger": {"light_id": light1_id, "type": event1_type},
-                        "response": {"light_id": light2_id, "type": event2_type},
-                        "delay_seconds": int(avg_delay),
-                    },
-                    "confidence": round(confidence, 2),
-                    "occurrences": count,
-                }
-                patterns.append(pattern)
+                patterns.append(
+                    self._make_sequence_pattern(key, int(count), float(avg_delay))
+                )
 
         return patterns
 
+    def _make_sequence_pattern(self, key: tuple, count: int, avg_delay: float) -> dict:
+        """
+        Build a sequence pattern dict.
+
+        Args:
+            key: (light1_id, light1_name, event1_type,
+                  light2_id, light2_name, event2_type)
+            count: Number of times the sequence occurred
+            avg_delay: Mean delay between the two events in seconds
+        """
+        (
+            light1_id, light1_name, event1_type,
+            light2_id, light2_name, event2_type,
+        ) = key
+
+        confidence = min(1.0, count / (self.min_occurrences * 2))
+
+        action1 = "tänds" if event1_type == "on" else "släcks"
+        action2 = "tänds" if event2_type == "on" else "släcks"
+
+        return {
+            "type": "sequence",
+            "description": (
+                f"När {light1_name} {action1}, "
+                f"{action2} {light2_name} inom {int(avg_delay)}s"
+            ),
+            "light_ids": [light1_id, light2_id],
+            "weekdays": list(range(7)),  # All days
+            "time_start": None,
+            "time_end": None,
+            "action": {
+                "trigger": {"light_id": light1_id, "type": event1_type},
+                "response": {"light_id": light2_id, "type": event2_type},
+                "delay_seconds": int(avg_delay),
+            },
+            "confidence": round(confidence, 2),
+            "occurrences": count,
+        }
+
     def _detect_correlation_patterns(self, df: pd.DataFrame) -> list[dict]:
         """
         Detect correlated patterns.
@@ -212,59 +267,81 @@ class PatternDetector:
 
         df_sorted = df.sort_values("timestamp")
 
-        # Find lights that change within seconds of each other
-        correlation_counts = defaultdict(int)
-
-        for i in range(len(df_sorted) - 1):
-            current = df_sorted.iloc[i]
-
-            # Look at next few events within 5 seconds
-            for j in range(i + 1, min(i + 5, len(df_sorted))):
-                next_event = df_sorted.iloc[j]
-                time_diff = (next_event["timestamp"] - current["timestamp"]).total_seconds()
-
-                if time_diff > 5:
-                    break
-
-                if (
-                    current["light_id"] != next_event["light_id"]
-                    and current["event_type"] == next_event["event_type"]
-                ):
-                    # Same action on different lights within 5 seconds
-                    key = tuple(sorted([
-                        (current["light_id"], current["light_name"]),
-                        (next_event["light_id"], next_event["light_name"]),
-                    ]))
-                    correlation_counts[(key, current["event_type"])] += 1
+        light_ids = df_sorted["light_id"].to_numpy()
+        light_names = df_sorted["light_name"].to_numpy()
+        event_types = df_sorted["event_type"].to_numpy()
+        timestamps = df_sorted["timestamp"].to_numpy().astype("datetime64[ns]").astype(np.int64)
+
+        # For each event, every later event within 5 seconds (window self-join)
+        window_end = np.searchsorted(
+            timestamps, timestamps + self.CORRELATION_WINDOW_SECONDS * 10**9, side="right"
+        )
+        pair_counts = window_end - np.arange(len(timestamps)) - 1
+        left = np.repeat(np.arange(len(timestamps)), pair_counts)
+        first_pair = np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        right = left + 1 + (np.arange(len(left)) - first_pair)
+
+        # Same action on different lights
+        keep = (light_ids[left] != light_ids[right]) & (event_types[left] == event_types[right])
+        left, right = left[keep], right[keep]
+
+        # Order each pair by light ID so (A, B) and (B, A) count together
+        swap = light_ids[left] > light_ids[right]
+        first = np.where(swap, right, left)
+        second = np.where(swap, left, right)
+
+        pairs = pd.DataFrame({
+            "light1_id": light_ids[first],
+            "light1_name": light_names[first],
+            "light2_id": light_ids[second],
+            "light2_name": light_names[second],
+            "event_type": event_types[left],
+        })
+        correlation_counts = {
+            (((l1_id, l1_name), (l2_id, l2_name)), event_type): int(count)
+            for (l1_id, l1_name, l2_id, l2_name, event_type), count in (
+                pairs.groupby(list(pairs.columns), sort=False, dropna=False).size().items()
+            )
+        }
 
         for (lights, event_type), count in correlation_counts.items():
             if count >= self.min_occurrences:
-                light1, light2 = lights
-                confidence = min(1.0, count / (self.min_occurrences * 3))
-                action = "tänds" if event_type == "on" else "släcks"
-
-                pattern = {
-                    "type": "correlation",
-                    "description": (
-                        f"{light1[1]} och {light2[1]} {action} "
-                        f"ofta tillsammans"
-                    ),
-                    "light_ids": [light1[0], light2[0]],
-                    "weekdays": list(range(7)),
-                    "time_start": None,
-                    "time_end": None,
-                    "action": {
-                        "type": "group",
-                        "event_type": event_type,
-                        "lights": [light1[0], light2[0]],
-                    },
-                    "confidence": round(confidence, 2),
-                    "occurrences": count,
-                }
-                patterns.append(pattern)
+                patterns.append(self._make_correlation_pattern(lights, event_type, count))
 
         return patterns
 
+    def _make_correlation_pattern(self, lights: tuple, event_type: str, count: int) -> dict:
+        """
+        Build a correlation pattern dict.
+
+        Args:
+            lights: ((light1_id, light1_name), (light2_id, light2_name))
+            event_type: Event type both lights share
+            count: Number of times they changed together
+        """
+        light1, light2 = lights
+        confidence = min(1.0, count / (self.min_occurrences * 3))
+        action = "tänds" if event_type == "on" else "släcks"
+
+        return {
+            "type": "correlation",
+            "description": (
+                f"{light1[1]} och {light2[1]} {action} "
+                f"ofta tillsammans"
+            ),
+            "light_ids": [light1[0], light2[0]],
+            "weekdays": list(range(7)),
+            "time_start": None,
+            "time_end": None,
+            "action": {
+                "type": "group",
+                "event_type": event_type,
+                "lights": [light1[0], light2[0]],
+            },
+            "confidence": round(confidence, 2),
+            "occurrences": count,
+        }
+
     def get_pattern_summary(self, patterns: list[dict]) -> str:
         """Generate a human-readable summary of detected patterns."""
         if not patterns:
@@ -1,5 +1,7 @@
 """Lighting predictor based on detected patterns."""
 
+import threading
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -7,6 +9,110 @@ from loguru import logger
 
 from src.storage.database import Database
 
+MINUTES_PER_DAY = 24 * 60
+
+
+class PatternIndex:
+    """
+    Active patterns compiled for constant-time lookups.
+
+    Sequence patterns are keyed by (trigger_light_id, event_type). Time
+    patterns are bucketed by (weekday, minute of day) of their start time;
+    patterns without a time window are kept per weekday.
+    """
+
+    def __init__(self, patterns: list, min_confidence: float, version: int = 0):
+        """
+        Compile patterns.
+
+        Args:
+            patterns: DetectedPattern records
+            min_confidence: Patterns below this confidence are left out
+            version: Database.patterns_version the patterns were read at
+        """
+        self.version = version
+        self.sequences: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        self.timed: dict[tuple[int, int], list[dict]] = defaultdict(list)
+        self.untimed: dict[int, list[dict]] = defaultdict(list)
+
+        for pattern in patterns:
+            if pattern.confidence < min_confidence:
+                continue
+
+            prediction = {
+                "pattern_id": pattern.id,
+                "pattern_type": pattern.pattern_type,
+                "description": pattern.description,
+                "action": pattern.action,
+                "confidence": pattern.confidence,
+            }
+
+            if pattern.weekdays:
+                weekdays = [int(w) for w in pattern.weekdays.split(",") if w]
+            else:
+                weekdays = list(range(7))
+
+            start_minute = _parse_minute(pattern.time_start)
+            for weekday in weekdays:
+                if start_minute is None:
+                    self.untimed[weekday].append(prediction)
+                else:
+                    self.timed[(weekday, start_minute)].append(prediction)
+
+            if pattern.pattern_type == "sequence":
+                self._add_sequence(pattern)
+
+    def _add_sequence(self, pattern):
+        action = pattern.action
+        if not isinstance(action, dict):
+            return
+
+        trigger = action.get("trigger", {})
+        response = action.get("response", {})
+        self.sequences[(trigger.get("light_id"), trigger.get("type"))].append({
+            "pattern_id": pattern.id,
+            "light_id": response.get("light_id"),
+            "action": response.get("type"),
+            "delay_seconds": action.get("delay_seconds", 0),
+            "confidence": pattern.confidence,
+        })
+
+    def sequence_actions(self, trigger_light_id: str, trigger_event: str) -> list[dict]:
+        """Get the responses to a light event."""
+        return [dict(a) for a in self.sequences.get((trigger_light_id, trigger_event), ())]
+
+    def predictions_at(self, now: datetime, lookahead: int) -> list[dict]:
+        """
+        Get patterns matching a time.
+
+        Timed patterns match when their start lies within the next
+        `lookahead` minutes, the same day.
+        """
+        weekday = now.weekday()
+        minute = now.hour * 60 + now.minute
+        matches = list(self.untimed.get(weekday, ()))
+
+        # A start in the current minute has already passed once seconds tick
+        first = 0 if now.second == 0 else 1
+        for offset in range(first, lookahead + 1):
+            if minute + offset >= MINUTES_PER_DAY:
+                break
+            matches.extend(self.timed.get((weekday, minute + offset), ()))
+
+        matches.sort(key=lambda p: p["pattern_id"])
+        return [{**p, "trigger_time": now} for p in matches]
+
+
+def _parse_minute(time_str: Optional[str]) -> Optional[int]:
+    """Convert HH:MM to minute of day (None if missing or malformed)."""
+    if not time_str:
+        return None
+    try:
+        hour, minute = map(int, time_str.split(":"))
+    except (ValueError, AttributeError):
+        return None
+    return hour * 60 + minute
+
 
 class LightingPredictor:
     """Predicts lighting needs based on learned patterns."""
@@ -28,6 +134,29 @@ class LightingPredictor:
         self.db = database
         self.min_confidence = min_confidence
         self.lookahead = lookahead_minutes
+        self._index: Optional[PatternIndex] = None
+        self._index_lock = threading.Lock()
+
+    def _get_index(self) -> PatternIndex:
+        """Get the compiled pattern index, rebuilding it if patterns changed."""
+        index = self._index
+        version = self.db.patterns_version
+        if index is not None and index.version == version:
+            return index
+
+        with self._index_lock:
+            index = self._index
+            if index is None or index.version != version:
+                index = PatternIndex(
+                    self.db.get_active_patterns(), self.min_confidence, version
+                )
+                self._index = index
+                logger.debug(f"Compiled pattern index (version {version})")
+        return index
+
+    def invalidate(self):
+        """Force the pattern index to be rebuilt on next use."""
+        self._index = None
 
     def get_predictions(self) -> list[dict]:
         """
@@ -36,53 +165,7 @@ class LightingPredictor:
         Returns:
             List of predicted actions to take.
         """
-        now = datetime.now()
-        predictions = []
-
-        # Get active patterns
-        patterns = self.db.get_active_patterns()
-
-        for pattern in patterns:
-            if pattern.confidence < self.min_confidence:
-                continue
-
-            prediction = self._check_pattern_match(pattern, now)
-            if prediction:
-                predictions.append(prediction)
-
-        return predictions
-
-    def _check_pattern_match(self, pattern, now: datetime) -> Optional[dict]:
-        """Check if a pattern matches current conditions."""
-        # Check weekday
-        if pattern.weekdays:
-            weekdays = [int(w) for w in pattern.weekdays.split(",") if w]
-            if now.weekday() not in weekdays:
-                return None
-
-        # Check time window
-        if pattern.time_start:
-            try:
-                start_hour, start_min = map(int, pattern.time_start.split(":"))
-                pattern_time = now.replace(hour=start_hour, minute=start_min, second=0)
-
-                # Check if we're within the lookahead window
-                time_diff = (pattern_time - now).total_seconds() / 60
-
-                if not (0 <= time_diff <= self.lookahead):
-                    return None
-
-            except (ValueError, AttributeError):
-                pass
-
-        return {
-            "pattern_id": pattern.id,
-            "pattern_type": pattern.pattern_type,
-            "description": pattern.description,
-            "action": pattern.action,
-            "confidence": pattern.confidence,
-            "trigger_time": now,
-        }
+        return self._get_index().predictions_at(datetime.now(), self.lookahead)
 
     def should_trigger_sequence(
         self,
@@ -99,41 +182,7 @@ class LightingPredictor:
         Returns:
             List of actions to take.
         """
-        actions = []
-        patterns = self.db.get_active_patterns()
-
-        for pattern in patterns:
-            if pattern.pattern_type != "sequence":
-                continue
-
-            if pattern.confidence < self.min_confidence:
-                continue
-
-            # Parse the action JSON
-            try:
-                import json
-                action = json.loads(pattern.action.replace("'", '"'))
-
-                trigger = action.get("trigger", {})
-                if (
-                    trigger.get("light_id") == trigger_light_id
-                    and trigger.get("type") == trigger_event
-                ):
-                    response = action.get("response", {})
-                    delay = action.get("delay_seconds", 0)
-
-                    actions.append({
-                        "pattern_id": pattern.id,
-                        "light_id": response.get("light_id"),
-                        "action": response.get("type"),
-                        "delay_seconds": delay,
-                        "confidence": pattern.confidence,
-                    })
-
-            except (json.JSONDecodeError, AttributeError):
-                continue
-
-        return actions
+        return self._get_index().sequence_actions(trigger_light_id, trigger_event)
 
     def get_recommendations(self) -> list[dict]:
         """
@@ -169,19 +218,25 @@ class LightingPredictor:
             was_correct: Whether the prediction was correct
         """
         with self.db.get_session() as session:
-            from src.storage.database import DetectedPattern
+            from src.storage.database import DetectedPattern, MIN_ACTIVE_CONFIDENCE
 
             pattern = session.query(DetectedPattern).get(pattern_id)
             if pattern:
-                # Adjust confidence
+                # Adjust confidence, remembering the change so re-detecting
+                # the pattern doesn't discard it (see Database.save_patterns)
+                old_confidence = pattern.confidence
                 if was_correct:
                     pattern.confidence = min(1.0, pattern.confidence + 0.05)
                 else:
                     pattern.confidence = max(0.0, pattern.confidence - 0.1)
+                pattern.feedback_adjustment = (
+                    (pattern.feedback_adjustment or 0.0) + pattern.confidence - old_confidence
+                )
 
                 # Deactivate if confidence drops too low
-                if pattern.confidence < 0.3:
+                if pattern.confidence < MIN_ACTIVE_CONFIDENCE:
                     pattern.is_active = False
                     logger.info(f"Deactivated low-confidence pattern: {pattern.description}")
 
                 session.commit()
+                self.db.patterns_version += 1
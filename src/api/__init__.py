@@ -1,5 +1,6 @@
 """REST API module."""
 
+from .broadcast import EventBroadcaster
 from .server import create_api, APIServer
 
-__all__ = ["create_api", "APIServer"]
+__all__ = ["create_api", "APIServer", "EventBroadcaster"]
@@ -0,0 +1,149 @@
+"""Fan out live updates to dashboards as server-sent events."""
+
+import json
+import queue
+import threading
+from typing import Iterator, Optional
+
+from loguru import logger
+
+from src.hue.models import LightEvent, LightState
+
+
+def light_to_json(light: LightState) -> dict:
+    """Light as served by /api/lights and the "light" stream event."""
+    return {
+        "id": light.light_id,
+        "name": light.name,
+        "is_on": light.is_on,
+        "brightness": light.brightness,
+        "brightness_percent": light.brightness_percent,
+        "hue": light.hue,
+        "saturation": light.saturation,
+        "color_temp": light.color_temp,
+        "reachable": light.reachable,
+    }
+
+
+class EventBroadcaster:
+    """
+    Publishes updates once to every connected stream client.
+
+    Each client gets a bounded queue; a client that stops reading loses
+    its oldest updates instead of holding up publishers. Events:
+
+        light     a light's new state (see light_to_json)
+        event     a logged LightEvent
+        adaptive  all adaptive lighting sessions
+    """
+
+    def __init__(self, max_clients: int = 16, queue_size: int = 100, heartbeat: float = 15):
+        """
+        Initialize broadcaster.
+
+        Args:
+            max_clients: Maximum concurrent stream clients (each holds an
+                API server thread while connected; APIServer adds that
+                many threads to its pool)
+            queue_size: Updates buffered per client
+            heartbeat: Seconds between keep-alive comments on an idle stream
+        """
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._clients: list[queue.Queue] = []
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> Optional[queue.Queue]:
+        """
+        Register a stream client.
+
+        Returns:
+            The client's queue, or None if max_clients are connected.
+        """
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                return None
+            client: queue.Queue = queue.Queue(self.queue_size)
+            self._clients.append(client)
+        logger.debug(f"Stream client connected ({len(self._clients)} total)")
+        return client
+
+    def unsubscribe(self, client: queue.Queue):
+        """Remove a stream client."""
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def publish(self, event: str, data):
+        """
+        Send an update to all stream clients.
+
+        Args:
+            event: Event name
+            data: JSON-serializable payload
+        """
+        with self._lock:
+            clients = list(self._clients)
+        if not clients:
+            return
+
+        message = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        dropped = 0
+        for client in clients:
+            while True:
+                try:
+                    client.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        client.get_nowait()
+                        dropped += 1
+                    except queue.Empty:
+                        pass
+
+        with self._lock:
+            self.published += 1
+            self.dropped += dropped
+
+    def publish_light(self, light: LightState):
+        """Send a light's new state."""
+        self.publish("light", light_to_json(light))
+
+    def publish_event(self, event: LightEvent):
+        """Send a newly logged event."""
+        self.publish("event", event.to_dict())
+
+    def publish_adaptive(self, sessions: list[dict]):
+        """Send the adaptive lighting sessions."""
+        self.publish("adaptive", {"sessions": sessions})
+
+    def stream(self, client: queue.Queue) -> Iterator[str]:
+        """
+        Yield a client's updates as a text/event-stream body.
+
+        Unsubscribes the client when the connection closes.
+        """
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    yield client.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(client)
+            logger.debug("Stream client disconnected")
+
+    @property
+    def stats(self) -> dict:
+        """Get client and message counters."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "max_clients": self.max_clients,
+                "published": self.published,
+                "dropped": self.dropped,
+            }
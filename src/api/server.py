@@ -5,16 +5,23 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
-from flask import Flask, jsonify, request, send_from_directory, redirect
+from flask import Flask, Response, jsonify, request, send_from_directory, redirect
 from flask_cors import CORS
 from loguru import logger
+from werkzeug.serving import WSGIRequestHandler, make_server
 import threading
-import time
 import math
 
+try:
+    from waitress.server import create_server as create_waitress_server
+except ImportError:
+    create_waitress_server = None
+
 from src.hue.bridge import HueBridge
 from src.storage.database import Database
 from src.analyzer.pattern_detector import PatternDetector
+from src.automation.adaptive import AdaptiveLightingController, lightlevel_to_lux
+from .broadcast import EventBroadcaster, light_to_json
 
 # Static files directory
 STATIC_DIR = Path(__file__).parent / "static"
@@ -24,6 +31,8 @@ def create_api(
     database: Database,
     bridge: HueBridge,
     pattern_detector: PatternDetector,
+    adaptive_controller: Optional[AdaptiveLightingController] = None,
+    broadcaster: Optional[EventBroadcaster] = None,
 ) -> Flask:
     """
     Create Flask API application.
@@ -32,12 +41,24 @@ def create_api(
         database: Database instance
         bridge: HueBridge instance
         pattern_detector: PatternDetector instance
+        adaptive_controller: Runs adaptive lighting sessions (a new one is
+            created and started if not given)
+        broadcaster: Live updates for /api/stream (if not given, a new one
+            only carries adaptive session updates)
 
     Returns:
         Configured Flask app.
     """
+    if adaptive_controller is None:
+        adaptive_controller = AdaptiveLightingController(database, bridge)
+        adaptive_controller.start()
+    if broadcaster is None:
+        broadcaster = EventBroadcaster()
+        adaptive_controller.add_listener(broadcaster.publish_adaptive)
+
     app = Flask(__name__, static_folder=str(STATIC_DIR))
     CORS(app)  # Allow cross-origin requests from PC
+    app.extensions["broadcaster"] = broadcaster
 
     @app.route("/")
     def index():
@@ -65,6 +86,10 @@ def create_api(
             "active_patterns": stats["active_patterns"],
             "oldest_event": stats["oldest_event"].isoformat() if stats["oldest_event"] else None,
             "newest_event": stats["newest_event"].isoformat() if stats["newest_event"] else None,
+            "bridge_cache": bridge.cache_stats,
+            "bridge_commands": bridge.command_stats,
+            "bridge_writes": bridge.write_stats,
+            "stream": broadcaster.stats,
             "timestamp": datetime.now().isoformat(),
         })
 
@@ -74,22 +99,27 @@ def create_api(
         lights = bridge.get_all_lights()
         return jsonify({
             "count": len(lights),
-            "lights": [
-                {
-                    "id": light.light_id,
-                    "name": light.name,
-                    "is_on": light.is_on,
-                    "brightness": light.brightness,
-                    "brightness_percent": light.brightness_percent,
-                    "hue": light.hue,
-                    "saturation": light.saturation,
-                    "color_temp": light.color_temp,
-                    "reachable": light.reachable,
-                }
-                for light in lights.values()
-            ],
+            "lights": [light_to_json(light) for light in lights.values()],
         })
 
+    @app.route("/api/stream", methods=["GET"])
+    def stream_updates():
+        """
+        Stream live updates as server-sent events.
+
+        Events: "light" (a light's new state, as in /api/lights), "event"
+        (a newly logged event) and "adaptive" (all adaptive sessions).
+        """
+        client = broadcaster.subscribe()
+        if client is None:
+            return jsonify({"error": "Too many stream clients"}), 503
+
+        return Response(
+            broadcaster.stream(client),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     @app.route("/api/rooms", methods=["GET"])
     def get_rooms():
         """Get all rooms."""
@@ -155,28 +185,49 @@ def create_api(
         days = request.args.get("days", 30, type=int)
         start_date = datetime.now() - timedelta(days=days)
 
-        events = database.get_events(start_date=start_date, limit=10000)
+        summary = database.get_event_summary(start_date=start_date)
 
-        # Aggregate by light
-        by_light = {}
-        for e in events:
-            if e.light_name not in by_light:
-                by_light[e.light_name] = {"on": 0, "off": 0, "brightness": 0, "total": 0}
-            by_light[e.light_name][e.event_type] = by_light[e.light_name].get(e.event_type, 0) + 1
-            by_light[e.light_name]["total"] += 1
-
-        # Aggregate by hour
-        by_hour = {h: 0 for h in range(24)}
-        for e in events:
-            by_hour[e.hour] += 1
+        by_light = {
+            light_name: {"on": 0, "off": 0, "brightness": 0, **counts}
+            for light_name, counts in summary["by_light"].items()
+        }
+        by_hour = {h: summary["by_hour"].get(h, 0) for h in range(24)}
 
         return jsonify({
             "days_analyzed": days,
-            "total_events": len(events),
+            "total_events": summary["total_events"],
             "by_light": by_light,
             "by_hour": by_hour,
         })
 
+    @app.route("/api/usage", methods=["GET"])
+    def get_usage():
+        """Get hours each light was on, per day or hour."""
+        days = request.args.get("days", 30, type=int)
+        period = request.args.get("period", "day")
+        if period not in ("hour", "day"):
+            return jsonify({"error": "period must be 'hour' or 'day'"}), 400
+        start_date = datetime.now() - timedelta(days=days)
+
+        by_light: dict[str, dict] = {}
+        for row in database.get_usage(start_date=start_date, period=period):
+            light = by_light.setdefault(
+                row["light_id"], {"name": row["light_name"], "total_hours": 0.0, "hours": {}}
+            )
+            hours = row["on_seconds"] / 3600
+            light["name"] = row["light_name"] or light["name"]
+            light["hours"][row["bucket"].isoformat()] = round(hours, 2)
+            light["total_hours"] += hours
+
+        for light in by_light.values():
+            light["total_hours"] = round(light["total_hours"], 2)
+
+        return jsonify({
+            "days_analyzed": days,
+            "period": period,
+            "lights": by_light,
+        })
+
     @app.route("/api/patterns", methods=["GET"])
     def get_patterns():
         """Get detected patterns."""
@@ -209,9 +260,7 @@ def create_api(
 
         patterns = pattern_detector.analyze(days_back=days)
 
-        # Save patterns
-        for pattern in patterns:
-            database.save_pattern(pattern)
+        database.save_patterns(patterns)
 
         return jsonify({
             "success": True,
@@ -334,13 +383,11 @@ def create_api(
             mapped_action[mapped_key] = value
 
         success_count = 0
-        for target_id in target_ids:
-            target_id = target_id.strip()
-            if automation.target_type == "light":
-                if bridge.set_light_state(target_id, **mapped_action):
-                    success_count += 1
-            elif automation.target_type == "room":
-                if bridge.set_group_state(target_id, **mapped_action):
+        if automation.target_type == "light":
+            success_count = bridge.set_lights_state(target_ids, **mapped_action)
+        elif automation.target_type == "room":
+            for target_id in target_ids:
+                if bridge.set_group_state(target_id.strip(), **mapped_action):
                     success_count += 1
 
         # Record trigger
@@ -586,15 +633,6 @@ def create_api(
 
     # ===== Adaptive Lighting =====
 
-    # Store for active adaptive lighting sessions
-    adaptive_sessions = {}
-
-    def lightlevel_to_lux(lightlevel):
-        """Convert Hue lightlevel to lux. Formula: lux = 10^((lightlevel - 1) / 10000)"""
-        if lightlevel <= 0:
-            return 0
-        return round(10 ** ((lightlevel - 1) / 10000), 1)
-
     def lux_to_lightlevel(lux):
         """Convert lux to Hue lightlevel."""
         if lux <= 0:
@@ -647,44 +685,18 @@ def create_api(
 
         sensor_id = data.get("sensor_id")
         light_ids = data.get("light_ids", [])
-        target_lux = data.get("target_lux", 150)
-        min_brightness = data.get("min_brightness", 1)
-        max_brightness = data.get("max_brightness", 254)
-        step = data.get("step", 10)
 
         if not sensor_id or not light_ids:
             return jsonify({"error": "sensor_id and light_ids required"}), 400
 
-        session_id = f"adaptive_{sensor_id}"
-
-        # Stop existing session if any
-        if session_id in adaptive_sessions:
-            adaptive_sessions[session_id]["active"] = False
-            time.sleep(0.5)
-
-        # Create new session
-        session = {
-            "active": True,
-            "sensor_id": sensor_id,
-            "light_ids": light_ids,
-            "target_lux": target_lux,
-            "min_brightness": min_brightness,
-            "max_brightness": max_brightness,
-            "step": step,
-            "current_brightness": 0,
-            "current_lux": 0,
-            "iterations": 0,
-            "status": "starting",
-        }
-        adaptive_sessions[session_id] = session
-
-        # Start background thread
-        thread = threading.Thread(
-            target=_run_adaptive_loop,
-            args=(bridge, session_id, adaptive_sessions),
-            daemon=True,
+        session_id = adaptive_controller.start_session(
+            sensor_id,
+            light_ids,
+            target_lux=data.get("target_lux", 150),
+            min_brightness=data.get("min_brightness", 1),
+            max_brightness=data.get("max_brightness", 254),
+            step=data.get("step", 10),
         )
-        thread.start()
 
         return jsonify({
             "success": True,
@@ -698,44 +710,18 @@ def create_api(
         data = request.get_json() or {}
         session_id = data.get("session_id")
 
-        if session_id and session_id in adaptive_sessions:
-            adaptive_sessions[session_id]["active"] = False
-            adaptive_sessions[session_id]["status"] = "stopped"
+        if session_id and adaptive_controller.stop_session(session_id):
             return jsonify({"success": True, "message": "Stopped"})
 
         # Stop all sessions
-        for sid in adaptive_sessions:
-            adaptive_sessions[sid]["active"] = False
-            adaptive_sessions[sid]["status"] = "stopped"
+        adaptive_controller.stop_session()
 
         return jsonify({"success": True, "message": "All sessions stopped"})
 
     @app.route("/api/adaptive/status", methods=["GET"])
     def get_adaptive_status():
         """Get status of all adaptive lighting sessions."""
-        # Also refresh sensor readings
-        sensors = bridge.get_sensors()
-
-        sessions_status = []
-        for session_id, session in adaptive_sessions.items():
-            # Get fresh sensor reading
-            sensor = sensors.get(session["sensor_id"], {})
-            state = sensor.get("state", {})
-            lightlevel = state.get("lightlevel", 0)
-
-            sessions_status.append({
-                "session_id": session_id,
-                "active": session["active"],
-                "sensor_id": session["sensor_id"],
-                "light_ids": session["light_ids"],
-                "target_lux": session["target_lux"],
-                "current_lux": lightlevel_to_lux(lightlevel),
-                "current_brightness": session.get("current_brightness", 0),
-                "iterations": session.get("iterations", 0),
-                "status": session.get("status", "unknown"),
-            })
-
-        return jsonify({"sessions": sessions_status})
+        return jsonify({"sessions": adaptive_controller.get_sessions()})
 
     @app.route("/api/adaptive/test-once", methods=["POST"])
     def test_adaptive_once():
@@ -778,17 +764,17 @@ def create_api(
                 "current_brightness": current_bri,
             })
 
-        # Estimate brightness adjustment needed
-        # Rough estimate: 10 lux ≈ 5 brightness units
-        adjustment = int(lux_diff / 2)
-        adjustment = max(-25, min(25, adjustment))  # Limit step size
-
-        new_bri = current_bri + adjustment
-        new_bri = max(1, min(254, new_bri))
+        # Estimate the brightness for the target from the learned response
+        new_bri = adaptive_controller.suggest_brightness(
+            sensor_id, light_ids, current_bri, current_lux, target_lux
+        )
+        step = data.get("step")
+        if step:
+            new_bri = max(current_bri - step, min(current_bri + step, new_bri))
+        adjustment = new_bri - current_bri
 
         # Apply to all lights
-        for light_id in light_ids:
-            bridge.set_light_state(light_id, on=True, brightness=new_bri)
+        bridge.set_lights_state(light_ids, on=True, brightness=new_bri)
 
         return jsonify({
             "action": "adjusted",
@@ -804,74 +790,18 @@ def create_api(
     return app
 
 
-def _run_adaptive_loop(bridge, session_id, sessions):
-    """Background thread for adaptive lighting adjustment."""
-    session = sessions.get(session_id)
-    if not session:
-        return
-
-    session["status"] = "running"
-    logger.info(f"Starting adaptive lighting loop: {session_id}")
-
-    # Give lights time to turn on initially
-    for light_id in session["light_ids"]:
-        bridge.set_light_state(light_id, on=True, brightness=session["min_brightness"])
-    time.sleep(2)
-
-    while session.get("active", False):
-        try:
-            # Get current sensor reading
-            sensors = bridge.get_sensors()
-            sensor = sensors.get(session["sensor_id"], {})
-            state = sensor.get("state", {})
-            lightlevel = state.get("lightlevel", 0)
-            current_lux = 10 ** ((lightlevel - 1) / 10000) if lightlevel > 0 else 0
-
-            session["current_lux"] = round(current_lux, 1)
-            session["iterations"] += 1
-
-            # Get current brightness from first light
-            lights = bridge.get_all_lights()
-            first_light = lights.get(session["light_ids"][0])
-            current_bri = first_light.brightness if first_light and first_light.is_on else session["min_brightness"]
-            session["current_brightness"] = current_bri
-
-            target_lux = session["target_lux"]
-            lux_diff = target_lux - current_lux
-
-            # Check if we've reached target
-            if abs(lux_diff) < 5:
-                session["status"] = "target_reached"
-                logger.info(f"Adaptive {session_id}: Target reached at {current_lux} lux, brightness {current_bri}")
-            else:
-                session["status"] = "adjusting"
-
-                # Calculate adjustment
-                adjustment = int(lux_diff / 2)
-                adjustment = max(-session["step"], min(session["step"], adjustment))
-
-                new_bri = current_bri + adjustment
-                new_bri = max(session["min_brightness"], min(session["max_brightness"], new_bri))
-
-                if new_bri != current_bri:
-                    for light_id in session["light_ids"]:
-                        bridge.set_light_state(light_id, brightness=new_bri)
-                    logger.debug(f"Adaptive {session_id}: lux={current_lux:.1f}, target={target_lux}, bri {current_bri}→{new_bri}")
-
-            # Wait before next iteration
-            time.sleep(3)
-
-        except Exception as e:
-            logger.error(f"Adaptive lighting error: {e}")
-            session["status"] = f"error: {e}"
-            time.sleep(5)
-
-    session["status"] = "stopped"
-    logger.info(f"Adaptive lighting stopped: {session_id}")
+class APIServer:
+    """
+    Runs Flask API in a background thread.
 
+    Serving modes:
+        waitress     production WSGI server with a fixed thread pool
+                     (falls back to "threaded" if waitress isn't installed)
+        threaded     werkzeug server, one thread per connection, keep-alive
+        development  Flask's built-in development server
+    """
 
-class APIServer:
-    """Runs Flask API in a background thread."""
+    SERVERS = ("waitress", "threaded", "development")
 
     def __init__(
         self,
@@ -880,6 +810,12 @@ class APIServer:
         pattern_detector: PatternDetector,
         host: str = "0.0.0.0",
         port: int = 5000,
+        adaptive_controller: Optional[AdaptiveLightingController] = None,
+        broadcaster: Optional[EventBroadcaster] = None,
+        server: str = "waitress",
+        threads: int = 8,
+        connection_limit: int = 100,
+        timeout: float = 30,
     ):
         """
         Initialize API server.
@@ -890,33 +826,106 @@ class APIServer:
             pattern_detector: PatternDetector instance
             host: Host to bind to (0.0.0.0 for all interfaces)
             port: Port to listen on
+            adaptive_controller: Runs adaptive lighting sessions
+            broadcaster: Live updates for /api/stream
+            server: Serving mode (see class docstring)
+            threads: Worker threads handling requests (waitress); one more
+                per allowed stream client is added, since each holds a
+                thread while connected
+            connection_limit: Maximum open connections (waitress)
+            timeout: Seconds before an idle or stalled connection is closed
         """
-        self.app = create_api(database, bridge, pattern_detector)
+        if server not in self.SERVERS:
+            raise ValueError(f"Unknown API server {server!r}, expected one of {self.SERVERS}")
+        if server == "waitress" and create_waitress_server is None:
+            logger.warning("waitress is not installed, using the threaded werkzeug server")
+            server = "threaded"
+
+        self.app = create_api(
+            database, bridge, pattern_detector, adaptive_controller, broadcaster
+        )
         self.host = host
         self.port = port
+        self.server = server
+        # Stream clients get their own threads so they can't starve requests
+        self.threads = threads + self.app.extensions["broadcaster"].max_clients
+        self.connection_limit = connection_limit
+        self.timeout = timeout
+        self._server = None
         self._thread: Optional[threading.Thread] = None
 
     def start(self):
         """Start API server in background thread."""
+        # Bind before returning so a port conflict fails loudly
+        if self.server == "waitress":
+            self._server = create_waitress_server(
+                self.app,
+                host=self.host,
+                port=self.port,
+                threads=self.threads,
+                connection_limit=self.connection_limit,
+                channel_timeout=self.timeout,
+                ident="LightsOut",
+            )
+            self.port = self._server.effective_port
+        elif self.server == "threaded":
+            self._server = make_server(
+                self.host,
+                self.port,
+                self.app,
+                threaded=True,
+                request_handler=_keep_alive_handler(self.timeout),
+            )
+            self.port = self._server.port
+
         self._thread = threading.Thread(
             target=self._run,
             daemon=True,
             name="api-server",
         )
         self._thread.start()
-        logger.info(f"🌐 API server started on http://{self.host}:{self.port}")
+        logger.info(f"🌐 API server ({self.server}) started on http://{self.host}:{self.port}")
         logger.info(f"📊 Dashboard: http://{self.host}:{self.port}/")
 
+    def stop(self):
+        """Stop serving (not supported by the development server)."""
+        if self.server == "waitress" and self._server:
+            self._server.close()
+        elif self.server == "threaded" and self._server:
+            self._server.shutdown()
+        if self._thread and self._server:
+            self._thread.join(timeout=5)
+
     def _run(self):
         """Run Flask app (called in background thread)."""
         # Suppress Flask's default logging
         import logging
         log = logging.getLogger("werkzeug")
         log.setLevel(logging.WARNING)
-
-        self.app.run(
-            host=self.host,
-            port=self.port,
-            debug=False,
-            use_reloader=False,
-        )
+        # waitress warns about every queued request under load
+        logging.getLogger("waitress.queue").setLevel(logging.ERROR)
+
+        if self.server == "waitress":
+            try:
+                self._server.run()
+            except OSError:
+                pass  # Raised by the event loop once stop() closes the sockets
+        elif self.server == "threaded":
+            self._server.serve_forever()
+        else:
+            self.app.run(
+                host=self.host,
+                port=self.port,
+                debug=False,
+                use_reloader=False,
+            )
+
+
+def _keep_alive_handler(timeout: float) -> type[WSGIRequestHandler]:
+    """Werkzeug request handler speaking HTTP/1.1 with a socket timeout."""
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+    KeepAliveHandler.timeout = timeout
+    return KeepAliveHandler
@@ -1,5 +1,6 @@
 """Automation module for LightsOut."""
 
+from .adaptive import AdaptiveLightingController
 from .executor import AutomationExecutor, SunCalculator
 
-__all__ = ["AutomationExecutor", "SunCalculator"]
+__all__ = ["AdaptiveLightingController", "AutomationExecutor", "SunCalculator"]
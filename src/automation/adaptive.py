@@ -0,0 +1,417 @@
+"""Shared closed-loop controller for adaptive lighting sessions."""
+
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from loguru import logger
+
+from src.hue.bridge import HueBridge
+from src.storage.database import Database
+from src.automation.lux_model import LuxResponseModel
+
+# Lux per brightness unit until a response has been learned
+# ("10 lux ≈ 5 brightness units")
+DEFAULT_GAIN = 2.0
+
+# Lux error considered on target
+LUX_TOLERANCE = 5
+
+# Only integrate errors within this fraction of the target, so the large
+# errors of the initial approach don't wind up the integral
+INTEGRAL_BAND = 0.25
+
+
+def lightlevel_to_lux(lightlevel: int) -> float:
+    """Convert Hue lightlevel to lux. Formula: lux = 10^((lightlevel - 1) / 10000)"""
+    if lightlevel <= 0:
+        return 0
+    return round(10 ** ((lightlevel - 1) / 10000), 1)
+
+
+class AdaptiveLightingController:
+    """
+    Runs all adaptive lighting sessions from one background thread.
+
+    Each tick reads the sensors and lights once and updates every active
+    session with a PI controller working in brightness units: the lux
+    error is divided by the learned lux-per-brightness response of the
+    session's sensor and lights (see LuxResponseModel). Once the response
+    is known the controller jumps straight to the estimated brightness.
+    Sessions and the readings they take are stored in the database, so
+    both sessions and learned responses survive restarts.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        bridge: HueBridge,
+        interval: float = 3.0,
+        kp: float = 0.8,
+        ki: float = 0.15,
+        max_sensor_wait: int = 3,
+    ):
+        """
+        Initialize controller.
+
+        Args:
+            database: Database instance (session persistence)
+            bridge: HueBridge instance
+            interval: Seconds between ticks
+            kp: Proportional gain while the response is still unknown
+            ki: Integral gain, corrects steady offsets such as daylight drift
+            max_sensor_wait: Ticks to wait for a fresh sensor reading after
+                a brightness change before acting on the old one
+        """
+        self.database = database
+        self.bridge = bridge
+        self.interval = interval
+        self.kp = kp
+        self.ki = ki
+        self.max_sensor_wait = max_sensor_wait
+
+        self._sessions: dict[str, dict] = {}
+        self._models: dict[tuple[str, str], LuxResponseModel] = {}
+        self._samples: list[dict] = []
+        self._listeners: list[Callable[[list[dict]], None]] = []
+        self._last_notified: Optional[list[dict]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, callback: Callable[[list[dict]], None]):
+        """
+        Register a callback invoked with all sessions whenever they change.
+
+        Args:
+            callback: Function taking the list from get_sessions()
+        """
+        self._listeners.append(callback)
+
+    def start(self):
+        """Resume persisted sessions and start ticking."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        try:
+            stored = self.database.get_adaptive_sessions(active_only=True)
+        except Exception as e:
+            logger.error(f"Failed to load adaptive sessions: {e}")
+            stored = []
+        with self._lock:
+            for session in stored:
+                self._sessions.setdefault(session["session_id"], self._runtime(session))
+        if stored:
+            logger.info(f"Resumed {len(stored)} adaptive lighting sessions")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="adaptive-lighting")
+        self._thread.start()
+
+    def stop(self):
+        """Stop ticking (sessions stay persisted and resume on next start)."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+    def start_session(
+        self,
+        sensor_id: str,
+        light_ids: list[str],
+        target_lux: float = 150,
+        min_brightness: int = 1,
+        max_brightness: int = 254,
+        step: Optional[int] = 10,
+    ) -> str:
+        """
+        Start (or restart) adaptive lighting for a sensor.
+
+        Args:
+            sensor_id: ZLLLightLevel sensor ID
+            light_ids: Lights to adjust
+            target_lux: Desired sensor reading
+            min_brightness: Lowest brightness to use
+            max_brightness: Highest brightness to use
+            step: Maximum PI correction per iteration (None = no limit); jumps
+                estimated by a confident lux model are not limited
+
+        Returns:
+            The session ID.
+        """
+        session_id = f"adaptive_{sensor_id}"
+        session = self._runtime({
+            "session_id": session_id,
+            "sensor_id": str(sensor_id),
+            "light_ids": [str(light_id) for light_id in light_ids],
+            "target_lux": target_lux,
+            "min_brightness": min_brightness,
+            "max_brightness": max_brightness,
+            "step": step,
+            "active": True,
+            "status": "starting",
+            "current_brightness": 0,
+            "current_lux": 0.0,
+            "iterations": 0,
+            "gain": DEFAULT_GAIN,
+            "integral": 0.0,
+        })
+
+        # Turn on lights that are off at the lowest brightness
+        lights = self.bridge.get_all_lights()
+        off = [
+            light_id for light_id in session["light_ids"]
+            if not (lights.get(light_id) and lights[light_id].is_on)
+        ]
+        if off:
+            state = self.bridge.get_sensors().get(session["sensor_id"], {}).get("state", {})
+            self.bridge.set_lights_state(off, on=True, brightness=min_brightness)
+            session["_awaiting"] = state.get("lastupdated")
+
+        with self._lock:
+            self._sessions[session_id] = session
+        self._persist([session])
+        self._notify()
+        logger.info(f"Started adaptive lighting: {session_id}")
+        return session_id
+
+    def stop_session(self, session_id: Optional[str] = None) -> bool:
+        """
+        Stop one session, or all sessions if no ID is given.
+
+        Stopped sessions are saved and then dropped from memory.
+
+        Returns:
+            False if the given session does not exist.
+        """
+        with self._lock:
+            if session_id is not None and session_id not in self._sessions:
+                return False
+            targets = [session_id] if session_id is not None else list(self._sessions)
+            stopped = []
+            for sid in targets:
+                session = self._sessions[sid]
+                session["active"] = False
+                session["status"] = "stopped"
+                stopped.append(session)
+
+        self._persist(stopped)
+        with self._lock:
+            for session in stopped:
+                # Unless a new session was started for the sensor meanwhile
+                if self._sessions.get(session["session_id"]) is session:
+                    del self._sessions[session["session_id"]]
+        self._notify()
+        return True
+
+    def get_sessions(self) -> list[dict]:
+        """Get public state of all sessions."""
+        with self._lock:
+            return [
+                {k: v for k, v in s.items() if not k.startswith("_")}
+                for s in self._sessions.values()
+            ]
+
+    def suggest_brightness(
+        self,
+        sensor_id: str,
+        light_ids: list[str],
+        brightness: int,
+        lux: float,
+        target_lux: float,
+    ) -> int:
+        """
+        Estimate the brightness that brings a sensor to a target in one step.
+
+        Args:
+            sensor_id: ZLLLightLevel sensor ID
+            light_ids: Lights that will be adjusted
+            brightness: Current brightness of the lights
+            lux: Current sensor reading
+            target_lux: Desired sensor reading
+
+        Returns:
+            Brightness (1-254).
+        """
+        model = self._get_model(str(sensor_id), [str(light_id) for light_id in light_ids])
+        estimate = model.brightness_for(brightness, lux, target_lux)
+        if estimate is None:
+            estimate = brightness + (target_lux - lux) / DEFAULT_GAIN
+        return max(1, min(254, int(round(estimate))))
+
+    def tick(self):
+        """Read sensors and lights once and update every active session."""
+        with self._lock:
+            active = [s for s in self._sessions.values() if s["active"]]
+        if not active:
+            return
+
+        sensors = self.bridge.get_sensors()
+        lights = self.bridge.get_all_lights()
+
+        for session in active:
+            try:
+                self._update(session, sensors, lights)
+            except Exception as e:
+                logger.error(f"Adaptive lighting error ({session['session_id']}): {e}")
+                session["status"] = f"error: {e}"
+
+        self._persist(active)
+        self._notify()
+
+    def _run(self):
+        logger.info("Adaptive lighting controller started")
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Adaptive lighting tick failed: {e}")
+            self._stop.wait(self.interval)
+        logger.info("Adaptive lighting controller stopped")
+
+    def _update(self, session: dict, sensors: dict, lights: dict):
+        """Run one control iteration for a session."""
+        state = sensors.get(session["sensor_id"], {}).get("state", {})
+        lux = lightlevel_to_lux(state.get("lightlevel", 0))
+        reading = state.get("lastupdated")
+
+        light = lights.get(session["light_ids"][0]) if session["light_ids"] else None
+        bri = light.brightness if light and light.is_on else session["min_brightness"]
+
+        session["current_lux"] = lux
+        session["current_brightness"] = bri
+        session["iterations"] += 1
+
+        # After a change, wait for a reading taken with the new brightness
+        stale = session["_awaiting"] is not None and reading == session["_awaiting"]
+        if stale and session["_waited"] < self.max_sensor_wait:
+            session["_waited"] += 1
+            session["status"] = "waiting_for_sensor"
+            return
+        session["_awaiting"] = None
+
+        # Learn from each new reading that reflects the current brightness
+        model = self._get_model(session["sensor_id"], session["light_ids"])
+        if not stale and reading != session["_sample_reading"] and light and light.is_on:
+            session["_sample_reading"] = reading
+            now = datetime.now()
+            model.add_sample(now, bri, lux)
+            with self._lock:
+                self._samples.append({
+                    "sensor_id": session["sensor_id"],
+                    "light_key": _light_key(session["light_ids"]),
+                    "timestamp": now,
+                    "brightness": bri,
+                    "lux": lux,
+                })
+        session["gain"] = model.gain_at(bri) or DEFAULT_GAIN
+
+        error = session["target_lux"] - lux
+        if abs(error) < LUX_TOLERANCE:
+            session["integral"] = 0.0
+            if session["status"] != "target_reached":
+                logger.info(
+                    f"Adaptive {session['session_id']}: target reached at {lux} lux, "
+                    f"brightness {bri}"
+                )
+            session["status"] = "target_reached"
+            return
+
+        # Anti-windup: don't integrate far from the target or while pinned
+        # at a brightness limit
+        saturated = (error > 0 and bri >= session["max_brightness"]) or (
+            error < 0 and bri <= session["min_brightness"]
+        )
+        if not saturated and abs(error) <= INTEGRAL_BAND * session["target_lux"]:
+            session["integral"] += error
+
+        # The step limits the PI correction only: a confident model estimate
+        # jumps straight to the target (still within the brightness limits)
+        correction = self.ki * session["integral"] / session["gain"]
+        if model.confident:
+            jump = model.brightness_for(bri, lux, session["target_lux"]) - bri
+        else:
+            jump = 0
+            correction += self.kp * error / session["gain"]
+        if session["step"]:
+            correction = max(-session["step"], min(session["step"], correction))
+        delta = jump + correction
+        new_bri = int(round(bri + delta))
+        new_bri = max(session["min_brightness"], min(session["max_brightness"], new_bri))
+
+        if new_bri == bri:
+            session["status"] = "saturated" if saturated else "adjusting"
+            return
+
+        session["status"] = "adjusting"
+        self.bridge.set_lights_state(session["light_ids"], brightness=new_bri)
+        session["_awaiting"] = reading
+        session["_waited"] = 0
+        logger.debug(
+            f"Adaptive {session['session_id']}: lux={lux:.1f}, "
+            f"target={session['target_lux']}, bri {bri}→{new_bri}, gain={session['gain']:.2f}"
+        )
+
+    @staticmethod
+    def _runtime(session: dict) -> dict:
+        """Add in-memory controller fields to a stored session."""
+        return {
+            **session,
+            "gain": session.get("gain") or DEFAULT_GAIN,
+            "integral": session.get("integral") or 0.0,
+            "_awaiting": None,
+            "_waited": 0,
+            "_sample_reading": None,
+        }
+
+    def _get_model(self, sensor_id: str, light_ids: list[str]) -> LuxResponseModel:
+        """Get the response model of a sensor and light set, loading its history."""
+        key = (sensor_id, _light_key(light_ids))
+        with self._lock:
+            model = self._models.get(key)
+        if model is not None:
+            return model
+
+        try:
+            samples = self.database.get_adaptive_samples(*key)
+        except Exception as e:
+            logger.error(f"Failed to load adaptive samples: {e}")
+            samples = []
+        model = LuxResponseModel.from_samples(samples)
+        if model.responses:
+            logger.info(
+                f"Loaded lux response for sensor {sensor_id} "
+                f"({model.responses} responses)"
+            )
+        with self._lock:
+            return self._models.setdefault(key, model)
+
+    def _notify(self):
+        """Call listeners if any session changed since the last call."""
+        if not self._listeners:
+            return
+        sessions = self.get_sessions()
+        if sessions == self._last_notified:
+            return
+        self._last_notified = sessions
+        for listener in self._listeners:
+            try:
+                listener(sessions)
+            except Exception as e:
+                logger.error(f"Adaptive listener failed: {e}")
+
+    def _persist(self, sessions: list[dict]):
+        with self._lock:
+            samples, self._samples = self._samples, []
+        try:
+            self.database.save_adaptive_sessions([
+                {k: v for k, v in s.items() if not k.startswith("_")} for s in sessions
+            ])
+            self.database.save_adaptive_samples(samples)
+        except Exception as e:
+            logger.error(f"Failed to save adaptive sessions: {e}")
+
+
+def _light_key(light_ids: list[str]) -> str:
+    """Canonical key of a light set."""
+    return ",".join(sorted(light_ids))
@@ -264,23 +264,30 @@ class AutomationExecutor:
 
     def _execute_action(self, target_type: str, target_ids: list[str], action: dict):
         """Execute a single action on targets."""
+        if target_type == "light":
+            # Sent as one batch so the bridge client can run them concurrently
+            try:
+                self.bridge.set_lights_state(
+                    target_ids,
+                    on=action.get("on"),
+                    brightness=action.get("bri"),
+                    hue=action.get("hue"),
+                    saturation=action.get("sat"),
+                    color_temp=action.get("ct"),
+                    transition_time=action.get("transitiontime"),
+                    alert=action.get("alert"),
+                    effect=action.get("effect"),
+                    xy=action.get("xy"),
+                )
+                logger.debug(f"Executed action on lights {target_ids}")
+            except Exception as e:
+                logger.error(f"Failed to execute action on lights {target_ids}: {e}")
+            return
+
         for target_id in target_ids:
             target_id = target_id.strip()
             try:
-                if target_type == "light":
-                    self.bridge.set_light_state(
-                        target_id,
-                        on=action.get("on"),
-                        brightness=action.get("bri"),
-                        hue=action.get("hue"),
-                        saturation=action.get("sat"),
-                        color_temp=action.get("ct"),
-                        transition_time=action.get("transitiontime"),
-                        alert=action.get("alert"),
-                        effect=action.get("effect"),
-                        xy=action.get("xy"),
-                    )
-                elif target_type == "room":
+                if target_type == "room":
                     self.bridge.set_group_state(
                         target_id,
                         on=action.get("on"),
@@ -0,0 +1,139 @@
+"""Learned brightness-to-lux response for adaptive lighting."""
+
+import statistics
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+# Bounds for a plausible lux-per-brightness-unit response
+MIN_GAIN = 0.05
+MAX_GAIN = 50.0
+
+# Smallest brightness change whose lux response is worth learning from
+MIN_BRIGHTNESS_DELTA = 3
+
+# Responses needed before the model is trusted to jump to the target
+CONFIDENT_RESPONSES = 3
+
+
+class LuxResponseModel:
+    """
+    How much one sensor's reading changes with the brightness of a light set.
+
+    Learns from consecutive readings taken at different brightness levels:
+    each pair gives a local response (lux per brightness unit) at the
+    brightness midway between them. Hue lights are not linear, so the
+    response at a brightness is the median of the nearest learned ones.
+    Ambient light cancels out of each pair, so readings from different
+    days can be combined as long as the pair itself is close in time.
+    """
+
+    def __init__(self, max_gap: float = 60, neighbours: int = 5, max_responses: int = 200):
+        """
+        Initialize model.
+
+        Args:
+            max_gap: Maximum seconds between two readings to pair them
+            neighbours: Responses to combine when estimating a gain
+            max_responses: Responses to keep (oldest are dropped)
+        """
+        self.max_gap = max_gap
+        self.neighbours = neighbours
+        self._responses: deque[tuple[float, float]] = deque(maxlen=max_responses)
+        self._last: Optional[tuple[datetime, int, float]] = None
+
+    @classmethod
+    def from_samples(cls, samples: list[dict], **kwargs) -> "LuxResponseModel":
+        """
+        Build a model from stored readings.
+
+        Args:
+            samples: Readings with timestamp, brightness and lux, oldest first
+            **kwargs: Passed to the constructor
+
+        Returns:
+            The fitted model.
+        """
+        model = cls(**kwargs)
+        for sample in samples:
+            model.add_sample(sample["timestamp"], sample["brightness"], sample["lux"])
+        return model
+
+    def add_sample(self, timestamp: datetime, brightness: int, lux: float):
+        """Learn from a reading taken with the lights at the given brightness."""
+        if self._last is not None:
+            last_time, last_brightness, last_lux = self._last
+            delta = brightness - last_brightness
+            if (
+                abs(delta) >= MIN_BRIGHTNESS_DELTA
+                and (timestamp - last_time).total_seconds() <= self.max_gap
+            ):
+                gain = (lux - last_lux) / delta
+                # A falling response means ambient light changed under us
+                if gain > 0:
+                    self._responses.append((
+                        (brightness + last_brightness) / 2,
+                        max(MIN_GAIN, min(MAX_GAIN, gain)),
+                    ))
+        self._last = (timestamp, brightness, lux)
+
+    @property
+    def responses(self) -> int:
+        """Number of learned responses."""
+        return len(self._responses)
+
+    @property
+    def confident(self) -> bool:
+        """Whether there is enough data to jump straight to a target."""
+        return len(self._responses) >= CONFIDENT_RESPONSES
+
+    def gain_at(self, brightness: float) -> Optional[float]:
+        """
+        Estimate lux per brightness unit around a brightness.
+
+        Returns:
+            The gain, or None if nothing has been learned yet.
+        """
+        if not self._responses:
+            return None
+        nearest = sorted(self._responses, key=lambda r: abs(r[0] - brightness))
+        return statistics.median(gain for _, gain in nearest[: self.neighbours])
+
+    def brightness_for(
+        self,
+        brightness: int,
+        lux: float,
+        target_lux: float,
+    ) -> Optional[float]:
+        """
+        Estimate the brightness that brings a reading to the target.
+
+        Args:
+            brightness: Current brightness
+            lux: Current reading
+            target_lux: Desired reading
+
+        Returns:
+            Unclamped brightness, or None if nothing has been learned yet.
+        """
+        if not self._responses:
+            return None
+
+        # Find where the response integrated from the current brightness
+        # covers the error (bisection over the valid brightness range)
+        error = target_lux - lux
+        low, high = (brightness, 254) if error > 0 else (1, brightness)
+        for _ in range(12):
+            middle = (low + high) / 2
+            if self._lux_change(brightness, middle) < error:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    def _lux_change(self, start: float, end: float) -> float:
+        """Estimated lux change from one brightness to another (Simpson's rule)."""
+        average_gain = (
+            self.gain_at(start) + 4 * self.gain_at((start + end) / 2) + self.gain_at(end)
+        ) / 6
+        return (end - start) * average_gain
@@ -1,6 +1,7 @@
 """Hue Bridge communication module."""
 
 from .bridge import HueBridge
+from .client import AsyncHueClient
 from .models import LightState, LightEvent
 
-__all__ = ["HueBridge", "LightState", "LightEvent"]
+__all__ = ["HueBridge", "AsyncHueClient", "LightState", "LightEvent"]
@@ -1,6 +1,8 @@
 """Philips Hue Bridge communication."""
 
+import math
 import os
+import threading
 import time
 from typing import Optional
 
@@ -12,22 +14,106 @@ except ImportError:
     Bridge = None
     PhueRegistrationException = Exception
 
+from .cache import TTLCache
+from .client import AsyncHueClient
 from .models import LightState, Room
+from .planner import MIN_GROUP_SIZE, payload_key, plan_group_commands
+from .write_filter import WriteFilter
+
+# Name prefix of groups created by coalesce_groups (managed_groups)
+MANAGED_GROUP_PREFIX = "LightsOut "
+
+
+def acknowledged_fields(results, command: dict, target: str) -> Optional[dict]:
+    """
+    Pick the command fields a phue set_light/set_group response confirms.
+
+    Args:
+        results: phue return value (a response list per target)
+        command: Command that was sent
+        target: Description for log messages (e.g. "light 3")
+
+    Returns:
+        The acknowledged fields, or None if the bridge accepted none.
+    """
+    acknowledged = set()
+    errors = []
+    for response in results or []:
+        for item in response if isinstance(response, list) else [response]:
+            if not isinstance(item, dict):
+                continue
+            if "error" in item:
+                errors.append(item["error"].get("description", item["error"]))
+            for path in item.get("success", {}):
+                acknowledged.add(path.rsplit("/", 1)[-1])
+
+    if errors:
+        logger.error(f"Bridge rejected {target} command: {errors}")
+    if not acknowledged:
+        return None
+    return {k: v for k, v in command.items() if k in acknowledged}
 
 
 class HueBridge:
     """Handles communication with Philips Hue Bridge."""
 
-    def __init__(self, ip_address: Optional[str] = None):
+    def __init__(
+        self,
+        ip_address: Optional[str] = None,
+        bulk_fetch: bool = True,
+        full_state_max_age: float = 0,
+        cache_ttl: Optional[dict[str, float]] = None,
+        async_commands: bool = False,
+        command_limits: Optional[dict] = None,
+        coalesce_groups: bool = False,
+        managed_groups: int = 0,
+        dedupe_writes: bool = False,
+        dedupe_max_age: float = 10,
+    ):
         """
         Initialize Hue Bridge connection.
 
         Args:
             ip_address: Bridge IP. If None, will try to auto-discover.
+            bulk_fetch: Read all lights with a single GET /lights request
+                instead of one request per light.
+            full_state_max_age: If > 0, read lights, groups, sensors, scenes,
+                rules and schedules from one full-state snapshot
+                (GET /api/<user>) that is reused for this many seconds.
+            cache_ttl: Seconds to cache each resource ("lights", "groups",
+                "sensors", "scenes", "rules", "schedules"). Concurrent reads
+                of the same resource always share one request.
+            async_commands: Send light/group commands through a rate-limited
+                asyncio client with a keep-alive session instead of phue.
+            command_limits: AsyncHueClient options ("lights_per_second",
+                "groups_per_second", "max_concurrency", ...).
+            coalesce_groups: Send a multi-light command as group commands
+                when existing rooms/zones cover the target lights exactly.
+            managed_groups: If > 0, create up to this many bridge groups for
+                light sets no room or zone matches (least recently used
+                ones are replaced).
+            dedupe_writes: Drop commands (and fields) that the last known
+                light state already satisfies.
+            dedupe_max_age: Seconds a known light state is trusted for
+                dedupe_writes (keep at or below the poll interval, so
+                changes made outside LightsOut are seen in time).
         """
         self.ip_address = ip_address or os.getenv("HUE_BRIDGE_IP")
+        self.bulk_fetch = bulk_fetch
+        self.full_state_max_age = full_state_max_age
+        self._cache = TTLCache({**(cache_ttl or {}), "full_state": full_state_max_age})
         self._bridge: Optional[Bridge] = None
+        self.async_commands = async_commands
+        self.command_limits = command_limits or {}
+        self._client: Optional[AsyncHueClient] = None
+        self.coalesce_groups = coalesce_groups
+        self.managed_groups = managed_groups
+        self._managed_last_used: dict[str, float] = {}
+        self._writes: Optional[WriteFilter] = (
+            WriteFilter(dedupe_max_age) if dedupe_writes else None
+        )
         self._previous_states: dict[str, LightState] = {}
+        self._state_lock = threading.Lock()
 
     def connect(self) -> bool:
         """
@@ -53,6 +139,8 @@ class HueBridge:
             self._bridge = Bridge(self.ip_address)
             self._bridge.connect()
             logger.success(f"Connected to Hue Bridge: {self.ip_address}")
+            if self.async_commands:
+                self.start_command_client()
             return True
 
         except PhueRegistrationException:
@@ -94,6 +182,120 @@ class HueBridge:
         """Check if bridge is connected."""
         return self._bridge is not None
 
+    @property
+    def username(self) -> Optional[str]:
+        """Application key of the connection (None when not connected)."""
+        return self._bridge.username if self._bridge else None
+
+    def start_command_client(self):
+        """Start the rate-limited command client (requires a connection)."""
+        if self._client or not self._bridge:
+            return
+        self._client = AsyncHueClient(
+            self.ip_address, self._bridge.username, **self.command_limits
+        )
+        self._client.start()
+
+    def close(self):
+        """Stop background resources (the command client)."""
+        if self._client:
+            self._client.stop()
+            self._client = None
+
+    @property
+    def command_stats(self) -> Optional[dict]:
+        """Command client counters (None when commands go through phue)."""
+        return self._client.stats if self._client else None
+
+    @property
+    def write_stats(self) -> Optional[dict]:
+        """Commands saved by dedupe_writes (None when disabled)."""
+        return self._writes.stats if self._writes else None
+
+    def get_full_state(self, force: bool = False) -> dict:
+        """
+        Get the full bridge state (lights, groups, sensors, scenes, ...).
+
+        The snapshot is fetched with a single request and reused for
+        `full_state_max_age` seconds.
+
+        Args:
+            force: Refetch even if the snapshot is still fresh.
+
+        Returns:
+            Full bridge state dictionary, or empty dict on failure.
+        """
+        if not self._bridge:
+            logger.error("Not connected to bridge")
+            return {}
+
+        if force:
+            self._cache.invalidate("full_state")
+
+        try:
+            return self._cache.get("full_state", self._fetch_full_state)
+        except Exception as e:
+            logger.error(f"Failed to get full bridge state: {e}")
+            return {}
+
+    def _fetch_full_state(self) -> dict:
+        """Fetch the full bridge state in one request."""
+        started = time.monotonic()
+        state = self._bridge.get_api()
+        if not isinstance(state, dict):
+            raise ValueError(f"Unexpected response: {state}")
+        if self._writes:
+            self._writes.observe_lights(state.get("lights", {}), started)
+        return state
+
+    def invalidate_cache(self, *resources: str):
+        """
+        Drop cached bridge state so the next read refetches it.
+
+        Args:
+            resources: Resources to drop (all if none given). The full-state
+                snapshot is always dropped.
+        """
+        if resources:
+            self._cache.invalidate(*resources, "full_state")
+        else:
+            self._cache.invalidate()
+
+    @property
+    def cache_stats(self) -> dict:
+        """Get read cache hit/miss counters."""
+        return self._cache.stats
+
+    def _get_resource(self, resource: str, fetch) -> dict:
+        """
+        Read a resource through the cache.
+
+        In full-state mode the resource is taken from the full-state
+        snapshot; if that fetch fails, falls back to the per-resource request.
+        """
+        if self.full_state_max_age > 0:
+            state = self.get_full_state()
+            if state:
+                return state.get(resource) or {}
+        return self._cache.get(resource, fetch)
+
+    def _fetch_lights(self) -> dict:
+        """Fetch raw light data for all lights."""
+        started = time.monotonic()
+        if not self.bulk_fetch:
+            # One request per light (N+1 round trips)
+            lights = {
+                str(light_id): self._bridge.get_light(light_id)
+                for light_id in self._bridge.get_light_objects("id")
+            }
+        else:
+            # get_light() without an ID returns the whole /lights resource
+            lights = self._bridge.get_light() or {}
+
+        if self._writes:
+            self._writes.observe_lights(lights, started)
+        return lights
+
     def get_all_lights(self) -> dict[str, LightState]:
         """
         Get current state of all lights.
@@ -107,9 +309,8 @@ class HueBridge:
 
         lights = {}
         try:
-            api_lights = self._bridge.get_light_objects("id")
-            for light_id, light in api_lights.items():
-                light_data = self._bridge.get_light(light_id)
+            api_lights = self._get_resource("lights", self._fetch_lights)
+            for light_id, light_data in api_lights.items():
                 lights[str(light_id)] = LightState.from_hue_api(
                     str(light_id), light_data
                 )
@@ -131,7 +332,7 @@ class HueBridge:
 
         rooms = {}
         try:
-            groups = self._bridge.get_group()
+            groups = self._get_resource("groups", self._bridge.get_group)
             for group_id, group_data in groups.items():
                 if group_data.get("type") == "Room":
                     rooms[str(group_id)] = Room.from_hue_api(str(group_id), group_data)
@@ -150,21 +351,59 @@ class HueBridge:
         changes = []
         current_states = self.get_all_lights()
 
-        for light_id, new_state in current_states.items():
-            old_state = self._previous_states.get(light_id)
+        with self._state_lock:
+            for light_id, new_state in current_states.items():
+                old_state = self._previous_states.get(light_id)
 
-            if old_state is None:
-                # First time seeing this light
-                self._previous_states[light_id] = new_state
-                continue
+                if old_state is None:
+                    # First time seeing this light
+                    self._previous_states[light_id] = new_state
+                    continue
 
-            # Check for changes
-            if self._has_changed(old_state, new_state):
-                changes.append((old_state, new_state))
-                self._previous_states[light_id] = new_state
+                # Check for changes
+                if self._has_changed(old_state, new_state):
+                    changes.append((old_state, new_state))
+                    self._previous_states[light_id] = new_state
 
         return changes
 
+    def apply_update(
+        self, light_id: str, data: dict
+    ) -> Optional[tuple[LightState, LightState]]:
+        """
+        Apply a pushed light update (Hue API v2 event) to the tracked state.
+
+        Args:
+            light_id: v1 light ID
+            data: Light resource from the event stream
+
+        Returns:
+            (old_state, new_state) if the light meaningfully changed,
+            None otherwise or if the light hasn't been seen by a poll yet.
+        """
+        self.invalidate_cache("lights", "groups")
+
+        with self._state_lock:
+            old_state = self._previous_states.get(light_id)
+            if old_state is None:
+                return None
+
+            new_state = old_state.apply_v2_update(data)
+            if self._writes:
+                pushed = {}
+                if "on" in data:
+                    pushed["on"] = new_state.is_on
+                if "dimming" in data:
+                    pushed["bri"] = new_state.brightness
+                if "color_temperature" in data:
+                    pushed["ct"] = new_state.color_temp
+                self._writes.observe(light_id, pushed)
+            if not self._has_changed(old_state, new_state):
+                return None
+
+            self._previous_states[light_id] = new_state
+            return old_state, new_state
+
     def _has_changed(self, old: LightState, new: LightState) -> bool:
         """Check if light state has meaningfully changed."""
         if old.is_on != new.is_on:
@@ -217,28 +456,24 @@ class HueBridge:
             return False
 
         try:
-            command = {}
-            if on is not None:
-                command["on"] = on
-            if brightness is not None:
-                command["bri"] = max(0, min(254, brightness))
-            if hue is not None:
-                command["hue"] = max(0, min(65535, hue))
-            if saturation is not None:
-                command["sat"] = max(0, min(254, saturation))
-            if color_temp is not None:
-                command["ct"] = max(153, min(500, color_temp))
-            if transition_time is not None:
-                command["transitiontime"] = max(0, min(65535, transition_time))
-            if alert is not None and alert in ("none", "select", "lselect"):
-                command["alert"] = alert
-            if effect is not None and effect in ("none", "colorloop"):
-                command["effect"] = effect
-            if xy is not None and len(xy) == 2:
-                command["xy"] = [max(0, min(1, xy[0])), max(0, min(1, xy[1]))]
+            command = self._build_command(
+                on, brightness, hue, saturation, color_temp,
+                transition_time, alert, effect, xy,
+            )
+
+            if command and self._writes:
+                command = self._writes.trim(light_id, command)
+                if not command:
+                    logger.debug(f"Light {light_id} already in requested state")
+                    return True
 
             if command:
-                self._bridge.set_light(int(light_id), command)
+                acknowledged = self._send_light(light_id, command)
+                if acknowledged is None:
+                    return False
+                self.invalidate_cache("lights", "groups")
+                if self._writes:
+                    self._writes.record_command(light_id, acknowledged)
                 logger.debug(f"Set light {light_id}: {command}")
                 return True
 
@@ -247,6 +482,276 @@ class HueBridge:
 
         return False
 
+    def set_lights_state(self, light_ids: list[str], **kwargs) -> int:
+        """
+        Send the same state to several lights.
+
+        With the command client the requests run concurrently within the
+        bridge's rate limits; otherwise they are sent one by one.
+
+        Args:
+            light_ids: IDs of the lights to control
+            **kwargs: set_light_state() arguments
+
+        Returns:
+            Number of lights updated.
+        """
+        command = self._build_command(**kwargs)
+        if not command:
+            return 0
+        return self.set_light_states(
+            {str(light_id).strip(): command for light_id in light_ids}
+        )
+
+    def set_light_states(self, commands: dict[str, dict]) -> int:
+        """
+        Send v1 state commands to several lights.
+
+        With coalesce_groups, lights sharing an identical payload are sent
+        as one command per matching room/zone (or managed group); the rest
+        go out per light.
+
+        Args:
+            commands: light_id -> state command (v1 API field names)
+
+        Returns:
+            Number of lights updated.
+        """
+        if not self._bridge:
+            logger.error("Not connected to bridge")
+            return 0
+
+        commands = {light_id: command for light_id, command in commands.items() if command}
+        updated = 0
+
+        if self._writes:
+            trimmed = {
+                light_id: self._writes.trim(light_id, command)
+                for light_id, command in commands.items()
+            }
+            satisfied = [light_id for light_id, command in trimmed.items() if not command]
+            updated += len(satisfied)
+            if self.coalesce_groups:
+                # Keep payloads whole so identical commands can still share a group
+                commands = {k: v for k, v in commands.items() if k not in satisfied}
+            else:
+                commands = {k: v for k, v in trimmed.items() if v}
+
+        group_commands = []
+        if self.coalesce_groups and len(commands) >= MIN_GROUP_SIZE:
+            group_commands, commands = self._plan_group_commands(commands)
+
+        if self._client:
+            light_ok, group_ok = self._client.send(
+                commands, {group_id: command for group_id, command, _ in group_commands}
+            )
+            # The client treats any bridge error as a failure
+            light_results = {
+                light_id: commands[light_id] if ok else None
+                for light_id, ok in light_ok.items()
+            }
+            group_results = {
+                group_id: command if group_ok.get(group_id) else None
+                for group_id, command, _ in group_commands
+            }
+        else:
+            group_results = {
+                group_id: self._send_group(group_id, command)
+                for group_id, command, _ in group_commands
+            }
+            light_results = {
+                light_id: self._send_light(light_id, command)
+                for light_id, command in commands.items()
+            }
+
+        # light_id -> fields the bridge acknowledged
+        sent = {
+            light_id: acknowledged
+            for light_id, acknowledged in light_results.items()
+            if acknowledged is not None
+        }
+        retry = {}
+        for group_id, command, lights in group_commands:
+            acknowledged = group_results.get(group_id)
+            if acknowledged is not None:
+                sent.update({light_id: acknowledged for light_id in lights})
+                logger.debug(f"Set {len(lights)} lights via group {group_id}: {command}")
+            else:
+                retry.update({light_id: command for light_id in lights})
+        if retry:
+            # Fall back to per-light commands for failed groups
+            for light_id, command in retry.items():
+                acknowledged = self._send_light(light_id, command)
+                if acknowledged is not None:
+                    sent[light_id] = acknowledged
+
+        if self._writes:
+            for light_id, command in sent.items():
+                self._writes.record_command(light_id, command)
+        self.invalidate_cache("lights", "groups")
+        return updated + len(sent)
+
+    def _plan_group_commands(self, commands: dict[str, dict]):
+        """
+        Plan group commands for a set of light commands.
+
+        Lights sharing a payload get one command if a group (or, with
+        managed_groups, a managed group) matches them exactly. Otherwise
+        existing groups are combined with per-light commands.
+        """
+        groups = self._group_memberships()
+        group_commands = []
+        remaining = dict(commands)
+
+        by_payload: dict[str, set[str]] = {}
+        for light_id, command in commands.items():
+            by_payload.setdefault(payload_key(command), set()).add(light_id)
+
+        for lights in by_payload.values():
+            if len(lights) < MIN_GROUP_SIZE:
+                continue
+            group_id = next((g for g, members in groups.items() if members == lights), None)
+            if group_id is None and self.managed_groups:
+                group_id = self._managed_group(lights, groups)
+            if group_id is not None:
+                group_commands.append((group_id, commands[next(iter(lights))], lights))
+                for light_id in lights:
+                    del remaining[light_id]
+
+        # With the client, group commands are paced far slower than light
+        # commands; only use a group where it replaces at least as many
+        # light commands as fit in one group slot
+        min_size = MIN_GROUP_SIZE
+        if self._client:
+            limits = self.command_limits
+            min_size = max(min_size, math.ceil(
+                limits.get("lights_per_second", 10) / limits.get("groups_per_second", 1)
+            ))
+
+        combined, remaining = plan_group_commands(remaining, groups, min_size)
+        return group_commands + combined, remaining
+
+    def _group_memberships(self) -> dict[str, set[str]]:
+        """Map group IDs to their lights, including group 0 (all lights)."""
+        groups = self._get_resource("groups", self._bridge.get_group) or {}
+        memberships = {
+            str(group_id): {str(light_id) for light_id in data.get("lights", [])}
+            for group_id, data in groups.items()
+        }
+        memberships["0"] = {
+            str(light_id) for light_id in self._get_resource("lights", self._fetch_lights)
+        }
+        return memberships
+
+    def _group_lights(self, group_id: str) -> list[str]:
+        """IDs of the lights in a group (group 0 is all lights)."""
+        if group_id == "0":
+            lights = self._get_resource("lights", self._fetch_lights) or {}
+            return [str(light_id) for light_id in lights]
+        groups = self._get_resource("groups", self._bridge.get_group) or {}
+        return [str(light_id) for light_id in groups.get(group_id, {}).get("lights", [])]
+
+    def _managed_group(self, lights: set[str], memberships: dict[str, set[str]]) -> Optional[str]:
+        """Find or create a managed group containing exactly these lights."""
+        groups = self._get_resource("groups", self._bridge.get_group) or {}
+        managed = {
+            str(group_id): data for group_id, data in groups.items()
+            if data.get("name", "").startswith(MANAGED_GROUP_PREFIX)
+        }
+
+        for group_id in managed:
+            if memberships.get(group_id) == lights:
+                self._managed_last_used[group_id] = time.monotonic()
+                return group_id
+
+        try:
+            if len(managed) >= self.managed_groups:
+                oldest = min(managed, key=lambda g: self._managed_last_used.get(g, 0))
+                self._bridge.delete_group(int(oldest))
+                self._managed_last_used.pop(oldest, None)
+                logger.info(f"Deleted managed group {oldest}")
+
+            name = f"{MANAGED_GROUP_PREFIX}{len(lights)} lights {int(time.time())}"
+            result = self._bridge.create_group(name, sorted(lights, key=lambda x: (len(x), x)))
+            group_id = str(result[0]["success"]["id"])
+        except Exception as e:
+            logger.error(f"Failed to create managed group: {e}")
+            return None
+        finally:
+            self.invalidate_cache("groups")
+
+        self._managed_last_used[group_id] = time.monotonic()
+        logger.info(f"Created managed group {group_id} for lights {sorted(lights)}")
+        return group_id
+
+    def _send_light(self, light_id: str, command: dict) -> Optional[dict]:
+        """
+        Send a state command to one light.
+
+        Returns:
+            The command fields the bridge acknowledged, or None on failure.
+        """
+        try:
+            if self._client:
+                return command if self._client.set_light(light_id, command) else None
+            return acknowledged_fields(
+                self._bridge.set_light(int(light_id), command), command, f"light {light_id}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to set light {light_id}: {e}")
+            return None
+
+    def _send_group(self, group_id: str, command: dict) -> Optional[dict]:
+        """
+        Send an action command to one group.
+
+        Returns:
+            The command fields the bridge acknowledged, or None on failure.
+        """
+        try:
+            if self._client:
+                return command if self._client.set_group(group_id, command) else None
+            return acknowledged_fields(
+                self._bridge.set_group(int(group_id), command), command, f"group {group_id}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to set group {group_id}: {e}")
+            return None
+
+    @staticmethod
+    def _build_command(
+        on: Optional[bool] = None,
+        brightness: Optional[int] = None,
+        hue: Optional[int] = None,
+        saturation: Optional[int] = None,
+        color_temp: Optional[int] = None,
+        transition_time: Optional[int] = None,
+        alert: Optional[str] = None,
+        effect: Optional[str] = None,
+        xy: Optional[list[float]] = None,
+    ) -> dict:
+        """Build a v1 state command, clamping values to valid ranges."""
+        command = {}
+        if on is not None:
+            command["on"] = on
+        if brightness is not None:
+            command["bri"] = max(0, min(254, brightness))
+        if hue is not None:
+            command["hue"] = max(0, min(65535, hue))
+        if saturation is not None:
+            command["sat"] = max(0, min(254, saturation))
+        if color_temp is not None:
+            command["ct"] = max(153, min(500, color_temp))
+        if transition_time is not None:
+            command["transitiontime"] = max(0, min(65535, transition_time))
+        if alert is not None and alert in ("none", "select", "lselect"):
+            command["alert"] = alert
+        if effect is not None and effect in ("none", "colorloop"):
+            command["effect"] = effect
+        if xy is not None and len(xy) == 2:
+            command["xy"] = [max(0, min(1, xy[0])), max(0, min(1, xy[1]))]
+        return command
+
     def set_group_state(
         self,
         group_id: str,
@@ -285,30 +790,29 @@ class HueBridge:
             return False
 
         try:
-            command = {}
-            if on is not None:
-                command["on"] = on
-            if brightness is not None:
-                command["bri"] = max(0, min(254, brightness))
-            if hue is not None:
-                command["hue"] = max(0, min(65535, hue))
-            if saturation is not None:
-                command["sat"] = max(0, min(254, saturation))
-            if color_temp is not None:
-                command["ct"] = max(153, min(500, color_temp))
-            if transition_time is not None:
-                command["transitiontime"] = max(0, min(65535, transition_time))
-            if alert is not None and alert in ("none", "select", "lselect"):
-                command["alert"] = alert
-            if effect is not None and effect in ("none", "colorloop"):
-                command["effect"] = effect
-            if xy is not None and len(xy) == 2:
-                command["xy"] = [max(0, min(1, xy[0])), max(0, min(1, xy[1]))]
+            command = self._build_command(
+                on, brightness, hue, saturation, color_temp,
+                transition_time, alert, effect, xy,
+            )
             if scene is not None:
                 command["scene"] = scene
 
+            members = []
+            if command and self._writes:
+                members = self._group_lights(str(group_id))
+                command = self._writes.trim_group(members, command)
+                if not command:
+                    logger.debug(f"Group {group_id} already in requested state")
+                    return True
+
             if command:
-                self._bridge.set_group(int(group_id), command)
+                acknowledged = self._send_group(str(group_id), command)
+                if acknowledged is None:
+                    return False
+                self.invalidate_cache("lights", "groups")
+                if self._writes:
+                    for light_id in members:
+                        self._writes.record_command(light_id, acknowledged)
                 logger.debug(f"Set group {group_id}: {command}")
                 return True
 
@@ -324,7 +828,7 @@ class HueBridge:
             return {}
 
         try:
-            return self._bridge.get_scene() or {}
+            return self._get_resource("scenes", self._bridge.get_scene) or {}
         except Exception as e:
             logger.error(f"Failed to get scenes: {e}")
             return {}
@@ -336,7 +840,7 @@ class HueBridge:
             return {}
 
         try:
-            return self._bridge.get_schedule() or {}
+            return self._get_resource("schedules", self._bridge.get_schedule) or {}
         except Exception as e:
             logger.error(f"Failed to get schedules: {e}")
             return {}
@@ -348,7 +852,7 @@ class HueBridge:
             return {}
 
         try:
-            return self._bridge.get_rule() or {}
+            return self._get_resource("rules", self._bridge.get_rule) or {}
         except Exception as e:
             logger.error(f"Failed to get rules: {e}")
             return {}
@@ -360,7 +864,7 @@ class HueBridge:
             return {}
 
         try:
-            return self._bridge.get_sensor() or {}
+            return self._get_resource("sensors", self._bridge.get_sensor) or {}
         except Exception as e:
             logger.error(f"Failed to get sensors: {e}")
             return {}
@@ -404,6 +908,7 @@ class HueBridge:
                 address=f"/api/{self._bridge.username}/schedules/{schedule_id}",
                 data=data,
             )
+            self.invalidate_cache("schedules")
             logger.info(f"Updated schedule {schedule_id}: {data}")
             return True
 
@@ -430,6 +935,7 @@ class HueBridge:
                 mode="DELETE",
                 address=f"/api/{self._bridge.username}/schedules/{schedule_id}",
             )
+            self.invalidate_cache("schedules")
             logger.info(f"Deleted schedule {schedule_id}")
             return True
 
@@ -480,6 +986,7 @@ class HueBridge:
                 address=f"/api/{self._bridge.username}/schedules",
                 data=data,
             )
+            self.invalidate_cache("schedules")
             # Result format: [{"success": {"id": "1"}}]
             if result and isinstance(result, list) and "success" in result[0]:
                 schedule_id = result[0]["success"].get("id")
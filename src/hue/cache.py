@@ -0,0 +1,109 @@
+"""Read-through TTL cache for bridge resources."""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class _InFlight:
+    """A fetch in progress that concurrent callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Thread-safe read-through cache with per-key TTL and single-flight fetches.
+
+    Concurrent callers asking for the same key while a fetch is running
+    wait for that fetch instead of issuing their own request.
+    """
+
+    def __init__(self, ttls: Optional[dict[str, float]] = None, default_ttl: float = 0):
+        """
+        Initialize cache.
+
+        Args:
+            ttls: Seconds to keep each key (e.g. {"lights": 1, "scenes": 30})
+            default_ttl: TTL for keys not listed in ttls (0 = no caching)
+        """
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._values: dict[str, tuple[float, Any]] = {}
+        self._in_flight: dict[str, _InFlight] = {}
+        self._generation: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Get a value, calling fetch() on a miss.
+
+        Exceptions raised by fetch() propagate to every waiting caller
+        and nothing is cached.
+        """
+        ttl = self.ttls.get(key, self.default_ttl)
+
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                self.hits += 1
+                return cached[1]
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                self.misses += 1
+                owner = True
+            generation = self._generation.get(key, 0)
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                # Don't store a result that was invalidated mid-fetch
+                if (
+                    flight.error is None
+                    and ttl > 0
+                    and self._generation.get(key, 0) == generation
+                ):
+                    self._values[key] = (time.monotonic(), flight.result)
+            flight.done.set()
+
+        return flight.result
+
+    def invalidate(self, *keys: str):
+        """Drop cached values for keys (all keys if none given)."""
+        with self._lock:
+            targets = keys or tuple(set(self._values) | set(self._in_flight))
+            for key in targets:
+                self._values.pop(key, None)
+                self._generation[key] = self._generation.get(key, 0) + 1
+
+    @property
+    def stats(self) -> dict:
+        """Get hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
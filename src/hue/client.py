@@ -0,0 +1,250 @@
+"""Rate-limited asyncio client for Hue Bridge commands."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+# Bridge errors that mean "too busy, try again later"
+RETRYABLE_STATUS = (429, 503)
+RETRYABLE_ERROR_TYPES = (901,)  # Internal error (command queue full)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter for use on a single event loop.
+
+    Allows bursts of up to `burst` commands, refilling at `rate` per second.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity. The bridge counts commands over a sliding
+                second, so anything above 1 risks rejections after idle periods.
+        """
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.waited = 0.0  # Total seconds spent waiting for tokens
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            delay = (1 - self._tokens) / self.rate
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+
+class AsyncHueClient:
+    """
+    Sends light and group commands to the bridge from an asyncio loop.
+
+    Commands share one keep-alive HTTP session, pass through per-kind token
+    buckets matching the bridge's limits (about 10 light commands and 1
+    group command per second) and are capped at `max_concurrency` requests
+    in flight. The loop runs on a background thread; the public methods are
+    blocking so they can be called from Flask and scheduler threads.
+    """
+
+    def __init__(
+        self,
+        ip_address: str,
+        username: str,
+        lights_per_second: float = 10,
+        groups_per_second: float = 1,
+        burst: float = 1,
+        max_concurrency: int = 4,
+        timeout: float = 5,
+        retries: int = 2,
+    ):
+        """
+        Initialize client.
+
+        Args:
+            ip_address: Bridge IP (or host:port)
+            username: Bridge API username
+            lights_per_second: Light command rate limit
+            groups_per_second: Group command rate limit
+            burst: Commands that may be sent back to back after idling
+            max_concurrency: Maximum requests in flight
+            timeout: Per-request timeout in seconds
+            retries: Retries for commands the bridge rejects as busy
+        """
+        self.base_url = f"http://{ip_address}/api/{username}"
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+
+        self._light_bucket = TokenBucket(lights_per_second, burst)
+        self._group_bucket = TokenBucket(groups_per_second, burst)
+
+        self._session = requests.Session()
+        self._session.mount(
+            "http://", HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        )
+        self._executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="hue-command")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._sent = 0
+        self._failed = 0
+        self._retried = 0
+
+    def start(self):
+        """Start the event loop thread."""
+        if self._loop:
+            return
+
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, daemon=True, name="hue-client"
+        )
+        self._thread.start()
+        logger.info(f"Hue command client started ({self.max_concurrency} concurrent)")
+
+    def stop(self):
+        """Stop the event loop and close the HTTP session."""
+        if not self._loop:
+            return
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+    def set_light(self, light_id: str, command: dict) -> bool:
+        """Send a state command to one light. Returns True on success."""
+        return self._run(self._put(f"/lights/{light_id}/state", command, self._light_bucket))
+
+    def set_group(self, group_id: str, command: dict) -> bool:
+        """Send an action command to one group. Returns True on success."""
+        return self._run(self._put(f"/groups/{group_id}/action", command, self._group_bucket))
+
+    def set_lights(self, commands: dict[str, dict]) -> dict[str, bool]:
+        """
+        Send state commands to many lights concurrently.
+
+        Args:
+            commands: light_id -> command
+
+        Returns:
+            light_id -> success
+        """
+        return self.send(commands, {})[0]
+
+    def send(
+        self,
+        light_commands: dict[str, dict],
+        group_commands: dict[str, dict],
+    ) -> tuple[dict[str, bool], dict[str, bool]]:
+        """
+        Send light and group commands concurrently.
+
+        Light and group commands draw from separate rate limits, so the
+        two kinds proceed in parallel.
+
+        Args:
+            light_commands: light_id -> command
+            group_commands: group_id -> command
+
+        Returns:
+            (light_id -> success, group_id -> success)
+        """
+        async def fan_out():
+            results = await asyncio.gather(
+                *(
+                    self._put(f"/lights/{light_id}/state", command, self._light_bucket)
+                    for light_id, command in light_commands.items()
+                ),
+                *(
+                    self._put(f"/groups/{group_id}/action", command, self._group_bucket)
+                    for group_id, command in group_commands.items()
+                ),
+            )
+            return (
+                dict(zip(light_commands, results[:len(light_commands)])),
+                dict(zip(group_commands, results[len(light_commands):])),
+            )
+
+        return self._run(fan_out())
+
+    def _run(self, coro):
+        """Run a coroutine on the client loop and wait for its result."""
+        if not self._loop:
+            coro.close()
+            raise RuntimeError("AsyncHueClient is not started")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _put(self, path: str, command: dict, bucket: TokenBucket) -> bool:
+        """PUT a command, waiting for rate limit tokens and retrying if busy."""
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            async with self._semaphore:
+                try:
+                    status, body = await self._loop.run_in_executor(
+                        self._executor, self._send, path, command
+                    )
+                except requests.RequestException as e:
+                    logger.error(f"Bridge request {path} failed: {e}")
+                    self._failed += 1
+                    return False
+
+            errors = []
+            if isinstance(body, list):
+                errors = [item["error"] for item in body if "error" in item]
+            busy = status in RETRYABLE_STATUS or any(
+                e.get("type") in RETRYABLE_ERROR_TYPES for e in errors
+            )
+            if busy and attempt < self.retries:
+                self._retried += 1
+                await asyncio.sleep(0.2 * 2 ** attempt)
+                continue
+
+            self._sent += 1
+            if status >= 400 or errors:
+                logger.error(f"Bridge rejected {path}: {errors or status}")
+                self._failed += 1
+                return False
+            return True
+
+        return False
+
+    def _send(self, path: str, command: dict) -> tuple[int, object]:
+        """Blocking PUT on the shared session (runs on the executor)."""
+        response = self._session.put(self.base_url + path, json=command, timeout=self.timeout)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    @property
+    def stats(self) -> dict:
+        """Get command counters."""
+        return {
+            "sent": self._sent,
+            "failed": self._failed,
+            "retried": self._retried,
+            "rate_limit_wait_seconds": round(
+                self._light_bucket.waited + self._group_bucket.waited, 2
+            ),
+        }
@@ -0,0 +1,203 @@
+"""Hue API v2 server-sent event stream ingestion."""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+import requests
+from loguru import logger
+
+from .bridge import HueBridge
+from .models import LightState
+
+ChangeCallback = Callable[[LightState, LightState, datetime], None]
+
+
+def parse_creationtime(value: Optional[str]) -> Optional[datetime]:
+    """Convert a v2 ISO-8601 UTC timestamp to naive local time."""
+    if not value:
+        return None
+    try:
+        return (
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+            .astimezone()
+            .replace(tzinfo=None)
+        )
+    except ValueError:
+        return None
+
+
+class HueEventStream:
+    """
+    Subscribes to the bridge's event stream and reports light changes.
+
+    Changes are reported as soon as the bridge pushes them, instead of
+    waiting for the next poll.
+    """
+
+    def __init__(
+        self,
+        bridge: HueBridge,
+        on_change: ChangeCallback,
+        url: Optional[str] = None,
+        verify_ssl: bool = False,
+        reconnect_delay: float = 5,
+        idle_timeout: float = 600,
+    ):
+        """
+        Initialize event stream.
+
+        Args:
+            bridge: Connected HueBridge (supplies address, key and light state)
+            on_change: Called with (old_state, new_state, timestamp) per change
+            url: Event stream URL (default https://<bridge>/eventstream/clip/v2)
+            verify_ssl: Verify the bridge certificate (self-signed by default)
+            reconnect_delay: Seconds to wait before reconnecting after a failure
+            idle_timeout: Reconnect if nothing is received for this many seconds
+        """
+        self.bridge = bridge
+        self.on_change = on_change
+        self.url = url
+        self.verify_ssl = verify_ssl
+        self.reconnect_delay = reconnect_delay
+        self.idle_timeout = idle_timeout
+
+        self._running = False
+        self._connected = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.messages_received = 0
+        self.changes_reported = 0
+        self._latency_total_ms = 0.0
+        self._latency_count = 0
+        self.last_latency_ms: Optional[float] = None
+
+    @property
+    def is_connected(self) -> bool:
+        """Check if the stream is currently connected."""
+        return self._connected
+
+    def start(self):
+        """Start consuming the stream in a background thread."""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="hue-eventstream"
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop consuming the stream (the thread exits on its next read)."""
+        self._running = False
+
+    def _stream_url(self) -> str:
+        return self.url or f"https://{self.bridge.ip_address}/eventstream/clip/v2"
+
+    def _run(self):
+        """Connect and consume, reconnecting on failure."""
+        if not self.verify_ssl:
+            import urllib3
+
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        while self._running:
+            try:
+                headers = {"Accept": "text/event-stream"}
+                if self.bridge.username:
+                    headers["hue-application-key"] = self.bridge.username
+
+                with requests.get(
+                    self._stream_url(),
+                    headers=headers,
+                    stream=True,
+                    verify=self.verify_ssl,
+                    timeout=(10, self.idle_timeout),
+                ) as response:
+                    response.raise_for_status()
+                    self._connected = True
+                    logger.info("Connected to Hue event stream")
+                    self._consume(response)
+
+            except Exception as e:
+                if self._running:
+                    logger.warning(f"Hue event stream disconnected: {e}")
+            finally:
+                self._connected = False
+
+            if self._running:
+                time.sleep(self.reconnect_delay)
+
+    def _consume(self, response: requests.Response):
+        """Parse server-sent events from a streaming response."""
+        data_lines: list[str] = []
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if not self._running:
+                break
+            if line is None:
+                continue
+            if line == "":
+                if data_lines:
+                    self._handle_message("\n".join(data_lines))
+                    data_lines = []
+            elif line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            # "id:", "event:" and ": comment" lines are ignored
+
+    def _handle_message(self, data: str):
+        """Handle one SSE message (a JSON list of v2 events)."""
+        received = datetime.now()
+        try:
+            events = json.loads(data)
+        except json.JSONDecodeError:
+            logger.debug(f"Ignoring malformed event: {data[:100]}")
+            return
+        if not isinstance(events, list):
+            logger.debug(f"Ignoring unexpected event payload: {data[:100]}")
+            return
+
+        self.messages_received += 1
+
+        for event in events:
+            if not isinstance(event, dict) or event.get("type") != "update":
+                continue
+
+            timestamp = parse_creationtime(event.get("creationtime")) or received
+            self._record_latency(received, timestamp)
+
+            for item in event.get("data", []):
+                if not isinstance(item, dict) or item.get("type") != "light":
+                    continue
+                light_id = item.get("id_v1", "").rsplit("/", 1)[-1]
+                if not light_id:
+                    continue
+
+                change = self.bridge.apply_update(light_id, item)
+                if change:
+                    self.changes_reported += 1
+                    try:
+                        self.on_change(change[0], change[1], timestamp)
+                    except Exception as e:
+                        logger.error(f"Error handling event for light {light_id}: {e}")
+
+    def _record_latency(self, received: datetime, created: datetime):
+        latency_ms = max(0.0, (received - created).total_seconds() * 1000)
+        self.last_latency_ms = round(latency_ms, 1)
+        self._latency_total_ms += latency_ms
+        self._latency_count += 1
+
+    @property
+    def stats(self) -> dict:
+        """Get stream statistics including bridge-to-service event latency."""
+        mean = (
+            round(self._latency_total_ms / self._latency_count, 1)
+            if self._latency_count
+            else None
+        )
+        return {
+            "connected": self._connected,
+            "messages_received": self.messages_received,
+            "changes_reported": self.changes_reported,
+            "mean_latency_ms": mean,
+            "last_latency_ms": self.last_latency_ms,
+        }
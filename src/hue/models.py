@@ -1,6 +1,6 @@
 """Data models for Hue light states and events."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from typing import Optional
 
@@ -51,6 +51,26 @@ class LightState:
             reachable=state.get("reachable", True),
         )
 
+    def apply_v2_update(self, data: dict) -> "LightState":
+        """
+        Return a copy with a Hue API v2 light update applied.
+
+        Args:
+            data: Light resource from an event stream "update" message.
+        """
+        changes = {}
+        if "on" in data:
+            changes["is_on"] = data["on"].get("on", self.is_on)
+        if "dimming" in data and "brightness" in data["dimming"]:
+            # v2 reports brightness in percent, v1 uses 1-254
+            changes["brightness"] = max(1, round(data["dimming"]["brightness"] * 254 / 100))
+        mirek = data.get("color_temperature", {}).get("mirek")
+        if mirek is not None:
+            changes["color_temp"] = mirek
+        if "metadata" in data and "name" in data["metadata"]:
+            changes["name"] = data["metadata"]["name"]
+        return replace(self, **changes)
+
 
 @dataclass
 class LightEvent:
@@ -0,0 +1,74 @@
+"""Plan multi-light commands as group commands where possible."""
+
+import json
+from typing import Optional
+
+# Smallest number of lights worth replacing with one group command
+MIN_GROUP_SIZE = 3
+
+
+def payload_key(command: dict) -> str:
+    """Canonical form of a command, equal for identical payloads."""
+    return json.dumps(command, sort_keys=True)
+
+
+def plan_group_commands(
+    commands: dict[str, dict],
+    groups: dict[str, set[str]],
+    min_group_size: int = MIN_GROUP_SIZE,
+) -> tuple[list[tuple[str, dict, set[str]]], dict[str, dict]]:
+    """
+    Cover lights that share a payload with existing groups.
+
+    A group is only used if every light in it gets the same payload, so
+    no other light is touched. Groups are picked greedily by how many
+    still uncovered lights they add; overlapping groups are fine since the
+    overlap receives the same command twice.
+
+    Args:
+        commands: light_id -> command
+        groups: group_id -> light IDs in the group
+        min_group_size: Minimum uncovered lights a group must add
+
+    Returns:
+        (group commands as (group_id, command, light_ids covered),
+         remaining light_id -> command to send per light)
+    """
+    by_payload: dict[str, set[str]] = {}
+    for light_id, command in commands.items():
+        by_payload.setdefault(payload_key(command), set()).add(light_id)
+
+    group_commands = []
+    remaining = {}
+    for key, targets in by_payload.items():
+        command = commands[next(iter(targets))]
+        candidates = {
+            group_id: lights for group_id, lights in groups.items()
+            if lights and lights <= targets
+        }
+        uncovered = set(targets)
+
+        while uncovered:
+            group_id, lights = _best_group(candidates, uncovered)
+            if group_id is None or len(lights & uncovered) < min_group_size:
+                break
+            group_commands.append((group_id, command, lights & uncovered))
+            uncovered -= lights
+            del candidates[group_id]
+
+        remaining.update({light_id: command for light_id in uncovered})
+
+    return group_commands, remaining
+
+
+def _best_group(
+    candidates: dict[str, set[str]],
+    uncovered: set[str],
+) -> tuple[Optional[str], set[str]]:
+    """Candidate covering the most uncovered lights (ties: smallest group)."""
+    best_id, best_lights, best_score = None, set(), (0, 0)
+    for group_id, lights in candidates.items():
+        score = (len(lights & uncovered), -len(lights))
+        if score > best_score:
+            best_id, best_lights, best_score = group_id, lights, score
+    return best_id, best_lights
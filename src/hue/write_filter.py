@@ -0,0 +1,178 @@
+"""Skip bridge commands that would not change a light's state."""
+
+import json
+import threading
+import time
+from typing import Optional
+
+# Fields that only make sense together with a state change
+_MODIFIERS = ("transitiontime",)
+
+# Color fields and the colormode they put the light in
+_COLOR_MODES = {"ct": "ct", "hue": "hs", "sat": "hs", "xy": "xy"}
+
+
+class WriteFilter:
+    """
+    Tracks the last known state of each light and trims commands against it.
+
+    States come from bridge reads (polls, full-state snapshots), pushed
+    updates and commands the bridge accepted. Only states observed within
+    `max_age` seconds are trusted; older ones let commands through as-is.
+    """
+
+    def __init__(self, max_age: float = 10):
+        """
+        Initialize filter.
+
+        Args:
+            max_age: Seconds a known light state is trusted for trimming
+        """
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._states: dict[str, tuple[float, dict]] = {}  # light_id -> (seen, v1 state)
+        self.commands_checked = 0
+        self.commands_skipped = 0
+        self.fields_trimmed = 0
+        self.bytes_saved = 0
+
+    def observe_lights(self, lights: dict, observed_at: Optional[float] = None):
+        """
+        Record light states read from the bridge.
+
+        Args:
+            lights: v1 lights resource (light_id -> light data)
+            observed_at: time.monotonic() when the read started; states
+                recorded after that (e.g. by a command) are kept.
+        """
+        observed_at = observed_at if observed_at is not None else time.monotonic()
+        with self._lock:
+            for light_id, data in lights.items():
+                current = self._states.get(str(light_id))
+                if current is None or current[0] <= observed_at:
+                    self._states[str(light_id)] = (observed_at, dict(data.get("state", {})))
+
+    def observe(self, light_id: str, fields: dict):
+        """Merge v1 state fields known to be current into a light's state."""
+        if not fields:
+            return
+        now = time.monotonic()
+        with self._lock:
+            _, state = self._states.get(light_id, (now, {}))
+            state = {**state, **fields}
+            for field in fields:
+                if field in _COLOR_MODES:
+                    state["colormode"] = _COLOR_MODES[field]
+            self._states[light_id] = (now, state)
+
+    def record_command(self, light_id: str, command: dict):
+        """Record the fields of a command the bridge acknowledged."""
+        self.observe(light_id, {
+            k: v for k, v in command.items()
+            if k not in _MODIFIERS and k not in ("alert", "scene")
+        })
+
+    def trim(self, light_id: str, command: dict) -> dict:
+        """
+        Remove fields a light already satisfies.
+
+        Args:
+            light_id: Target light
+            command: v1 state command
+
+        Returns:
+            The command to send (empty if nothing would change).
+        """
+        return self.trim_group([light_id], command)
+
+    def trim_group(self, light_ids: list[str], command: dict) -> dict:
+        """
+        Remove fields every light in a group already satisfies.
+
+        Args:
+            light_ids: Lights the command applies to
+            command: v1 state/action command
+
+        Returns:
+            The command to send (empty if nothing would change).
+        """
+        self.commands_checked += 1
+        if "scene" in command:
+            # A scene sets each light to its stored state; we can't tell
+            # whether it would change anything
+            return command
+
+        now = time.monotonic()
+        with self._lock:
+            states = [self._states.get(light_id) for light_id in light_ids]
+
+        if not light_ids or any(
+            entry is None
+            or now - entry[0] > self.max_age
+            or not entry[1].get("reachable", True)
+            for entry in states
+        ):
+            return command
+
+        needed = set()
+        for _, state in states:
+            needed |= _needed_fields(state, command)
+
+        if needed:
+            needed.update(_MODIFIERS)
+        trimmed = {k: v for k, v in command.items() if k in needed}
+
+        if trimmed != command:
+            self.fields_trimmed += len(command) - len(trimmed)
+            sent = len(json.dumps(trimmed)) if trimmed else 0
+            self.bytes_saved += len(json.dumps(command)) - sent
+            if not trimmed:
+                self.commands_skipped += 1
+        return trimmed
+
+    @property
+    def stats(self) -> dict:
+        """Get counters of saved commands."""
+        return {
+            "commands_checked": self.commands_checked,
+            "commands_skipped": self.commands_skipped,
+            "fields_trimmed": self.fields_trimmed,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+def _needed_fields(state: dict, command: dict) -> set[str]:
+    """Fields of a command that would change a light in the given state."""
+    is_on = state.get("on", False)
+    target_on = command.get("on", is_on)
+
+    # Alerts and scenes are actions, not state
+    needed = {k for k in ("alert", "scene") if k in command}
+
+    if not target_on:
+        # Turning off (or already off): only "on" matters
+        if is_on:
+            needed.add("on")
+        return needed
+
+    if not is_on:
+        needed.add("on")
+    if "bri" in command and command["bri"] != state.get("bri"):
+        needed.add("bri")
+
+    colormode = state.get("colormode")
+    if "ct" in command and (colormode != "ct" or command["ct"] != state.get("ct")):
+        needed.add("ct")
+    for field in ("hue", "sat"):
+        if field in command and (colormode != "hs" or command[field] != state.get(field)):
+            needed.add(field)
+    if "xy" in command:
+        current = state.get("xy") or []
+        same = len(current) == 2 and all(
+            abs(a - b) < 1e-4 for a, b in zip(command["xy"], current)
+        )
+        if colormode != "xy" or not same:
+            needed.add("xy")
+    if "effect" in command and command["effect"] != state.get("effect"):
+        needed.add("effect")
+    return needed
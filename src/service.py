@@ -2,21 +2,30 @@
 
 import signal
 import sys
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import yaml
+from apscheduler.events import EVENT_JOB_MISSED
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
 from loguru import logger
 
 from src.hue.bridge import HueBridge
+from src.hue.eventstream import HueEventStream
 from src.storage.database import Database
 from src.storage.event_logger import EventLogger
+from src.storage.write_buffer import EventWriteBuffer
+from src.analyzer.incremental import IncrementalPatternDetector
 from src.analyzer.pattern_detector import PatternDetector
 from src.analyzer.predictor import LightingPredictor
+from src.api.broadcast import EventBroadcaster
 from src.api.server import APIServer
+from src.automation.adaptive import AdaptiveLightingController
 
 
 class HueAnalyzerService:
@@ -33,24 +42,96 @@ class HueAnalyzerService:
         self._setup_logging()
 
         # Initialize components
-        self.bridge = HueBridge(self.config["hue"].get("bridge_ip"))
-        self.database = Database(self.config["storage"]["database_path"])
-        self.event_logger = EventLogger(self.database)
-        self.pattern_detector = PatternDetector(
-            self.database,
-            min_occurrences=self.config["analyzer"]["min_pattern_occurrences"],
-            time_window_minutes=self.config["analyzer"]["time_window_minutes"],
-            confidence_threshold=self.config["analyzer"]["confidence_threshold"],
+        self.bridge = HueBridge(
+            self.config["hue"].get("bridge_ip"),
+            bulk_fetch=self.config["hue"].get("bulk_fetch", True),
+            full_state_max_age=self.config["hue"].get("full_state_max_age", 0),
+            cache_ttl=self.config["hue"].get("cache_ttl"),
+            async_commands=self.config["hue"].get("async_commands", False),
+            command_limits=self.config["hue"].get("command_limits"),
+            coalesce_groups=self.config["hue"].get("coalesce_groups", False),
+            managed_groups=self.config["hue"].get("managed_groups", 0),
+            dedupe_writes=self.config["hue"].get("dedupe_writes", False),
+            # A state older than one poll may miss changes made elsewhere
+            dedupe_max_age=min(
+                self.config["hue"].get("dedupe_max_age", 10),
+                self.config["hue"]["poll_interval"],
+            ),
+        )
+        self.database = Database(
+            self.config["storage"]["database_path"],
+            **self.config["storage"].get("sqlite", {}),
         )
+        storage_config = self.config["storage"]
+        self.write_buffer: Optional[EventWriteBuffer] = None
+        if storage_config.get("write_flush_interval", 0) > 0:
+            self.write_buffer = EventWriteBuffer(
+                self.database,
+                max_batch=storage_config.get("write_batch_size", 100),
+                flush_interval=storage_config["write_flush_interval"],
+                max_queue=storage_config.get("write_queue_limit", 10000),
+            )
+        self.event_logger = EventLogger(self.database, self.write_buffer)
+        analyzer_config = self.config["analyzer"]
+        if analyzer_config.get("incremental", False):
+            self.pattern_detector = IncrementalPatternDetector(
+                self.database,
+                window_days=analyzer_config["analysis_window_days"],
+                min_occurrences=analyzer_config["min_pattern_occurrences"],
+                time_window_minutes=analyzer_config["time_window_minutes"],
+                confidence_threshold=analyzer_config["confidence_threshold"],
+            )
+            self.event_logger.add_listener(self.pattern_detector.add_event)
+        else:
+            self.pattern_detector = PatternDetector(
+                self.database,
+                min_occurrences=analyzer_config["min_pattern_occurrences"],
+                time_window_minutes=analyzer_config["time_window_minutes"],
+                confidence_threshold=analyzer_config["confidence_threshold"],
+            )
         self.predictor = LightingPredictor(
             self.database,
             min_confidence=self.config["automation"]["min_confidence"],
         )
 
+        # Adaptive lighting controller (started after bridge connects)
+        adaptive_config = self.config.get("adaptive", {})
+        self.adaptive_controller = AdaptiveLightingController(
+            self.database,
+            self.bridge,
+            interval=adaptive_config.get("interval_seconds", 3),
+            kp=adaptive_config.get("kp", 0.8),
+            ki=adaptive_config.get("ki", 0.15),
+        )
+
+        # Live updates for dashboards (/api/stream)
+        self.broadcaster = EventBroadcaster(
+            max_clients=self.config.get("api", {}).get("stream_clients", 16),
+        )
+        self.event_logger.add_listener(self.broadcaster.publish_event)
+        self.adaptive_controller.add_listener(self.broadcaster.publish_adaptive)
+
         # API server (initialized after bridge connects)
         self.api_server: Optional[APIServer] = None
 
+        # Event stream ingestion (only in "eventstream" mode)
+        self.event_stream: Optional[HueEventStream] = None
+        self._last_full_poll = 0.0
+
         self.scheduler = BackgroundScheduler()
+        # Delayed sequence responses run on their own pool so they never
+        # hold up polling
+        self.scheduler.add_executor(
+            ThreadPoolExecutor(self.config["automation"].get("sequence_workers", 4)),
+            "automation",
+        )
+        # trigger light_id -> {job_id: trigger event_type} for pending responses
+        self._pending_sequences: dict[str, dict[str, str]] = {}
+        self._pending_lock = threading.Lock()
+        # Responses that miss their grace time never run, so forget them here
+        self.scheduler.add_listener(
+            lambda event: self._forget_sequence(event.job_id), EVENT_JOB_MISSED
+        )
         self._running = False
 
     def _load_config(self, config_path: str) -> dict:
@@ -125,13 +206,43 @@ class HueAnalyzerService:
             id="poll_lights",
         )
 
-        # Run analysis daily at 3 AM
-        self.scheduler.add_job(
-            self._run_analysis,
-            "cron",
-            hour=3,
-            id="daily_analysis",
-        )
+        if isinstance(self.pattern_detector, IncrementalPatternDetector):
+            # Counters are kept up to date per event; materialize regularly
+            self.pattern_detector.seed()
+            self.scheduler.add_job(
+                self._run_analysis,
+                "interval",
+                minutes=self.config["analyzer"].get("incremental_interval_minutes", 60),
+                id="incremental_analysis",
+            )
+        else:
+            # Run analysis daily at 3 AM
+            self.scheduler.add_job(
+                self._run_analysis,
+                "cron",
+                hour=3,
+                id="daily_analysis",
+            )
+
+        # Periodic state snapshots for correlation analysis
+        snapshot_interval = self.config["storage"].get("snapshot_interval", 0)
+        if snapshot_interval > 0:
+            self.scheduler.add_job(
+                self._snapshot_lights,
+                "interval",
+                seconds=snapshot_interval,
+                id="snapshot_lights",
+            )
+
+        # Correct any drift in the materialized statistics counters
+        reconcile_hours = self.config["storage"].get("stats_reconcile_hours", 24)
+        if reconcile_hours > 0:
+            self.scheduler.add_job(
+                self._reconcile_statistics,
+                "interval",
+                hours=reconcile_hours,
+                id="reconcile_statistics",
+            )
 
         # Cleanup old data weekly
         self.scheduler.add_job(
@@ -145,6 +256,23 @@ class HueAnalyzerService:
         self.scheduler.start()
         self._running = True
 
+        if self.write_buffer:
+            self.write_buffer.start()
+
+        ingestion = self.config["hue"].get("ingestion", "poll")
+        if ingestion == "eventstream":
+            # Seed known states so pushed updates have a baseline
+            self.bridge.detect_changes()
+            self._last_full_poll = time.monotonic()
+            self.event_stream = HueEventStream(
+                self.bridge,
+                on_change=self._handle_state_change,
+                url=self.config["hue"].get("eventstream_url") or None,
+            )
+            self.event_stream.start()
+
+        self.adaptive_controller.start()
+
         # Start API server if enabled
         api_config = self.config.get("api", {})
         if api_config.get("enabled", True):
@@ -154,10 +282,19 @@ class HueAnalyzerService:
                 pattern_detector=self.pattern_detector,
                 host=api_config.get("host", "0.0.0.0"),
                 port=api_config.get("port", 5000),
+                adaptive_controller=self.adaptive_controller,
+                broadcaster=self.broadcaster,
+                server=api_config.get("server", "waitress"),
+                threads=api_config.get("threads", 8),
+                connection_limit=api_config.get("connection_limit", 100),
+                timeout=api_config.get("timeout", 30),
             )
             self.api_server.start()
 
-        logger.info(f"✅ Service started. Polling every {poll_interval}s")
+        if self.event_stream:
+            logger.info("✅ Service started. Listening to Hue event stream")
+        else:
+            logger.info(f"✅ Service started. Polling every {poll_interval}s")
         self._print_status()
 
         # Keep main thread alive
@@ -166,22 +303,45 @@ class HueAnalyzerService:
 
     def _poll_lights(self):
         """Poll lights for changes."""
+        if self.event_stream and self.event_stream.is_connected:
+            # Stream is live: only poll occasionally to resync missed changes
+            resync = self.config["hue"].get("resync_interval", 300)
+            if time.monotonic() - self._last_full_poll < resync:
+                return
+
         try:
+            self._last_full_poll = time.monotonic()
             changes = self.bridge.detect_changes()
 
             for old_state, new_state in changes:
-                events = self.event_logger.log_state_change(old_state, new_state)
-
-                # Check for sequence triggers (if automation enabled)
-                if self.config["automation"]["enabled"]:
-                    for event in events:
-                        self._handle_automation(event)
+                self._handle_state_change(old_state, new_state)
 
         except Exception as e:
             logger.error(f"Error polling lights: {e}")
 
+    def _handle_state_change(self, old_state, new_state, timestamp=None):
+        """Log a detected state change and run automations."""
+        events = self.event_logger.log_state_change(old_state, new_state, timestamp)
+        self.broadcaster.publish_light(new_state)
+
+        # Check for sequence triggers (if automation enabled)
+        if self.config["automation"]["enabled"]:
+            for event in events:
+                self._handle_automation(event)
+
+    def _snapshot_lights(self):
+        """Save a snapshot of all light states."""
+        try:
+            self.event_logger.log_snapshot(self.bridge.get_all_lights())
+        except Exception as e:
+            logger.error(f"Error saving snapshot: {e}")
+
     def _handle_automation(self, event):
         """Handle automation based on event."""
+        # The trigger light changing back cancels its pending responses
+        if event.event_type in ("on", "off"):
+            self._cancel_sequences(event.light_id, event.event_type)
+
         actions = self.predictor.should_trigger_sequence(
             event.light_id, event.event_type
         )
@@ -190,13 +350,66 @@ class HueAnalyzerService:
             if self.config["automation"]["dry_run"]:
                 logger.info(f"[DRY RUN] Would trigger: {action}")
             else:
-                # Actually trigger the action
-                time.sleep(action.get("delay_seconds", 0))
-                if action["action"] == "on":
-                    self.bridge.set_light_state(action["light_id"], on=True)
-                elif action["action"] == "off":
-                    self.bridge.set_light_state(action["light_id"], on=False)
-                logger.info(f"Triggered automation: {action}")
+                self._schedule_sequence(event.light_id, event.event_type, action)
+
+    def _schedule_sequence(self, trigger_light_id: str, trigger_event: str, action: dict):
+        """Schedule a sequence response as a one-shot job after its delay."""
+        job_id = f"sequence_{action['pattern_id']}"
+        # The new job replaces any pending one with the same id
+        self._forget_sequence(job_id)
+        with self._pending_lock:
+            self._pending_sequences.setdefault(trigger_light_id, {})[job_id] = trigger_event
+
+        # Re-triggering an already pending response restarts its delay
+        self.scheduler.add_job(
+            self._run_sequence_action,
+            "date",
+            run_date=datetime.now() + timedelta(seconds=action.get("delay_seconds", 0)),
+            args=[job_id, action],
+            id=job_id,
+            executor="automation",
+            replace_existing=True,
+            misfire_grace_time=30,
+        )
+
+    def _forget_sequence(self, job_id: str):
+        """Drop a sequence response from the pending bookkeeping."""
+        if not job_id.startswith("sequence_"):
+            return
+        with self._pending_lock:
+            for light_id, pending in list(self._pending_sequences.items()):
+                pending.pop(job_id, None)
+                if not pending:
+                    del self._pending_sequences[light_id]
+
+    def _cancel_sequences(self, trigger_light_id: str, event_type: str):
+        """Cancel pending responses to the opposite on/off event of a light."""
+        opposite = "off" if event_type == "on" else "on"
+        with self._pending_lock:
+            pending = self._pending_sequences.get(trigger_light_id, {})
+            cancelled = [
+                job_id for job_id, trigger_event in pending.items()
+                if trigger_event == opposite
+            ]
+            for job_id in cancelled:
+                del pending[job_id]
+
+        for job_id in cancelled:
+            try:
+                self.scheduler.remove_job(job_id)
+                logger.info(f"Cancelled automation {job_id}: light {trigger_light_id} turned {event_type}")
+            except JobLookupError:
+                pass  # Already running
+
+    def _run_sequence_action(self, job_id: str, action: dict):
+        """Execute a scheduled sequence response."""
+        self._forget_sequence(job_id)
+
+        if action["action"] == "on":
+            self.bridge.set_light_state(action["light_id"], on=True)
+        elif action["action"] == "off":
+            self.bridge.set_light_state(action["light_id"], on=False)
+        logger.info(f"Triggered automation: {action}")
 
     def _run_analysis(self):
         """Run pattern analysis."""
@@ -205,9 +418,7 @@ class HueAnalyzerService:
             days = self.config["analyzer"]["analysis_window_days"]
             patterns = self.pattern_detector.analyze(days_back=days)
 
-            # Save new patterns
-            for pattern in patterns:
-                self.database.save_pattern(pattern)
+            self.database.save_patterns(patterns)
 
             summary = self.pattern_detector.get_pattern_summary(patterns)
             logger.info(f"\n{summary}")
@@ -221,6 +432,13 @@ class HueAnalyzerService:
         logger.info(f"🧹 Cleaning up data older than {retention} days...")
         self.database.cleanup_old_events(retention)
 
+    def _reconcile_statistics(self):
+        """Recount statistics counters."""
+        try:
+            self.database.reconcile_statistics()
+        except Exception as e:
+            logger.error(f"Error reconciling statistics: {e}")
+
     def _print_status(self):
         """Print current status."""
         lights = self.bridge.get_all_lights()
@@ -236,7 +454,15 @@ class HueAnalyzerService:
         """Graceful shutdown."""
         logger.info("🛑 Shutting down...")
         self._running = False
+        if self.event_stream:
+            self.event_stream.stop()
+        if self.api_server:
+            self.api_server.stop()
+        self.adaptive_controller.stop()
         self.scheduler.shutdown(wait=False)
+        if self.write_buffer:
+            self.write_buffer.stop()
+        self.bridge.close()
         logger.info("👋 Goodbye!")
         sys.exit(0)
 
@@ -251,4 +477,7 @@ class HueAnalyzerService:
             "bridge_connected": self.bridge.is_connected,
             "database_stats": self.database.get_statistics(),
             "events_this_session": self.event_logger.total_events_logged,
+            "event_stream": self.event_stream.stats if self.event_stream else None,
+            "event_writer": self.write_buffer.stats if self.write_buffer else None,
+            "pending_sequences": sum(len(p) for p in self._pending_sequences.values()),
         }
@@ -2,5 +2,6 @@
 
 from .database import Database
 from .event_logger import EventLogger
+from .write_buffer import EventWriteBuffer
 
-__all__ = ["Database", "EventLogger"]
+__all__ = ["Database", "EventLogger", "EventWriteBuffer"]
@@ -1,9 +1,12 @@
 """SQLite database for storing light events and patterns."""
 
+import ast
+import hashlib
 import json
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from loguru import logger
 from sqlalchemy import (
@@ -11,13 +14,23 @@ from sqlalchemy import (
     Column,
     DateTime,
     Float,
+    Index,
     Integer,
+    JSON,
     String,
     Text,
+    cast,
     create_engine,
+    event,
+    func,
+    insert,
+    select,
     text,
+    type_coerce,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 Base = declarative_base()
 
@@ -44,6 +57,17 @@ class LightEventRecord(Base):
         return f"<LightEvent {self.light_name} {self.event_type} @ {self.timestamp}>"
 
 
+# Covers the event summary: a timestamp range scan that never touches the
+# table rows (see Database.get_event_summary)
+_EVENT_SUMMARY_INDEX = Index(
+    "ix_light_events_summary",
+    LightEventRecord.timestamp,
+    LightEventRecord.hour,
+    LightEventRecord.light_name,
+    LightEventRecord.event_type,
+)
+
+
 class LightStateSnapshot(Base):
     """Database model for periodic state snapshots."""
 
@@ -60,6 +84,72 @@ class LightStateSnapshot(Base):
     color_temp = Column(Integer)
 
 
+class LightDimension(Base):
+    """Maps light IDs and names to small integer keys for compact storage."""
+
+    __tablename__ = "light_dims"
+
+    light_key = Column(Integer, primary_key=True, autoincrement=True)
+    light_id = Column(String(50), nullable=False, unique=True)
+    light_name = Column(String(100))
+
+
+class CompactSnapshot(Base):
+    """
+    Compact periodic state snapshot: one row per light per poll.
+
+    `state` packs the light state into a single integer, see
+    pack_light_state() for the layout.
+    """
+
+    __tablename__ = "light_snapshots_compact"
+
+    timestamp = Column(Integer, primary_key=True)  # Unix seconds
+    light_key = Column(Integer, primary_key=True)
+    state = Column(Integer, nullable=False)
+
+
+# Bit layout of CompactSnapshot.state (low to high):
+#   on (1) | reachable (1) | brightness (8) | hue (16) | saturation (8) |
+#   color_temp (9) | has_hue (1) | has_saturation (1) | has_color_temp (1)
+_HUE_SHIFT = 10
+_SAT_SHIFT = 26
+_CT_SHIFT = 34
+_HAS_HUE = 1 << 43
+_HAS_SAT = 1 << 44
+_HAS_CT = 1 << 45
+
+
+def pack_light_state(light_state: dict) -> int:
+    """Pack a light state dict into a single integer."""
+    packed = int(bool(light_state.get("is_on")))
+    packed |= int(bool(light_state.get("reachable", True))) << 1
+    packed |= (int(light_state.get("brightness") or 0) & 0xFF) << 2
+
+    hue = light_state.get("hue")
+    if hue is not None:
+        packed |= ((int(hue) & 0xFFFF) << _HUE_SHIFT) | _HAS_HUE
+    saturation = light_state.get("saturation")
+    if saturation is not None:
+        packed |= ((int(saturation) & 0xFF) << _SAT_SHIFT) | _HAS_SAT
+    color_temp = light_state.get("color_temp")
+    if color_temp is not None:
+        packed |= ((int(color_temp) & 0x1FF) << _CT_SHIFT) | _HAS_CT
+    return packed
+
+
+def unpack_light_state(packed: int) -> dict:
+    """Unpack an integer produced by pack_light_state()."""
+    return {
+        "is_on": bool(packed & 1),
+        "reachable": bool(packed & 2),
+        "brightness": (packed >> 2) & 0xFF,
+        "hue": (packed >> _HUE_SHIFT) & 0xFFFF if packed & _HAS_HUE else None,
+        "saturation": (packed >> _SAT_SHIFT) & 0xFF if packed & _HAS_SAT else None,
+        "color_temp": (packed >> _CT_SHIFT) & 0x1FF if packed & _HAS_CT else None,
+    }
+
+
 class DetectedPattern(Base):
     """Database model for detected patterns."""
 
@@ -72,13 +162,78 @@ class DetectedPattern(Base):
     weekdays = Column(String(20))  # Comma-separated weekdays (0-6)
     time_start = Column(String(10))  # HH:MM format
     time_end = Column(String(10))
-    action = Column(String(200))  # JSON-encoded action
-    confidence = Column(Float)
+    action = Column(JSON)  # Decoded to a dict on load
+    confidence = Column(Float)  # Detected confidence + feedback_adjustment
+    feedback_adjustment = Column(Float, default=0.0)  # Net change from user feedback
     occurrence_count = Column(Integer)
     last_seen = Column(DateTime)
     created_at = Column(DateTime, default=datetime.now)
     is_active = Column(Boolean, default=True)
 
+    # Hash of the natural key, see pattern_key()
+    pattern_key = Column(String(40), index=True, unique=True)
+
+
+# Patterns whose confidence falls below this are deactivated
+MIN_ACTIVE_CONFIDENCE = 0.3
+
+
+# Action fields that are measured per analysis run rather than identifying
+# the pattern; they are updated in place instead of creating a new row
+_PATTERN_MEASUREMENTS = ("delay_seconds",)
+
+
+def pattern_key(
+    pattern_type: Optional[str],
+    light_ids: str,
+    weekdays: str,
+    time_start: Optional[str],
+    time_end: Optional[str],
+    action,
+) -> str:
+    """
+    Compute the natural key of a pattern from its column values.
+
+    Args:
+        pattern_type: Pattern type
+        light_ids: Comma-separated light IDs
+        weekdays: Comma-separated weekdays
+        time_start: Window start (HH:MM) or None
+        time_end: Window end (HH:MM) or None
+        action: Action dict (or its stored string form)
+
+    Returns:
+        Hex digest identifying the pattern.
+    """
+    if isinstance(action, str):
+        action = decode_pattern_action(action)
+    if isinstance(action, dict):
+        action = {k: v for k, v in action.items() if k not in _PATTERN_MEASUREMENTS}
+
+    canonical = json.dumps(
+        [pattern_type, light_ids, weekdays, time_start, time_end, action],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def decode_pattern_action(value: str):
+    """
+    Decode a stored pattern action.
+
+    Handles JSON as well as the Python repr (str(dict)) older versions
+    stored. Values that are neither are returned unchanged.
+    """
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
 
 class Automation(Base):
     """Database model for user-defined automations."""
@@ -126,30 +281,376 @@ class Automation(Base):
         }
 
 
+class AdaptiveSession(Base):
+    """Database model for adaptive lighting sessions (survive restarts)."""
+
+    __tablename__ = "adaptive_sessions"
+
+    session_id = Column(String(100), primary_key=True)
+    sensor_id = Column(String(50), nullable=False)
+    light_ids = Column(String(200))  # Comma-separated light IDs
+    target_lux = Column(Float)
+    min_brightness = Column(Integer)
+    max_brightness = Column(Integer)
+    step = Column(Integer)  # Maximum brightness change per iteration
+
+    # Controller state
+    active = Column(Boolean, default=True)
+    status = Column(String(100))
+    current_brightness = Column(Integer, default=0)
+    current_lux = Column(Float, default=0.0)
+    iterations = Column(Integer, default=0)
+    gain = Column(Float)  # Estimated lux per brightness unit
+    integral = Column(Float, default=0.0)
+
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def to_dict(self) -> dict:
+        """Convert to a controller session dict."""
+        return {
+            "session_id": self.session_id,
+            "sensor_id": self.sensor_id,
+            "light_ids": self.light_ids.split(",") if self.light_ids else [],
+            "target_lux": self.target_lux,
+            "min_brightness": self.min_brightness,
+            "max_brightness": self.max_brightness,
+            "step": self.step,
+            "active": self.active,
+            "status": self.status,
+            "current_brightness": self.current_brightness or 0,
+            "current_lux": self.current_lux or 0.0,
+            "iterations": self.iterations or 0,
+            "gain": self.gain,
+            "integral": self.integral or 0.0,
+        }
+
+
+class AdaptiveSample(Base):
+    """Database model for sensor readings taken during adaptive lighting."""
+
+    __tablename__ = "adaptive_samples"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sensor_id = Column(String(50), nullable=False, index=True)
+    light_key = Column(String(200), nullable=False)  # Sorted comma-separated light IDs
+    timestamp = Column(DateTime, nullable=False)
+    brightness = Column(Integer, nullable=False)
+    lux = Column(Float, nullable=False)
+
+
+class StatCounter(Base):
+    """Row counts kept up to date by triggers (see _COUNTER_TRIGGERS)."""
+
+    __tablename__ = "stat_counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+# Counter name -> query computing it from scratch
+_COUNTER_QUERIES = {
+    "light_events": "SELECT count(*) FROM light_events",
+    "detected_patterns": "SELECT count(*) FROM detected_patterns",
+    "active_patterns": "SELECT count(*) FROM detected_patterns WHERE is_active",
+}
+
+# Keep stat_counters in step with every insert, delete and pattern
+# (de)activation, whatever code path makes it
+_COUNTER_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS stat_light_events_insert
+    AFTER INSERT ON light_events BEGIN
+        UPDATE stat_counters SET value = value + 1 WHERE name = 'light_events';
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stat_light_events_delete
+    AFTER DELETE ON light_events BEGIN
+        UPDATE stat_counters SET value = value - 1 WHERE name = 'light_events';
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stat_patterns_insert
+    AFTER INSERT ON detected_patterns BEGIN
+        UPDATE stat_counters SET value = value + 1 WHERE name = 'detected_patterns';
+        UPDATE stat_counters SET value = value + 1
+            WHERE name = 'active_patterns' AND NEW.is_active;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stat_patterns_delete
+    AFTER DELETE ON detected_patterns BEGIN
+        UPDATE stat_counters SET value = value - 1 WHERE name = 'detected_patterns';
+        UPDATE stat_counters SET value = value - 1
+            WHERE name = 'active_patterns' AND OLD.is_active;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stat_patterns_active
+    AFTER UPDATE OF is_active ON detected_patterns
+    WHEN coalesce(OLD.is_active, 0) != coalesce(NEW.is_active, 0) BEGIN
+        UPDATE stat_counters
+            SET value = value + CASE WHEN NEW.is_active THEN 1 ELSE -1 END
+            WHERE name = 'active_patterns';
+    END""",
+)
+
+
+class EventRollup(Base):
+    """
+    Event counts per light and type for each hour and day.
+
+    Kept when raw events are cleaned up, so long-range analytics don't
+    depend on retention_days.
+    """
+
+    __tablename__ = "event_rollups"
+
+    period = Column(String(4), primary_key=True)  # hour, day
+    bucket = Column(DateTime, primary_key=True)  # Start of the hour/day
+    light_id = Column(String(50), primary_key=True)
+    event_type = Column(String(50), primary_key=True)
+    light_name = Column(String(100))
+    count = Column(Integer, nullable=False, default=0)
+
+
+class UsageRollup(Base):
+    """Seconds each light was on during each hour and day."""
+
+    __tablename__ = "usage_rollups"
+
+    period = Column(String(4), primary_key=True)  # hour, day
+    bucket = Column(DateTime, primary_key=True)  # Start of the hour/day
+    light_id = Column(String(50), primary_key=True)
+    light_name = Column(String(100))
+    on_seconds = Column(Float, nullable=False, default=0.0)
+
+
+ROLLUP_PERIODS = ("hour", "day")
+
+
+def rollup_bucket(timestamp: datetime, period: str) -> datetime:
+    """Start of the hour or day a timestamp falls in."""
+    if period == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def split_by_period(
+    start: datetime, end: datetime, period: str
+) -> Iterator[tuple[datetime, float]]:
+    """
+    Split a time span into the hours or days it covers.
+
+    Yields:
+        (bucket start, seconds of the span inside that bucket)
+    """
+    step = timedelta(hours=1) if period == "hour" else timedelta(days=1)
+    bucket = rollup_bucket(start, period)
+    while bucket < end:
+        next_bucket = bucket + step
+        seconds = (min(end, next_bucket) - max(start, bucket)).total_seconds()
+        if seconds > 0:
+            yield bucket, seconds
+        bucket = next_bucket
+
+
+def _rollup_conditions(
+    model,
+    period: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> list:
+    """Filter a rollup table to one period and the buckets overlapping a range."""
+    conditions = [model.period == period]
+    if start_date:
+        conditions.append(model.bucket >= rollup_bucket(start_date, period))
+    if end_date:
+        conditions.append(model.bucket <= end_date)
+    return conditions
+
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Adaptive lighting readings kept per sensor and light set; the lux
+# response model only learns from the most recent ones
+ADAPTIVE_SAMPLES_KEPT = 500
+
+# Patterns per multi-row upsert in save_patterns
+PATTERN_UPSERT_CHUNK = 500
+
+
 class Database:
     """Handles all database operations."""
 
-    def __init__(self, db_path: str = "data/hue_events.db"):
+    def __init__(
+        self,
+        db_path: str = "data/hue_events.db",
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size_mb: int = 16,
+        mmap_size_mb: int = 64,
+        busy_timeout_ms: int = 5000,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+    ):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file.
+            journal_mode: SQLite journal mode (WAL lets readers run
+                concurrently with a writer)
+            synchronous: SQLite synchronous level (NORMAL is safe with WAL)
+            cache_size_mb: Page cache size per connection
+            mmap_size_mb: Memory-mapped I/O size (0 = disabled)
+            busy_timeout_ms: How long to wait for a lock before failing
+            pool_size: Connections kept open for the poller, API and scheduler
+            max_overflow: Extra connections allowed under load
         """
+        journal_mode = journal_mode.upper()
+        synchronous = synchronous.upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Invalid journal_mode: {journal_mode}")
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Invalid synchronous level: {synchronous}")
+
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.engine = create_engine(
             f"sqlite:///{self.db_path}",
             echo=False,
-            connect_args={"check_same_thread": False},
+            connect_args={
+                "check_same_thread": False,
+                "timeout": busy_timeout_ms / 1000,
+            },
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=busy_timeout_ms / 1000,
         )
+
+        @event.listens_for(self.engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+            cursor.execute(f"PRAGMA synchronous={synchronous}")
+            # Negative cache_size is in KiB
+            cursor.execute(f"PRAGMA cache_size=-{int(cache_size_mb) * 1024}")
+            cursor.execute(f"PRAGMA mmap_size={int(mmap_size_mb) * 1024 * 1024}")
+            cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
         self.SessionLocal = sessionmaker(bind=self.engine)
 
+        # Bumped whenever detected patterns change, so in-memory pattern
+        # indexes know when to rebuild
+        self.patterns_version = 0
+
+        # light_id -> (light_key, light_name) for compact snapshots
+        self._light_keys: dict[str, tuple[int, Optional[str]]] = {}
+        self._light_keys_lock = threading.Lock()
+
+        # light_id -> time it was turned on, for lights that are on, so
+        # usage rollups get the on-duration when the "off" event arrives.
+        # Loaded from the last on/off events on the first write and only
+        # replaced once a write commits. _rollup_lock is held for the
+        # whole event-writing transaction.
+        self._light_on_since: Optional[dict[str, datetime]] = None
+        self._rollup_lock = threading.Lock()
+
         # Create tables
         Base.metadata.create_all(self.engine)
+        self._migrate()
         logger.info(f"Database initialized at {self.db_path}")
 
+    def _migrate(self):
+        """Bring databases created by older versions up to the current schema."""
+        with self.engine.begin() as conn:
+            version = conn.execute(text("PRAGMA user_version")).scalar()
+            if version < 1:
+                self._migrate_pattern_actions(conn)
+                conn.execute(text("PRAGMA user_version = 1"))
+            self._migrate_pattern_keys(conn)
+            if version < 2:
+                # Seed the counters and install the triggers in one transaction
+                for statement in _COUNTER_TRIGGERS:
+                    conn.execute(text(statement))
+                self._reconcile_counters(conn)
+                conn.execute(text("PRAGMA user_version = 2"))
+            if version < 3:
+                _EVENT_SUMMARY_INDEX.create(conn, checkfirst=True)
+                conn.execute(text("PRAGMA user_version = 3"))
+            if version < 4:
+                self._rebuild_rollups(conn)
+                conn.execute(text("PRAGMA user_version = 4"))
+            if version < 5:
+                self._migrate_pattern_feedback(conn)
+                conn.execute(text("PRAGMA user_version = 5"))
+
+    def _migrate_pattern_feedback(self, conn):
+        """Add feedback_adjustment to detected_patterns."""
+        columns = {
+            row[1] for row in conn.execute(text("PRAGMA table_info(detected_patterns)"))
+        }
+        if "feedback_adjustment" not in columns:
+            conn.execute(text(
+                "ALTER TABLE detected_patterns ADD COLUMN feedback_adjustment FLOAT DEFAULT 0"
+            ))
+
+    def _migrate_pattern_actions(self, conn):
+        """Re-encode pattern actions stored as Python reprs as JSON."""
+        rows = conn.execute(text(
+            "SELECT id, action FROM detected_patterns WHERE action IS NOT NULL"
+        )).all()
+
+        updates = []
+        for row_id, raw in rows:
+            try:
+                json.loads(raw)
+                continue  # Already JSON
+            except (TypeError, ValueError):
+                pass
+            updates.append({"id": row_id, "action": json.dumps(decode_pattern_action(raw))})
+
+        if updates:
+            conn.execute(
+                text("UPDATE detected_patterns SET action = :action WHERE id = :id"), updates
+            )
+            logger.info(f"Migrated {len(updates)} pattern actions to JSON")
+
+    def _migrate_pattern_keys(self, conn):
+        """Add pattern_key to detected_patterns and collapse duplicates."""
+        columns = {
+            row[1] for row in conn.execute(text("PRAGMA table_info(detected_patterns)"))
+        }
+        if "pattern_key" in columns:
+            return
+
+        logger.info("Migrating detected_patterns: adding pattern_key and removing duplicates")
+        conn.execute(text("ALTER TABLE detected_patterns ADD COLUMN pattern_key VARCHAR(40)"))
+
+        rows = conn.execute(text(
+            "SELECT id, pattern_type, light_ids, weekdays, time_start, time_end, action "
+            "FROM detected_patterns ORDER BY last_seen DESC, id DESC"
+        )).all()
+        keep: dict[str, int] = {}
+        duplicates = []
+        for row in rows:
+            key = pattern_key(*row[1:])
+            if key in keep:
+                duplicates.append({"id": row[0]})
+            else:
+                keep[key] = row[0]
+
+        if duplicates:
+            conn.execute(text("DELETE FROM detected_patterns WHERE id = :id"), duplicates)
+        if keep:
+            conn.execute(
+                text("UPDATE detected_patterns SET pattern_key = :key WHERE id = :id"),
+                [{"key": key, "id": row_id} for key, row_id in keep.items()],
+            )
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_detected_patterns_pattern_key "
+            "ON detected_patterns (pattern_key)"
+        ))
+        logger.info(f"Removed {len(duplicates)} duplicate patterns")
+
     def get_session(self) -> Session:
         """Get a new database session."""
         return self.SessionLocal()
@@ -191,13 +692,219 @@ class Database:
             minute=ts.minute,
         )
 
-        with self.get_session() as session:
+        with self._rollup_lock, self.get_session() as session:
+            on_since = self._update_rollups(session, [{
+                "light_id": light_id,
+                "light_name": light_name,
+                "timestamp": ts,
+                "event_type": event_type,
+            }])
             session.add(event)
             session.commit()
+            self._light_on_since = on_since
             session.refresh(event)
             logger.debug(f"Recorded event: {event}")
             return event
 
+    def add_events(self, events: list[dict]) -> int:
+        """
+        Record many light events in a single transaction.
+
+        Args:
+            events: Dicts with light_id, light_name, event_type, old_value,
+                new_value and timestamp (datetime).
+
+        Returns:
+            Number of events written.
+        """
+        if not events:
+            return 0
+
+        rows = []
+        for e in events:
+            ts = e.get("timestamp") or datetime.now()
+            rows.append({
+                "light_id": e["light_id"],
+                "light_name": e.get("light_name"),
+                "timestamp": ts,
+                "event_type": e["event_type"],
+                "old_value": e.get("old_value"),
+                "new_value": e.get("new_value"),
+                "weekday": ts.weekday(),
+                "hour": ts.hour,
+                "minute": ts.minute,
+            })
+
+        with self._rollup_lock, self.get_session() as session:
+            on_since = self._update_rollups(session, rows)
+            session.execute(insert(LightEventRecord), rows)
+            session.commit()
+            # Only now, so a failed batch is retried from the same state
+            self._light_on_since = on_since
+
+        logger.debug(f"Recorded {len(rows)} events")
+        return len(rows)
+
+    def _update_rollups(
+        self,
+        conn,
+        rows: list[dict],
+        on_since: Optional[dict[str, datetime]] = None,
+    ) -> dict[str, datetime]:
+        """
+        Add new events to the hourly and daily rollups.
+
+        On-durations are added when a light's "off" event arrives, split
+        over the hours and days it was on; a light that is still on has
+        no usage recorded for its current session yet.
+
+        Args:
+            conn: Open session or connection (caller holds _rollup_lock
+                and commits)
+            rows: Events with light_id, light_name, event_type and
+                timestamp (datetime)
+            on_since: State before these events (defaults to the stored
+                _light_on_since); it is not modified
+
+        Returns:
+            The on-since state after these events, for the caller to store
+            once the transaction commits.
+        """
+        counts: dict[tuple, int] = {}
+        usage: dict[tuple, float] = {}
+        names: dict[str, Optional[str]] = {}
+
+        if on_since is None:
+            on_since = self._light_on_since
+        if on_since is None:
+            on_since = self._load_light_on_since(conn)
+        on_since = dict(on_since)
+
+        for row in sorted(rows, key=lambda r: r["timestamp"]):
+            light_id, ts, event_type = row["light_id"], row["timestamp"], row["event_type"]
+            names[light_id] = row.get("light_name")
+            for period in ROLLUP_PERIODS:
+                key = (period, rollup_bucket(ts, period), light_id, event_type)
+                counts[key] = counts.get(key, 0) + 1
+
+            if event_type == "on":
+                on_since.setdefault(light_id, ts)
+            elif event_type == "off":
+                since = on_since.pop(light_id, None)
+                if since is None or since >= ts:
+                    continue
+                for period in ROLLUP_PERIODS:
+                    for bucket, seconds in split_by_period(since, ts, period):
+                        key = (period, bucket, light_id)
+                        usage[key] = usage.get(key, 0.0) + seconds
+
+        if counts:
+            # Core statements on the tables skip the ORM bulk insert path
+            stmt = sqlite_insert(EventRollup.__table__)
+            conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[
+                        EventRollup.period,
+                        EventRollup.bucket,
+                        EventRollup.light_id,
+                        EventRollup.event_type,
+                    ],
+                    set_={
+                        "count": EventRollup.count + stmt.excluded["count"],
+                        "light_name": stmt.excluded.light_name,
+                    },
+                ),
+                [
+                    {
+                        "period": period,
+                        "bucket": bucket,
+                        "light_id": light_id,
+                        "event_type": event_type,
+                        "light_name": names[light_id],
+                        "count": count,
+                    }
+                    for (period, bucket, light_id, event_type), count in counts.items()
+                ],
+            )
+        if usage:
+            stmt = sqlite_insert(UsageRollup.__table__)
+            conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[UsageRollup.period, UsageRollup.bucket, UsageRollup.light_id],
+                    set_={
+                        "on_seconds": UsageRollup.on_seconds + stmt.excluded.on_seconds,
+                        "light_name": stmt.excluded.light_name,
+                    },
+                ),
+                [
+                    {
+                        "period": period,
+                        "bucket": bucket,
+                        "light_id": light_id,
+                        "light_name": names[light_id],
+                        "on_seconds": seconds,
+                    }
+                    for (period, bucket, light_id), seconds in usage.items()
+                ],
+            )
+        return on_since
+
+    @staticmethod
+    def _load_light_on_since(conn) -> dict[str, datetime]:
+        """Find the lights whose last on/off event is "on", and since when."""
+        # SQLite returns event_type from the row holding max(timestamp)
+        rows = conn.execute(text(
+            "SELECT light_id, event_type, max(timestamp) FROM light_events "
+            "WHERE event_type IN ('on', 'off') GROUP BY light_id"
+        )).all()
+        return {
+            light_id: datetime.fromisoformat(ts)
+            for light_id, event_type, ts in rows
+            if event_type == "on"
+        }
+
+    def rebuild_rollups(self):
+        """
+        Recompute the rollups from the raw events.
+
+        Rollups for periods whose raw events were already cleaned up are
+        lost, so this is only needed to repair them.
+        """
+        with self._rollup_lock:
+            with self.engine.begin() as conn:
+                self._rebuild_rollups(conn)
+            self._light_on_since = None  # Reloaded on the next write
+
+    def _rebuild_rollups(self, conn, chunk_size: int = 50000):
+        conn.execute(EventRollup.__table__.delete())
+        conn.execute(UsageRollup.__table__.delete())
+
+        query = select(
+            LightEventRecord.light_id,
+            LightEventRecord.light_name,
+            type_coerce(LightEventRecord.timestamp, String).label("timestamp"),
+            LightEventRecord.event_type,
+        ).order_by(LightEventRecord.timestamp)
+
+        # Read through the same connection: it already holds the write lock
+        total = 0
+        on_since: dict[str, datetime] = {}
+        for chunk in conn.execute(query).partitions(chunk_size):
+            rows = [
+                {
+                    "light_id": light_id,
+                    "light_name": light_name,
+                    "timestamp": datetime.fromisoformat(ts),
+                    "event_type": event_type,
+                }
+                for light_id, light_name, ts, event_type in chunk
+            ]
+            on_since = self._update_rollups(conn, rows, on_since)
+            total += len(rows)
+
+        if total:
+            logger.info(f"Rebuilt event rollups from {total} events")
+
     def add_snapshot(self, light_state: dict) -> LightStateSnapshot:
         """
         Save a snapshot of light state.
@@ -224,6 +931,123 @@ class Database:
             session.commit()
             return snapshot
 
+    def _get_light_keys(self, session: Session, names: dict[str, Optional[str]]) -> dict[str, int]:
+        """
+        Resolve light IDs to integer keys, creating or renaming dimension rows.
+
+        Args:
+            session: Open session (caller commits)
+            names: light_id -> current light name
+
+        Returns:
+            Dictionary mapping light_id to light_key.
+        """
+        with self._light_keys_lock:
+            if not self._light_keys:
+                for dim in session.query(LightDimension).all():
+                    self._light_keys[dim.light_id] = (dim.light_key, dim.light_name)
+
+            for light_id, name in names.items():
+                known = self._light_keys.get(light_id)
+                if known is None:
+                    dim = LightDimension(light_id=light_id, light_name=name)
+                    session.add(dim)
+                    session.flush()
+                    self._light_keys[light_id] = (dim.light_key, name)
+                elif name and known[1] != name:
+                    session.query(LightDimension).filter(
+                        LightDimension.light_key == known[0]
+                    ).update({"light_name": name})
+                    self._light_keys[light_id] = (known[0], name)
+
+            return {light_id: self._light_keys[light_id][0] for light_id in names}
+
+    def add_snapshots(
+        self,
+        light_states: list[dict],
+        timestamp: Optional[datetime] = None,
+    ) -> int:
+        """
+        Save a snapshot of many lights as one multi-row insert.
+
+        Args:
+            light_states: Light state dicts (LightState.to_dict() format)
+            timestamp: Snapshot time (defaults to now)
+
+        Returns:
+            Number of rows written.
+        """
+        if not light_states:
+            return 0
+
+        ts = int((timestamp or datetime.now()).timestamp())
+
+        with self.get_session() as session:
+            try:
+                keys = self._get_light_keys(
+                    session, {s["light_id"]: s.get("name") for s in light_states}
+                )
+                rows = [
+                    {
+                        "timestamp": ts,
+                        "light_key": keys[s["light_id"]],
+                        "state": pack_light_state(s),
+                    }
+                    for s in light_states
+                ]
+                session.execute(insert(CompactSnapshot).prefix_with("OR REPLACE"), rows)
+                session.commit()
+            except Exception:
+                # Newly assigned keys may have been rolled back
+                with self._light_keys_lock:
+                    self._light_keys.clear()
+                raise
+
+        return len(rows)
+
+    def get_snapshots(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        light_id: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Query compact snapshots, unpacked into light state dicts.
+
+        Args:
+            start_date: Start of date range
+            end_date: End of date range
+            light_id: Filter by light ID
+
+        Returns:
+            List of dicts with timestamp, light_id, name and state fields,
+            ordered by time.
+        """
+        with self.get_session() as session:
+            query = session.query(
+                CompactSnapshot.timestamp,
+                CompactSnapshot.state,
+                LightDimension.light_id,
+                LightDimension.light_name,
+            ).join(LightDimension, LightDimension.light_key == CompactSnapshot.light_key)
+
+            if start_date:
+                query = query.filter(CompactSnapshot.timestamp >= int(start_date.timestamp()))
+            if end_date:
+                query = query.filter(CompactSnapshot.timestamp <= int(end_date.timestamp()))
+            if light_id:
+                query = query.filter(LightDimension.light_id == light_id)
+
+            return [
+                {
+                    "timestamp": datetime.fromtimestamp(ts),
+                    "light_id": lid,
+                    "name": name,
+                    **unpack_light_state(state),
+                }
+                for ts, state, lid, name in query.order_by(CompactSnapshot.timestamp).all()
+            ]
+
     def get_events(
         self,
         light_id: Optional[str] = None,
@@ -259,6 +1083,219 @@ class Database:
 
             return query.order_by(LightEventRecord.timestamp.desc()).limit(limit).all()
 
+    def iter_event_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: int = 50000,
+    ) -> Iterator[dict[str, tuple]]:
+        """
+        Stream events oldest first in column-oriented chunks.
+
+        Rows are read with a server-side cursor and never turned into ORM
+        objects, so memory per chunk is bounded by chunk_size.
+
+        Args:
+            start_date: Start of date range
+            end_date: End of date range
+            chunk_size: Rows per chunk
+
+        Yields:
+            Dicts mapping column name (light_id, light_name, timestamp,
+            event_type, weekday, hour, minute) to a tuple of values.
+            Timestamps are ISO-format strings.
+        """
+        query = select(
+            LightEventRecord.light_id,
+            LightEventRecord.light_name,
+            type_coerce(LightEventRecord.timestamp, String).label("timestamp"),
+            LightEventRecord.event_type,
+            LightEventRecord.weekday,
+            LightEventRecord.hour,
+            LightEventRecord.minute,
+        )
+        if start_date:
+            query = query.where(LightEventRecord.timestamp >= start_date)
+        if end_date:
+            query = query.where(LightEventRecord.timestamp <= end_date)
+        query = query.order_by(LightEventRecord.timestamp)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=chunk_size
+            ).execute(query)
+            columns = list(result.keys())
+            for rows in result.partitions():
+                yield dict(zip(columns, zip(*rows)))
+
+    def get_event_summary(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> dict:
+        """
+        Count events by light and type, and by hour of day.
+
+        Aggregated in SQL over the summary index, so every event in the
+        range is counted without loading any rows. Ranges reaching back
+        past the oldest raw event are counted from the hourly rollups
+        instead (whole hours at the range ends).
+
+        Args:
+            start_date: Start of date range
+            end_date: End of date range
+
+        Returns:
+            Dict with total_events, by_light (light name -> event type ->
+            count, plus "total") and by_hour (hour -> count).
+        """
+        with self.get_session() as session:
+            oldest = session.execute(select(func.min(LightEventRecord.timestamp))).scalar()
+            if start_date is None or oldest is None or start_date < oldest:
+                by_type, by_hour = self._rollup_summary(session, start_date, end_date)
+            else:
+                by_type, by_hour = self._raw_summary(session, start_date, end_date)
+
+        by_light: dict[str, dict[str, int]] = {}
+        for light_name, event_type, count in by_type:
+            counts = by_light.setdefault(light_name, {"total": 0})
+            counts[event_type] = count
+            counts["total"] += count
+
+        return {
+            "total_events": sum(counts["total"] for counts in by_light.values()),
+            "by_light": by_light,
+            "by_hour": {hour: count for hour, count in by_hour},
+        }
+
+    @staticmethod
+    def _raw_summary(
+        session: Session,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> tuple[list, list]:
+        conditions = []
+        if start_date:
+            conditions.append(LightEventRecord.timestamp >= start_date)
+        if end_date:
+            conditions.append(LightEventRecord.timestamp <= end_date)
+
+        by_type = session.execute(
+            select(
+                LightEventRecord.light_name,
+                LightEventRecord.event_type,
+                func.count(),
+            )
+            .where(*conditions)
+            .group_by(LightEventRecord.light_name, LightEventRecord.event_type)
+        ).all()
+        by_hour = session.execute(
+            select(LightEventRecord.hour, func.count())
+            .where(*conditions)
+            .group_by(LightEventRecord.hour)
+        ).all()
+        return by_type, by_hour
+
+    @staticmethod
+    def _rollup_summary(
+        session: Session,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> tuple[list, list]:
+        conditions = _rollup_conditions(EventRollup, "hour", start_date, end_date)
+        hour = cast(func.strftime("%H", EventRollup.bucket), Integer)
+
+        by_type = session.execute(
+            select(EventRollup.light_name, EventRollup.event_type, func.sum(EventRollup.count))
+            .where(*conditions)
+            .group_by(EventRollup.light_name, EventRollup.event_type)
+        ).all()
+        by_hour = session.execute(
+            select(hour, func.sum(EventRollup.count)).where(*conditions).group_by(hour)
+        ).all()
+        return by_type, by_hour
+
+    def get_time_slot_counts(self, start_date: Optional[datetime] = None) -> tuple[list, int]:
+        """
+        Count events per light, weekday, hour and type from the rollups.
+
+        Args:
+            start_date: Start of date range (rounded down to the hour)
+
+        Returns:
+            Tuple of (rows of light_id, light_name, weekday, hour,
+            event_type, count) and the number of days with any events.
+        """
+        conditions = _rollup_conditions(EventRollup, "hour", start_date, None)
+        # strftime('%w') counts from Sunday; weekday is 0=Monday
+        weekday = (cast(func.strftime("%w", EventRollup.bucket), Integer) + 6) % 7
+        hour = cast(func.strftime("%H", EventRollup.bucket), Integer)
+
+        with self.get_session() as session:
+            rows = session.execute(
+                select(
+                    EventRollup.light_id,
+                    EventRollup.light_name,
+                    weekday,
+                    hour,
+                    EventRollup.event_type,
+                    func.sum(EventRollup.count),
+                )
+                .where(*conditions)
+                .group_by(
+                    EventRollup.light_id,
+                    EventRollup.light_name,
+                    weekday,
+                    hour,
+                    EventRollup.event_type,
+                )
+            ).all()
+            days = session.execute(
+                select(func.count(func.distinct(EventRollup.bucket))).where(
+                    *_rollup_conditions(EventRollup, "day", start_date, None)
+                )
+            ).scalar()
+
+        return [tuple(row) for row in rows], days or 0
+
+    def get_usage(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        period: str = "day",
+    ) -> list[dict]:
+        """
+        Get how long each light was on per hour or day.
+
+        Args:
+            start_date: Start of date range (rounded down to the period)
+            end_date: End of date range
+            period: "hour" or "day"
+
+        Returns:
+            Dicts with bucket (period start), light_id, light_name and
+            on_seconds, oldest first.
+        """
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Invalid rollup period: {period}")
+
+        with self.get_session() as session:
+            rows = session.execute(
+                select(
+                    UsageRollup.bucket,
+                    UsageRollup.light_id,
+                    UsageRollup.light_name,
+                    UsageRollup.on_seconds,
+                )
+                .where(*_rollup_conditions(UsageRollup, period, start_date, end_date))
+                .order_by(UsageRollup.bucket, UsageRollup.light_id)
+            ).all()
+
+        return [
+            {"bucket": bucket, "light_id": light_id, "light_name": name, "on_seconds": seconds}
+            for bucket, light_id, name, seconds in rows
+        ]
+
     def get_events_by_time_window(
         self,
         weekday: int,
@@ -289,34 +1326,103 @@ class Database:
                 .all()
             )
 
-    def save_pattern(self, pattern: dict) -> DetectedPattern:
+    def save_pattern(self, pattern: dict) -> Optional[DetectedPattern]:
         """
-        Save a detected pattern.
+        Save a detected pattern, updating it if it is already known.
 
         Args:
             pattern: Pattern data dictionary.
 
         Returns:
-            The created pattern record.
-        """
-        db_pattern = DetectedPattern(
-            pattern_type=pattern.get("type"),
-            description=pattern.get("description"),
-            light_ids=",".join(pattern.get("light_ids", [])),
-            weekdays=",".join(map(str, pattern.get("weekdays", []))),
-            time_start=pattern.get("time_start"),
-            time_end=pattern.get("time_end"),
-            action=str(pattern.get("action")),
-            confidence=pattern.get("confidence", 0.0),
-            occurrence_count=pattern.get("occurrences", 0),
-            last_seen=datetime.now(),
-        )
-
+            The stored pattern record.
+        """
+        self.save_patterns([pattern])
+        row = self._pattern_row(pattern, datetime.now())
         with self.get_session() as session:
-            session.add(db_pattern)
-            session.commit()
-            logger.info(f"Saved pattern: {db_pattern.description}")
-            return db_pattern
+            return (
+                session.query(DetectedPattern)
+                .filter(DetectedPattern.pattern_key == row["pattern_key"])
+                .first()
+            )
+
+    def save_patterns(self, patterns: list[dict]) -> int:
+        """
+        Upsert detected patterns in a single statement.
+
+        Patterns are matched on their natural key (type, lights, weekdays,
+        time window and action). Known patterns get their description,
+        occurrence count and last_seen refreshed; new ones are inserted.
+
+        User feedback is kept: a known pattern's confidence becomes the
+        newly detected confidence plus its feedback_adjustment, and it is
+        active exactly when that is at least MIN_ACTIVE_CONFIDENCE. So a
+        pattern deactivated by rejections only comes back if it is
+        detected with enough confidence to outweigh them.
+
+        Args:
+            patterns: Pattern data dictionaries from PatternDetector.
+
+        Returns:
+            Number of patterns saved.
+        """
+        if not patterns:
+            return 0
+
+        now = datetime.now()
+        # One row per key; a later duplicate in the same batch wins
+        rows = {}
+        for pattern in patterns:
+            row = self._pattern_row(pattern, now)
+            rows[row["pattern_key"]] = row
+
+        values = list(rows.values())
+        with self.engine.begin() as conn:
+            # Multi-row inserts bind 12 variables per pattern; chunk them to
+            # stay under SQLITE_MAX_VARIABLE_NUMBER (32766 on stock builds)
+            for i in range(0, len(values), PATTERN_UPSERT_CHUNK):
+                stmt = sqlite_insert(DetectedPattern).values(values[i:i + PATTERN_UPSERT_CHUNK])
+                confidence = func.max(0.0, func.min(1.0, (
+                    stmt.excluded.confidence
+                    + func.coalesce(DetectedPattern.feedback_adjustment, 0.0)
+                )))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[DetectedPattern.pattern_key],
+                    set_={
+                        "description": stmt.excluded.description,
+                        "action": stmt.excluded.action,
+                        "confidence": confidence,
+                        "is_active": confidence >= MIN_ACTIVE_CONFIDENCE,
+                        "occurrence_count": stmt.excluded.occurrence_count,
+                        "last_seen": stmt.excluded.last_seen,
+                    },
+                )
+                conn.execute(stmt)
+        self.patterns_version += 1
+
+        logger.info(f"Saved {len(rows)} patterns")
+        return len(rows)
+
+    @staticmethod
+    def _pattern_row(pattern: dict, last_seen: datetime) -> dict:
+        """Convert a pattern dict to detected_patterns column values."""
+        row = {
+            "pattern_type": pattern.get("type"),
+            "description": pattern.get("description"),
+            "light_ids": ",".join(pattern.get("light_ids", [])),
+            "weekdays": ",".join(map(str, pattern.get("weekdays", []))),
+            "time_start": pattern.get("time_start"),
+            "time_end": pattern.get("time_end"),
+            "action": pattern.get("action"),
+            "confidence": pattern.get("confidence", 0.0),
+            "occurrence_count": pattern.get("occurrences", 0),
+            "last_seen": last_seen,
+            "is_active": True,
+        }
+        row["pattern_key"] = pattern_key(
+            row["pattern_type"], row["light_ids"], row["weekdays"],
+            row["time_start"], row["time_end"], pattern.get("action"),
+        )
+        return row
 
     def get_active_patterns(self) -> list[DetectedPattern]:
         """Get all active patterns."""
@@ -331,6 +1437,11 @@ class Database:
         """
         Remove events older than specified days.
 
+        The event and usage rollups are kept, so summaries and time
+        patterns can still reach further back.
+        Adaptive lighting readings beyond the most recent
+        ADAPTIVE_SAMPLES_KEPT per sensor and light set are removed too.
+
         Args:
             days: Delete events older than this many days.
         """
@@ -342,42 +1453,77 @@ class Database:
                 .filter(LightEventRecord.timestamp < cutoff)
                 .delete()
             )
+            deleted_snapshots = (
+                session.query(CompactSnapshot)
+                .filter(CompactSnapshot.timestamp < int(cutoff.timestamp()))
+                .delete()
+            )
             session.commit()
             if deleted:
                 logger.info(f"Cleaned up {deleted} old events")
+            if deleted_snapshots:
+                logger.info(f"Cleaned up {deleted_snapshots} old snapshots")
+
+        self.prune_adaptive_samples()
 
     def get_statistics(self) -> dict:
-        """Get database statistics."""
-        with self.get_session() as session:
-            total_events = session.query(LightEventRecord).count()
-            total_patterns = session.query(DetectedPattern).count()
-            active_patterns = (
-                session.query(DetectedPattern)
-                .filter(DetectedPattern.is_active == True)
-                .count()
-            )
+        """
+        Get database statistics.
 
-            # Get date range
-            oldest = (
-                session.query(LightEventRecord)
-                .order_by(LightEventRecord.timestamp.asc())
-                .first()
-            )
-            newest = (
-                session.query(LightEventRecord)
-                .order_by(LightEventRecord.timestamp.desc())
-                .first()
-            )
+        Counts come from stat_counters and the date range from the timestamp
+        index, so this doesn't scan the event table.
+        """
+        with self.get_session() as session:
+            counters = dict(session.execute(select(StatCounter.name, StatCounter.value)).all())
+            # Separate queries: SQLite only uses the index for a lone MIN/MAX
+            oldest = session.execute(select(func.min(LightEventRecord.timestamp))).scalar()
+            newest = session.execute(select(func.max(LightEventRecord.timestamp))).scalar()
 
             return {
-                "total_events": total_events,
-                "total_patterns": total_patterns,
-                "active_patterns": active_patterns,
-                "oldest_event": oldest.timestamp if oldest else None,
-                "newest_event": newest.timestamp if newest else None,
+                "total_events": counters.get("light_events", 0),
+                "total_patterns": counters.get("detected_patterns", 0),
+                "active_patterns": counters.get("active_patterns", 0),
+                "oldest_event": oldest,
+                "newest_event": newest,
                 "database_path": str(self.db_path),
             }
 
+    def reconcile_statistics(self) -> dict[str, int]:
+        """
+        Recount the statistics counters from their tables.
+
+        The triggers keep counters exact; this corrects drift from writes
+        that bypassed them (e.g. manual edits with triggers dropped).
+
+        Returns:
+            Counter name -> correction applied (only counters that drifted).
+        """
+        with self.engine.begin() as conn:
+            drift = self._reconcile_counters(conn)
+        if drift:
+            logger.warning(f"Corrected statistics counters: {drift}")
+        return drift
+
+    @staticmethod
+    def _reconcile_counters(conn) -> dict[str, int]:
+        before = dict(conn.execute(text("SELECT name, value FROM stat_counters")).all())
+        drift = {}
+        for name, query in _COUNTER_QUERIES.items():
+            # Count and store in one statement so no write slips in between
+            conn.execute(
+                text(
+                    f"INSERT INTO stat_counters (name, value) VALUES (:name, ({query})) "
+                    "ON CONFLICT (name) DO UPDATE SET value = excluded.value"
+                ),
+                {"name": name},
+            )
+            value = conn.execute(
+                text("SELECT value FROM stat_counters WHERE name = :name"), {"name": name}
+            ).scalar()
+            if before.get(name, 0) != value:
+                drift[name] = value - before.get(name, 0)
+        return drift
+
     # ===== Automation CRUD methods =====
 
     def get_all_automations(self) -> list[Automation]:
@@ -529,3 +1675,110 @@ class Database:
                 automation.last_triggered = datetime.now()
                 automation.trigger_count = (automation.trigger_count or 0) + 1
                 session.commit()
+
+    # ===== Adaptive Lighting Sessions =====
+
+    def save_adaptive_sessions(self, sessions: list[dict]):
+        """
+        Insert or update adaptive lighting sessions.
+
+        Args:
+            sessions: Controller session dicts (see AdaptiveSession.to_dict).
+        """
+        if not sessions:
+            return
+
+        with self.get_session() as session:
+            for data in sessions:
+                session.merge(AdaptiveSession(
+                    **{
+                        **{k: v for k, v in data.items() if hasattr(AdaptiveSession, k)},
+                        "light_ids": ",".join(map(str, data.get("light_ids", []))),
+                        "updated_at": datetime.now(),
+                    }
+                ))
+            session.commit()
+
+    def get_adaptive_sessions(self, active_only: bool = False) -> list[dict]:
+        """
+        Get stored adaptive lighting sessions.
+
+        Args:
+            active_only: Only return sessions that were running.
+
+        Returns:
+            List of session dicts.
+        """
+        with self.get_session() as session:
+            query = session.query(AdaptiveSession)
+            if active_only:
+                query = query.filter(AdaptiveSession.active == True)
+            return [s.to_dict() for s in query.all()]
+
+    def save_adaptive_samples(self, samples: list[dict]):
+        """
+        Store sensor readings taken during adaptive lighting.
+
+        Args:
+            samples: Dicts with sensor_id, light_key, timestamp, brightness, lux
+        """
+        if not samples:
+            return
+
+        with self.get_session() as session:
+            session.execute(insert(AdaptiveSample), samples)
+            session.commit()
+
+    def get_adaptive_samples(
+        self,
+        sensor_id: str,
+        light_key: str,
+        limit: int = ADAPTIVE_SAMPLES_KEPT,
+    ) -> list[dict]:
+        """
+        Get the most recent adaptive lighting readings for a sensor and light set.
+
+        Args:
+            sensor_id: Sensor ID
+            light_key: Sorted comma-separated light IDs
+            limit: Maximum number of readings
+
+        Returns:
+            Readings in chronological order.
+        """
+        with self.get_session() as session:
+            rows = session.execute(
+                select(AdaptiveSample.timestamp, AdaptiveSample.brightness, AdaptiveSample.lux)
+                .where(AdaptiveSample.sensor_id == sensor_id)
+                .where(AdaptiveSample.light_key == light_key)
+                .order_by(AdaptiveSample.timestamp.desc(), AdaptiveSample.id.desc())
+                .limit(limit)
+            ).all()
+        return [
+            {"timestamp": timestamp, "brightness": brightness, "lux": lux}
+            for timestamp, brightness, lux in reversed(rows)
+        ]
+
+    def prune_adaptive_samples(self, keep: int = ADAPTIVE_SAMPLES_KEPT) -> int:
+        """
+        Delete all but the most recent readings of each sensor and light set.
+
+        Args:
+            keep: Readings to keep per sensor and light set
+
+        Returns:
+            Number of readings deleted.
+        """
+        with self.engine.begin() as conn:
+            deleted = conn.execute(
+                text(
+                    "DELETE FROM adaptive_samples WHERE id IN ("
+                    "SELECT id FROM (SELECT id, row_number() OVER ("
+                    "PARTITION BY sensor_id, light_key ORDER BY timestamp DESC, id DESC"
+                    ") AS n FROM adaptive_samples) WHERE n > :keep)"
+                ),
+                {"keep": keep},
+            ).rowcount
+        if deleted:
+            logger.info(f"Cleaned up {deleted} old adaptive lighting readings")
+        return deleted
@@ -1,31 +1,50 @@
 """Event logger for tracking light state changes."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
 from loguru import logger
 
 from src.hue.models import LightEvent, LightState
 from .database import Database
+from .write_buffer import EventWriteBuffer
 
 
 class EventLogger:
     """Logs light events to database."""
 
-    def __init__(self, database: Database):
+    def __init__(
+        self,
+        database: Database,
+        write_buffer: Optional[EventWriteBuffer] = None,
+    ):
         """
         Initialize event logger.
 
         Args:
             database: Database instance for storage.
+            write_buffer: If given, events are queued and written in batches
+                instead of one transaction per event.
         """
         self.db = database
+        self.write_buffer = write_buffer
         self._event_count = 0
+        self._listeners: list[Callable[[LightEvent], None]] = []
+
+    def add_listener(self, callback: Callable[[LightEvent], None]):
+        """
+        Register a callback invoked with every logged event.
+
+        Args:
+            callback: Function taking a LightEvent
+        """
+        self._listeners.append(callback)
 
     def log_state_change(
         self,
         old_state: LightState,
         new_state: LightState,
+        timestamp: Optional[datetime] = None,
     ) -> list[LightEvent]:
         """
         Log all changes between two light states.
@@ -33,12 +52,13 @@ class EventLogger:
         Args:
             old_state: Previous light state
             new_state: Current light state
+            timestamp: When the change happened (defaults to now)
 
         Returns:
             List of logged events.
         """
         events = []
-        timestamp = datetime.now()
+        timestamp = timestamp or datetime.now()
 
         # Check on/off change
         if old_state.is_on != new_state.is_on:
@@ -105,6 +125,14 @@ class EventLogger:
                 logger.info(f"🌡️ {new_state.name}: Färgtemperatur ändrad")
 
         self._event_count += len(events)
+
+        for event in events:
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.error(f"Event listener failed: {e}")
+
         return events
 
     def _create_event(
@@ -116,18 +144,7 @@ class EventLogger:
         timestamp: datetime,
     ) -> LightEvent:
         """Create and save an event."""
-        # Save to database
-        self.db.add_event(
-            light_id=light_state.light_id,
-            light_name=light_state.name,
-            event_type=event_type,
-            old_value=old_value,
-            new_value=new_value,
-            timestamp=timestamp,
-        )
-
-        # Return event object
-        return LightEvent(
+        event = LightEvent(
             light_id=light_state.light_id,
             light_name=light_state.name,
             timestamp=timestamp,
@@ -139,6 +156,21 @@ class EventLogger:
             minute=timestamp.minute,
         )
 
+        # Save to database
+        if self.write_buffer:
+            self.write_buffer.add(event)
+        else:
+            self.db.add_event(
+                light_id=light_state.light_id,
+                light_name=light_state.name,
+                event_type=event_type,
+                old_value=old_value,
+                new_value=new_value,
+                timestamp=timestamp,
+            )
+
+        return event
+
     def log_snapshot(self, lights: dict[str, LightState]):
         """
         Save a snapshot of all light states.
@@ -146,8 +178,7 @@ class EventLogger:
         Args:
             lights: Dictionary of light_id to LightState.
         """
-        for light_state in lights.values():
-            self.db.add_snapshot(light_state.to_dict())
+        self.db.add_snapshots([light.to_dict() for light in lights.values()])
         logger.debug(f"Saved snapshot of {len(lights)} lights")
 
     @property
@@ -0,0 +1,166 @@
+"""Write-behind buffer for batching light events into the database."""
+
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+
+from src.hue.models import LightEvent
+from .database import Database
+
+
+class EventWriteBuffer:
+    """
+    Buffers light events and writes them in batches.
+
+    Events are flushed in one transaction when the buffer reaches
+    `max_batch` events or `flush_interval` seconds have passed. A failed
+    batch is retried on the next flush; if writes keep failing, the
+    oldest events are dropped once `max_queue` are waiting.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        max_batch: int = 100,
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+    ):
+        """
+        Initialize write buffer.
+
+        Args:
+            database: Database instance for storage
+            max_batch: Flush when this many events are queued
+            flush_interval: Flush at least this often (seconds)
+            max_queue: Most events kept waiting while writes fail
+        """
+        self.db = database
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_queue = max(max_queue, max_batch)
+
+        self._queue: list[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.events_written = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.dropped_events = 0
+        self.last_flush_ms: Optional[float] = None
+        self.max_flush_ms = 0.0
+        self._flush_total_ms = 0.0
+
+    def start(self):
+        """Start the background flush thread."""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="event-writer"
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write out everything still queued."""
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def add(self, event: LightEvent):
+        """Queue an event for writing."""
+        with self._lock:
+            self._queue.append({
+                "light_id": event.light_id,
+                "light_name": event.light_name,
+                "event_type": event.event_type,
+                "old_value": event.old_value,
+                "new_value": event.new_value,
+                "timestamp": event.timestamp,
+            })
+            self._trim_queue()
+            full = len(self._queue) >= self.max_batch
+
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write all queued events in one transaction.
+
+        Returns:
+            Number of events written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._queue = self._queue, []
+
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                self.db.add_events(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} events: {e}")
+                self.failed_flushes += 1
+                with self._lock:
+                    # Put the batch back in front so it's retried in order
+                    self._queue = batch + self._queue
+                    self._trim_queue()
+                if self.dropped_events:
+                    logger.warning(
+                        f"Event queue full: {self.dropped_events} oldest events dropped so far"
+                    )
+                return 0
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.events_written += len(batch)
+            self.flush_count += 1
+            self.last_flush_ms = round(elapsed_ms, 2)
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._flush_total_ms += elapsed_ms
+            return len(batch)
+
+    def _trim_queue(self):
+        """Drop the oldest events beyond max_queue (caller holds _lock)."""
+        excess = len(self._queue) - self.max_queue
+        if excess > 0:
+            del self._queue[:excess]
+            self.dropped_events += excess
+
+    def _run(self):
+        """Flush on size threshold or timer until stopped."""
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be written."""
+        with self._lock:
+            return len(self._queue)
+
+    @property
+    def stats(self) -> dict:
+        """Get queue depth and flush latency metrics."""
+        return {
+            "queue_depth": self.queue_depth,
+            "events_written": self.events_written,
+            "flushes": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "dropped_events": self.dropped_events,
+            "last_flush_ms": self.last_flush_ms,
+            "mean_flush_ms": (
+                round(self._flush_total_ms / self.flush_count, 2)
+                if self.flush_count
+                else None
+            ),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }